@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cycle_project.settings')
+# Under ASGI the cycle views run on the async ORM (see cycles/async_views.py).
+os.environ.setdefault('CYCLES_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
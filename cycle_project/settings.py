@@ -28,6 +28,24 @@ DEBUG = True
 ALLOWED_HOSTS = ['96cbf3307ff8.ngrok-free.app', '127.0.0.1', 'localhost']
 
 TAILWIND_APP_NAME = 'theme'
+
+# Serve the dashboard, home page and cycle API with the async views in
+# cycles/async_views.py (set by asgi.py; WSGI keeps the sync views).
+CYCLES_ASYNC_VIEWS = os.environ.get('CYCLES_ASYNC_VIEWS') == '1'
+
+# Views over their query_budget (cycles/timing.py) only log a warning; the
+# test runner turns this on so they fail under `manage.py test`.
+CYCLES_QUERY_BUDGET_STRICT = False
+TEST_RUNNER = 'cycle_project.test_runner.StrictQueryBudgetRunner'
+
+# /metrics (cycles/metrics.py): with several worker processes on one host,
+# point CYCLES_METRICS_DIR at a directory they share so the endpoint reports
+# all of them; the totals of exited processes are dropped. The endpoint is
+# open to staff users, and to scrapers sending CYCLES_METRICS_TOKEN as a
+# bearer token.
+CYCLES_METRICS_DIR = os.environ.get('CYCLES_METRICS_DIR') or None
+CYCLES_METRICS_TOKEN = os.environ.get('CYCLES_METRICS_TOKEN') or None
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -43,11 +61,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'cycles.timing.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'cycles.routers.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -56,7 +76,7 @@ ROOT_URLCONF = 'cycle_project.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'cycles.timing.TimedDjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'theme/templates'), os.path.join(BASE_DIR, 'cycles/templates')],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -75,13 +95,46 @@ WSGI_APPLICATION = 'cycle_project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# cycle_project/sqlite_backend is the stock SQLite backend plus WAL and tuned
+# pragmas on every connection, and BEGIN IMMEDIATE for write views (see
+# cycles/writes.py). OPTIONS['pragmas'] overrides single pragmas.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'cycle_project.sqlite_backend',
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
 
+# Read replicas: CYCLES_DB_REPLICAS is a comma-separated list of database
+# files, each added as a 'replica<N>' alias that cycles.routers sends cycle
+# reads to. Replicas get their schema and data from the primary, not from
+# migrate. To try it locally, copy a migrated db.sqlite3 to db-replica.sqlite3
+# and run with CYCLES_DB_REPLICAS=db-replica.sqlite3. Users who write are
+# read from the primary for CYCLES_REPLICA_PIN_SECONDS; the pin is kept in the
+# default cache, so with several worker processes CACHES must be shared
+# (Memcached, Redis) for it to hold across them.
+CYCLES_READ_REPLICAS = []
+for _number, _path in enumerate(filter(None, os.environ.get('CYCLES_DB_REPLICAS', '').split(',')), 1):
+    DATABASES[f'replica{_number}'] = {
+        'ENGINE': 'cycle_project.sqlite_backend',
+        'NAME': BASE_DIR / _path.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    CYCLES_READ_REPLICAS.append(f'replica{_number}')
+DATABASE_ROUTERS = ['cycles.routers.PrimaryReplicaRouter']
+CYCLES_REPLICA_PIN_SECONDS = int(os.environ.get('CYCLES_REPLICA_PIN_SECONDS', 10))
+
+# Write views retry this many times, backing off from this many seconds,
+# while the database is locked.
+CYCLES_WRITE_RETRIES = 5
+CYCLES_WRITE_RETRY_DELAY = 0.05
+
+# manage.py send_period_digests, run hourly, emails users whose cycles enter a
+# new period at this local hour (6:00 a.m. is when the daily cycle starts).
+# Set EMAIL_BACKEND to django.core.mail.backends.filebased.EmailBackend (with
+# EMAIL_FILE_PATH) to write the messages to files instead of sending them.
+CYCLES_DIGEST_HOUR = 6
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -132,4 +185,22 @@ LOGIN_URL = 'login'
 LOGOUT_REDIRECT_URL = 'home'
 
 
+# Per-request timing lines from cycles.timing.ServerTimingMiddleware are logged
+# at INFO; set CYCLES_TIMING_LOG_LEVEL=INFO to see them.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'cycles.timing': {
+            'handlers': ['console'],
+            'level': os.environ.get('CYCLES_TIMING_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+
 NPM_BIN_PATH = r"C:\Program Files\nodejs\npm.cmd"  # Use the path from the previous step
@@ -0,0 +1,45 @@
+"""SQLite backend tuned for concurrent readers and writers.
+
+Behaves like ``django.db.backends.sqlite3`` with two additions:
+
+* every new connection runs the pragmas in ``DEFAULT_PRAGMAS``, overridable
+  (or disabled with ``None``) through ``OPTIONS['pragmas']``. WAL lets
+  readers carry on while a writer commits, and ``busy_timeout`` makes a
+  writer wait for the lock instead of failing at once;
+* while ``begin_immediate`` is set, ``atomic`` starts its transaction with
+  ``BEGIN IMMEDIATE``, taking the write lock up front. A deferred
+  transaction that reads and then writes can otherwise fail with "database
+  is locked" halfway through. ``cycles.writes.immediate_atomic`` sets it.
+"""
+from django.db.backends.sqlite3 import base
+
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
+    'mmap_size': 134217728,
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.begin_immediate = False
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.pragmas = {**DEFAULT_PRAGMAS, **params.pop('pragmas', {})}
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            if value is not None:
+                conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE' if self.begin_immediate else 'BEGIN')
@@ -0,0 +1,15 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class StrictQueryBudgetRunner(DiscoverRunner):
+    """``manage.py test`` runner under which views over their ``query_budget`` fail instead of logging."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._strict_query_budget = override_settings(CYCLES_QUERY_BUDGET_STRICT=True)
+        self._strict_query_budget.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._strict_query_budget.disable()
+        super().teardown_test_environment(**kwargs)
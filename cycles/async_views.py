@@ -0,0 +1,148 @@
+"""Async versions of the busiest views, for ASGI deployments.
+
+They mirror ``views.dashboard``, ``views.user_cycle_api`` and ``views.home``
+but use the async ORM, so a request waiting on the database holds no worker
+thread of its own. In Django 4.2 the async ORM runs every query through the
+one thread-sensitive ``sync_to_async`` thread, so the lookups of a request
+run one after another, not concurrently. Building and rendering the
+response uses the sync cache (cycle results, dashboard fragments) and runs
+in that thread as well, never on the event loop. ``cycles/urls.py`` routes
+to them when ``CYCLES_ASYNC_VIEWS`` is set, which ``cycle_project/asgi.py``
+does.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.http import JsonResponse
+from django.shortcuts import redirect, render
+
+from . import views
+from .caching import cached_cycle
+from .catalog import aget_catalog
+from .conditional import conditional_cycle_view, home_validators, user_cycle_validators
+from .forms import BusinessForm, UserProfileForm
+from .models import Business, UserProfile
+from .pagination import BusinessPager
+from .profiling import sampled_profile
+from .snapshots import aload_user_snapshots, select_fresh_snapshots
+from .timing import query_budget
+from .utils import _ensure_today
+
+
+async def _is_authenticated(request):
+    # request.user is lazy and loads the session and user on first access
+    return await sync_to_async(lambda: request.user.is_authenticated)()
+
+
+def async_login_required(view):
+    """``login_required`` for coroutine views."""
+    @wraps(view)
+    async def inner(request, *args, **kwargs):
+        if not await _is_authenticated(request):
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return inner
+
+
+async def _alist(queryset):
+    return [obj async for obj in queryset]
+
+
+async def _aprofile(user):
+    # a read, like views.dashboard: get_or_create would count as a write (see routers)
+    try:
+        return await UserProfile.objects.aget(user=user)
+    except UserProfile.DoesNotExist:
+        return await UserProfile.objects.acreate(user=user)
+
+
+def _dashboard_response(request, user_profile, snapshots, businesses, catalog):
+    context = views._dashboard_context(user_profile, snapshots, businesses, catalog)
+    context.update(
+        user_profile_form=UserProfileForm(instance=user_profile),
+        business_form=BusinessForm(),
+    )
+    return views._render_dashboard(request, context)
+
+
+def _business_items(businesses):
+    return [views._business_cycle_item(b) for b in businesses]
+
+
+@async_login_required
+@sampled_profile
+@query_budget(8)
+async def dashboard(request):
+    if request.method == 'POST':
+        # Form posts are rare writes; the sync view handles them in a worker thread.
+        return await sync_to_async(views.dashboard)(request)
+
+    try:
+        businesses_qs = views._business_queryset(request)
+    except ValueError:
+        businesses_qs = request.user.business_set.by_cycle()
+    today = _ensure_today(None)
+    user_profile = await _aprofile(request.user)
+    snapshot_rows = await aload_user_snapshots(request.user.pk, today)
+    businesses = await _alist(businesses_qs)
+    catalog = await aget_catalog()
+    snapshots = select_fresh_snapshots(snapshot_rows, user_profile.date_of_birth, today)
+    return await sync_to_async(_dashboard_response)(request, user_profile, snapshots, businesses, catalog)
+
+
+@conditional_cycle_view(home_validators)
+async def home(request):
+    if await _is_authenticated(request):
+        return redirect('dashboard')
+
+    daily_periods, current_daily_period = await sync_to_async(cached_cycle)('daily')
+    context = {
+        'daily_periods': daily_periods,
+        'current_daily_period': current_daily_period,
+    }
+    return render(request, 'cycles/home.html', context)
+
+
+@async_login_required
+@sampled_profile
+@query_budget(6)
+@conditional_cycle_view(user_cycle_validators)
+async def user_cycle_api(request, cycle_type):
+    """Async ``views.user_cycle_api``; the responses are identical."""
+    user = request.user
+    if cycle_type in views.USER_CYCLE_TYPES:
+        today = _ensure_today(None)
+        user_profile = await UserProfile.objects.filter(user_id=user.pk).afirst()
+        snapshot_rows = []
+        if cycle_type in views.BIRTH_DATE_CYCLES:
+            snapshot_rows = await aload_user_snapshots(user.pk, today)
+        snapshots = select_fresh_snapshots(snapshot_rows, user_profile.date_of_birth if user_profile else None, today)
+        payload = await sync_to_async(views._cycle_payload)(cycle_type, user_profile, snapshots)
+        if payload is None:
+            return JsonResponse({'error': 'birth_date_missing'}, status=400)
+        return JsonResponse(payload)
+
+    if cycle_type == 'business':
+        try:
+            businesses_qs = views._business_queryset(request)
+        except ValueError as exc:
+            return JsonResponse({'error': str(exc)}, status=400)
+        business_id = request.GET.get('business_id')
+        if business_id:
+            try:
+                b = await businesses_qs.aget(pk=int(business_id))
+            except (ValueError, Business.DoesNotExist):
+                return JsonResponse({'error': 'business_not_found'}, status=404)
+            item = await sync_to_async(views._business_cycle_item)(b)
+            legacy = {'business': b.name, 'periods': item['periods'], 'current_period': item['current_period'], 'progress': item['progress'], 'template': item['template']}
+            return JsonResponse({'business_cycles': [item], 'business': legacy})
+        try:
+            pager = BusinessPager.from_request(user.business_set.all(), request.GET)
+        except ValueError as exc:
+            return JsonResponse({'error': str(exc)}, status=400)
+        page = pager.page(await _alist(pager.queryset))
+        items = await sync_to_async(_business_items)(page.items)
+        return JsonResponse({'business_cycles': items, 'next': page.next_cursor})
+
+    return JsonResponse({'error': 'unsupported_cycle_type'}, status=400)
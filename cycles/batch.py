@@ -0,0 +1,167 @@
+"""Vectorised cycle engine for computing many birth/establishment dates at once.
+
+The scalar ``get_*`` functions in :mod:`cycles.utils` rebuild their period
+lists on every call, which is fine for a single request but dominates nightly
+jobs over millions of profiles. ``compute_cycles_batch`` answers the same
+question (which period is current, how far along it is and when it ends) for a
+whole NumPy array of dates using precomputed day/age -> period lookup tables.
+Its results match the scalar functions for every supported cycle type.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .utils import (
+    CYCLE_DAY_BOUNDS,
+    DAYS_IN_CYCLE,
+    HUMAN_PERIOD_YEARS,
+    LIFETIME_YEARS,
+    REINCARNATION_PERIOD_YEARS,
+    _ensure_today,
+)
+
+
+BATCH_CYCLE_TYPES = ('yearly', 'health', 'business', 'human', 'reincarnation')
+
+CycleBatchResult = namedtuple('CycleBatchResult', ['period_index', 'progress', 'next_transition'])
+CycleBatchResult.__doc__ = """Per-date results of :func:`compute_cycles_batch`.
+
+``period_index`` is the 0-based index into the scalar function's period list
+(-1 for missing dates), ``progress`` is the same percentage the scalar
+function returns (NaN for missing dates) and ``next_transition`` is the date
+the next period starts (NaT when there is no later period).
+"""
+
+
+def _build_day_table():
+    # Indexed by 1-based day of cycle; day 366 (leap years) stays in the last period.
+    table = np.empty(DAYS_IN_CYCLE + 2, dtype=np.int16)
+    table[0] = 0
+    for index, (start_day, end_day) in enumerate(CYCLE_DAY_BOUNDS):
+        table[start_day:end_day + 1] = index
+    table[DAYS_IN_CYCLE + 1] = len(CYCLE_DAY_BOUNDS) - 1
+    return table
+
+
+def _build_age_table(period_years):
+    # Indexed by completed years of age, capped at LIFETIME_YEARS.
+    total_periods = LIFETIME_YEARS // period_years
+    ages = np.arange(LIFETIME_YEARS + 1)
+    return np.minimum(ages // period_years, total_periods - 1).astype(np.int16)
+
+
+_DAY_TABLE = _build_day_table()
+_PERIOD_END_DAY = np.array([end_day for _, end_day in CYCLE_DAY_BOUNDS], dtype=np.int64)
+_LAST_DAY_PERIOD = len(CYCLE_DAY_BOUNDS) - 1
+
+_AGE_TABLES = {
+    'human': (_build_age_table(HUMAN_PERIOD_YEARS), HUMAN_PERIOD_YEARS),
+    'reincarnation': (_build_age_table(REINCARNATION_PERIOD_YEARS), REINCARNATION_PERIOD_YEARS),
+}
+
+
+def _as_day_array(dates):
+    """Return ``dates`` as a ``datetime64[D]`` array; None/'' become NaT."""
+    if isinstance(dates, np.ndarray) and np.issubdtype(dates.dtype, np.datetime64):
+        return dates.astype('datetime64[D]')
+    return np.array([d if d else None for d in dates], dtype='datetime64[D]')
+
+
+def _split_dates(days):
+    """Return (year, month, day) integer arrays for a ``datetime64[D]`` array."""
+    years = days.astype('datetime64[Y]')
+    months = days.astype('datetime64[M]')
+    year = years.astype(np.int64) + 1970
+    month = (months - years.astype('datetime64[M]')).astype(np.int64) + 1
+    day = (days - months.astype('datetime64[D]')).astype(np.int64) + 1
+    return year, month, day
+
+
+def _anniversaries(month, day, year):
+    """Vectorised ``_replace_year``: (month, day) in ``year``, Feb 29 -> Feb 28 on non-leap years."""
+    month_start = (year - 1970).astype('datetime64[Y]').astype('datetime64[M]') + (month - 1).astype('timedelta64[M]')
+    first_day = month_start.astype('datetime64[D]')
+    month_length = ((month_start + 1).astype('datetime64[D]') - first_day).astype(np.int64)
+    return first_day + (np.minimum(day, month_length) - 1).astype('timedelta64[D]')
+
+
+def _ages(year, month, day, as_of):
+    """Completed years on ``as_of`` for each (year, month, day), never negative."""
+    before_birthday = (as_of.month * 32 + as_of.day) < (month * 32 + day)
+    return np.maximum(as_of.year - year - before_birthday, 0)
+
+
+def _birthday_batch(days, as_of, as_of_day):
+    year, month, day = _split_dates(days)
+    this_year = _anniversaries(month, day, np.full_like(year, as_of.year))
+    last_year = _anniversaries(month, day, np.full_like(year, as_of.year - 1))
+    cycle_start = np.where(as_of_day < this_year, last_year, this_year)
+
+    days_since_birthday = (as_of_day - cycle_start).astype(np.int64)
+    days_into_cycle = np.clip(days_since_birthday + 1, 1, DAYS_IN_CYCLE + 1)
+    period_index = _DAY_TABLE[days_into_cycle]
+    progress = days_since_birthday / DAYS_IN_CYCLE * 100
+
+    start_year = cycle_start.astype('datetime64[Y]').astype(np.int64) + 1970
+    next_birthday = _anniversaries(month, day, start_year + 1)
+    next_transition = np.where(
+        period_index == _LAST_DAY_PERIOD,
+        next_birthday,
+        cycle_start + _PERIOD_END_DAY[period_index].astype('timedelta64[D]'),
+    )
+    return period_index, progress, next_transition
+
+
+def _business_batch(days, as_of_day):
+    days_since_establishment = (as_of_day - days).astype(np.int64)
+    days_into_cycle = np.mod(days_since_establishment, DAYS_IN_CYCLE) + 1
+    period_index = _DAY_TABLE[days_into_cycle]
+    progress = days_into_cycle / DAYS_IN_CYCLE * 100
+    next_transition = as_of_day + (_PERIOD_END_DAY[period_index] - days_into_cycle + 1).astype('timedelta64[D]')
+    return period_index, progress, next_transition
+
+
+def _age_batch(days, as_of, as_of_day, cycle_type):
+    table, period_years = _AGE_TABLES[cycle_type]
+    year, month, day = _split_dates(days)
+    ages = _ages(year, month, day, as_of)
+    period_index = table[np.minimum(ages, LIFETIME_YEARS)]
+    progress = (ages % period_years) / period_years * 100
+
+    next_start_age = (period_index.astype(np.int64) + 1) * period_years
+    next_transition = _anniversaries(month, day, year + next_start_age)
+    last_period = table[-1]
+    next_transition[period_index == last_period] = np.datetime64('NaT')
+    return period_index, progress, next_transition
+
+
+def compute_cycles_batch(cycle_type, dates_array, as_of=None):
+    """Compute the current period of ``cycle_type`` for every date in ``dates_array``.
+
+    ``dates_array`` holds birth dates (establishment dates for ``business``) as a
+    ``datetime64`` array or any sequence of dates/ISO strings; missing entries are
+    allowed. ``as_of`` defaults to today. Returns a :class:`CycleBatchResult`
+    of arrays aligned with the input.
+    """
+    if cycle_type not in BATCH_CYCLE_TYPES:
+        raise ValueError(f'unsupported cycle_type for batch computation: {cycle_type!r}')
+
+    as_of = _ensure_today(as_of)
+    as_of_day = np.datetime64(as_of, 'D')
+    days = _as_day_array(dates_array)
+
+    missing = np.isnat(days)
+    # Work on a NaT-free copy so the date arithmetic never sees sentinel values.
+    safe_days = np.where(missing, as_of_day, days)
+
+    if cycle_type in ('yearly', 'health'):
+        period_index, progress, next_transition = _birthday_batch(safe_days, as_of, as_of_day)
+    elif cycle_type == 'business':
+        period_index, progress, next_transition = _business_batch(safe_days, as_of_day)
+    else:
+        period_index, progress, next_transition = _age_batch(safe_days, as_of, as_of_day, cycle_type)
+
+    period_index = np.where(missing, -1, period_index).astype(np.int16)
+    progress = np.where(missing, np.nan, progress).astype(np.float64)
+    next_transition = np.where(missing, np.datetime64('NaT'), next_transition).astype('datetime64[D]')
+    return CycleBatchResult(period_index, progress, next_transition)
@@ -0,0 +1,242 @@
+"""Measurements behind ``manage.py bench``.
+
+Every measurement is a flat ``name -> number`` metric so two runs can be
+compared key by key. Names end in their unit: ``_us`` and ``_ms`` are
+timings, ``_bytes`` are peak allocations and ``queries`` are ORM query
+counts. Timings and allocations regress when they grow past a relative
+threshold; query counts regress on any increase.
+"""
+import statistics
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, reset_queries
+from django.template.loader import render_to_string
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import utils
+from .catalog import get_catalog
+from .models import Business, UserProfile
+from .snapshots import load_fresh_snapshots
+
+
+BENCH_USERNAME = '__cycles_bench__'
+BIRTH_DATE = date(1988, 7, 14)
+ESTABLISHMENT_DATE = date(2012, 3, 5)
+
+
+def function_cases(today=None):
+    """Return ``{name: zero-argument callable}`` covering every ``get_*`` function in ``cycles.utils``."""
+    today = today or date.today()
+    now = datetime.combine(today, datetime.min.time()).replace(hour=10)
+    return {
+        'get_zone': lambda: utils.get_zone('Europe/Paris'),
+        'get_daily_cycle': lambda: utils.get_daily_cycle(now),
+        'get_daily_cycle_tz': lambda: utils.get_daily_cycle(now.replace(tzinfo=timezone.utc), tz='Asia/Tokyo'),
+        'get_yearly_cycle': lambda: utils.get_yearly_cycle(BIRTH_DATE, today=today),
+        'get_business_cycle': lambda: utils.get_business_cycle(ESTABLISHMENT_DATE, today=today),
+        'get_soul_cycle': lambda: utils.get_soul_cycle(today),
+        'get_human_life_cycle': lambda: utils.get_human_life_cycle(BIRTH_DATE, today=today),
+        'get_health_cycle': lambda: utils.get_health_cycle(BIRTH_DATE, today=today),
+        'get_reincarnation_cycle': lambda: utils.get_reincarnation_cycle(BIRTH_DATE, today=today),
+        'get_cycle_progress': lambda: utils.get_cycle_progress('yearly', BIRTH_DATE, today=today),
+        'get_next_transition': lambda: utils.get_next_transition('yearly', BIRTH_DATE, today),
+        'get_cycle_segments': lambda: utils.get_cycle_segments(
+            BIRTH_DATE, today, today + timedelta(days=365), cycle_types=utils.CYCLE_TYPES[1:],
+            establishment_date=ESTABLISHMENT_DATE,
+        ),
+        'get_period_names': lambda: utils.get_period_names('yearly'),
+    }
+
+
+def time_per_call_us(func, min_time=0.2):
+    """Return the best microseconds per call over five runs of at least ``min_time`` seconds in total."""
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time / 5:
+            break
+        loops *= 2
+    best = elapsed
+    for _ in range(4):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, time.perf_counter() - started)
+    return best / loops * 1e6
+
+
+def peak_bytes_per_call(func, calls=20):
+    """Return the largest peak of memory allocated during one call of ``func``."""
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        func()  # warm up caches so only per-call allocations are counted
+        peak = 0
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            func()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+        return peak
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+
+def bench_functions(min_time=0.2):
+    metrics = {}
+    for name, func in function_cases().items():
+        metrics[f'functions.{name}.per_call_us'] = round(time_per_call_us(func, min_time), 3)
+        metrics[f'functions.{name}.peak_bytes'] = peak_bytes_per_call(func)
+    return metrics
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def create_bench_user(business_count):
+    """Create the benchmark user with a birth date and ``business_count`` businesses."""
+    user = User.objects.create_user(username=BENCH_USERNAME)
+    profile = user.userprofile
+    profile.date_of_birth = BIRTH_DATE
+    profile.save()
+    set_business_count(user, business_count)
+    return user
+
+
+def set_business_count(user, business_count):
+    Business.objects.filter(user=user).delete()
+    businesses = []
+    for i in range(business_count):
+        businesses.append(Business(
+            user=user,
+            name=f'Bench business {i:04d}',
+            establishment_date=ESTABLISHMENT_DATE + timedelta(days=i * 3),
+        ))
+    Business.objects.bulk_create(businesses, batch_size=500)
+
+
+def view_cases():
+    return {
+        'dashboard': reverse('dashboard'),
+        'user_cycle_api.yearly': reverse('user_cycle_api', args=['yearly']),
+        'user_cycle_api.business': reverse('user_cycle_api', args=['business']),
+        'user_cycles_api': reverse('user_cycles_api'),
+    }
+
+
+def bench_views(client, label, requests=50):
+    """Measure query counts and p50/p99 latency of each view for the logged-in ``client``."""
+    metrics = {}
+    for name, url in view_cases().items():
+        started = time.perf_counter()
+        response = client.get(url)
+        first = time.perf_counter() - started
+        if response.status_code != 200:
+            raise RuntimeError(f'{url} returned {response.status_code}')
+        # count the steady state, once the first request has warmed the caches;
+        # a full DEBUG query log (it is capped) would make every count zero
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            client.get(url)
+        query_count = len(queries)  # before later requests reset the query log
+        samples = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            client.get(url)
+            samples.append((time.perf_counter() - started) * 1000)
+        prefix = f'views.{name}.{label}'
+        metrics[f'{prefix}.queries'] = query_count
+        metrics[f'{prefix}.first_ms'] = round(first * 1000, 3)
+        metrics[f'{prefix}.p50_ms'] = round(percentile(samples, 50), 3)
+        metrics[f'{prefix}.p99_ms'] = round(percentile(samples, 99), 3)
+    return metrics
+
+
+def bench_template(user, label, repeat=20):
+    """Time rendering ``cycles/dashboard.html`` without and with the fragment cache."""
+    from .forms import BusinessForm, UserProfileForm
+    from .views import _dashboard_context
+
+    profile = UserProfile.objects.get(user=user)
+    request = RequestFactory().get(reverse('dashboard'))
+    request.user = user
+    context = _dashboard_context(profile, load_fresh_snapshots(profile), list(user.business_set.all()), get_catalog())
+    context.update(user_profile_form=UserProfileForm(instance=profile), business_form=BusinessForm())
+    uncached = dict(context, fragments={})
+
+    def render(ctx):
+        started = time.perf_counter()
+        render_to_string('cycles/dashboard.html', ctx, request=request)
+        return (time.perf_counter() - started) * 1000
+
+    render(context)  # prime the fragment cache
+    return {
+        f'templates.dashboard.{label}.uncached_ms': round(statistics.median(render(uncached) for _ in range(repeat)), 3),
+        f'templates.dashboard.{label}.cached_ms': round(statistics.median(render(context) for _ in range(repeat)), 3),
+    }
+
+
+def _bench_host():
+    for host in settings.ALLOWED_HOSTS:
+        if host != '*' and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+
+def bench_requests(business_counts=(0, 10, 1000), requests=50):
+    """Run the view and template benchmarks for each business count.
+
+    Creates its own user; run it inside a transaction that is rolled back.
+    """
+    user = create_bench_user(0)
+    client = Client(HTTP_HOST=_bench_host())
+    client.force_login(user)
+    metrics = {}
+    for count in business_counts:
+        set_business_count(user, count)
+        label = f'b{count}'
+        metrics.update(bench_views(client, label, requests))
+        metrics.update(bench_template(user, label))
+    return metrics
+
+
+def _is_count(name):
+    return name.endswith('.queries')
+
+
+def compare(current, baseline, threshold=0.2):
+    """Return ``(regressions, improvements)`` of ``current`` against ``baseline`` metrics.
+
+    Each entry is ``(name, baseline_value, current_value)``. Metrics missing
+    from either side are ignored.
+    """
+    regressions, improvements = [], []
+    for name, value in sorted(current.items()):
+        old = baseline.get(name)
+        if old is None:
+            continue
+        if _is_count(name):
+            if value > old:
+                regressions.append((name, old, value))
+            elif value < old:
+                improvements.append((name, old, value))
+        elif value > old * (1 + threshold):
+            regressions.append((name, old, value))
+        elif value < old * (1 - threshold):
+            improvements.append((name, old, value))
+    return regressions, improvements
@@ -0,0 +1,145 @@
+"""Bulk cycle computation streamed back as NDJSON.
+
+Rows of ``{"id", "birth_date", "establishment_date"}`` are grouped into
+chunks, each chunk is computed with the vectorised batch engine on a shared
+worker pool, and the results are yielded one chunk at a time in input order.
+At most a few chunks are in flight, so memory stays flat however many rows a
+request holds. That holds for NDJSON bodies, which are read line by line; a
+JSON body is parsed whole, so the view caps it at ``json_max_rows()``.
+"""
+import json
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from itertools import islice
+
+from django.conf import settings
+
+from .batch import BATCH_CYCLE_TYPES, compute_cycles_batch
+from .utils import get_period_names
+
+
+_executor_lock = threading.Lock()
+_executor = None
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def get_executor():
+    """Return the process-wide worker pool used for bulk computations."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=_setting('CYCLES_BULK_WORKERS', 4),
+                thread_name_prefix='cycles-bulk',
+            )
+        return _executor
+
+
+def _source_field(cycle_type):
+    return 'establishment_date' if cycle_type == 'business' else 'birth_date'
+
+
+def compute_chunk(rows, cycle_types, as_of):
+    """Compute ``cycle_types`` for a chunk of rows and return the NDJSON text for it."""
+    columns = {}
+    for cycle_type in cycle_types:
+        field = _source_field(cycle_type)
+        result = compute_cycles_batch(cycle_type, [row.get(field) for row in rows], as_of)
+        # plain lists are much faster to walk than per-element NumPy indexing
+        transitions = [None if t == 'NaT' else t for t in result.next_transition.astype(str).tolist()]
+        columns[cycle_type] = (result.period_index.tolist(), result.progress.tolist(), transitions)
+
+    lines = []
+    for i, row in enumerate(rows):
+        if 'error' in row:
+            lines.append(json.dumps({'id': row.get('id'), 'error': row['error']}))
+            continue
+        cycles = {}
+        for cycle_type, (indexes, progress, transitions) in columns.items():
+            index = indexes[i]
+            if index < 0:
+                cycles[cycle_type] = {'error': f'{_source_field(cycle_type)}_missing'}
+                continue
+            cycles[cycle_type] = {
+                'period': index + 1,
+                'name': get_period_names(cycle_type)[index],
+                'progress': progress[i],
+                'next_transition': transitions[i],
+            }
+        lines.append(json.dumps({'id': row.get('id'), 'cycles': cycles}))
+    return '\n'.join(lines) + '\n'
+
+
+def _valid_date(value):
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_row(index, row):
+    """Return a row with parsed dates; rows that are not objects carry an ``error``."""
+    if not isinstance(row, dict):
+        return {'id': index, 'error': 'invalid_row'}
+    return {
+        'id': row.get('id', index),
+        'birth_date': _valid_date(row.get('birth_date')),
+        'establishment_date': _valid_date(row.get('establishment_date')),
+    }
+
+
+def iter_ndjson_rows(lines):
+    """Yield normalized rows from an iterable of NDJSON lines (bytes or str)."""
+    index = 0
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield normalize_row(index, row)
+        index += 1
+
+
+def stream_results(rows, cycle_types, as_of, chunk_size=None, max_rows=None):
+    """Yield NDJSON text chunk by chunk for ``rows`` (an iterable of normalized rows)."""
+    chunk_size = chunk_size or _setting('CYCLES_BULK_CHUNK_SIZE', 5000)
+    max_rows = max_rows or _setting('CYCLES_BULK_MAX_ROWS', 1000000)
+    executor = get_executor()
+    max_in_flight = _setting('CYCLES_BULK_WORKERS', 4) * 2
+
+    rows = iter(rows)
+    pending = deque()
+    seen = 0
+    while seen < max_rows:
+        chunk = list(islice(rows, min(chunk_size, max_rows - seen)))
+        if not chunk:
+            break
+        seen += len(chunk)
+        pending.append(executor.submit(compute_chunk, chunk, cycle_types, as_of))
+        # keep a bounded number of chunks in flight so memory stays flat
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+    if seen >= max_rows and next(rows, None) is not None:
+        yield json.dumps({'error': 'too_many_rows', 'max_rows': max_rows}) + '\n'
+
+
+def json_max_rows():
+    """The most rows a JSON (not NDJSON) request may hold."""
+    return _setting('CYCLES_BULK_JSON_MAX_ROWS', 10000)
+
+
+def validate_cycle_types(cycle_types):
+    """Return the list of unsupported cycle types in ``cycle_types``."""
+    return [t for t in cycle_types if t not in BATCH_CYCLE_TYPES]
@@ -0,0 +1,152 @@
+"""Cache for cycle results that expires exactly at the next period boundary.
+
+Cycle results only change at known moments (every 206 minutes for the daily
+cycle, at 52-day boundaries for yearly/health/business, and so on), so each
+entry lives until the current period ends. The key holds the input date and
+the transition the entry is valid until, and the timeout is the time left
+until that transition. An entry therefore never expires early and can never
+be served after its period has ended.
+
+Some period dates move without a transition: soul periods are dated in the
+current year (Harmony, Dec 6 - Jan 25, from December on), and business
+periods from the last establishment anniversary. For those cycles the key
+also holds that anchor, so a new year or anniversary starts a new entry.
+Progress still moves daily, so it is recomputed on every hit.
+"""
+import math
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+
+from .utils import (
+    _business_cycle_start,
+    _ensure_date,
+    get_business_cycle,
+    get_cycle_progress,
+    get_daily_cycle,
+    get_health_cycle,
+    get_human_life_cycle,
+    get_next_transition,
+    get_reincarnation_cycle,
+    get_soul_cycle,
+    get_yearly_cycle,
+    get_zone,
+)
+
+
+CACHE_KEY_PREFIX = 'cycles:v1'
+
+_DATED_CYCLE_FUNCTIONS = {
+    'yearly': get_yearly_cycle,
+    'health': get_health_cycle,
+    'business': get_business_cycle,
+    'human': get_human_life_cycle,
+    'reincarnation': get_reincarnation_cycle,
+}
+
+_stats_lock = threading.Lock()
+_hits = Counter()
+_misses = Counter()
+
+
+def _record(counter, cycle_type):
+    with _stats_lock:
+        counter[cycle_type] += 1
+
+
+def cache_stats():
+    """Return this process's cache hit/miss counters, overall and per cycle type."""
+    with _stats_lock:
+        cycle_types = sorted(set(_hits) | set(_misses))
+        return {
+            'hits': sum(_hits.values()),
+            'misses': sum(_misses.values()),
+            'by_cycle': {ct: {'hits': _hits[ct], 'misses': _misses[ct]} for ct in cycle_types},
+        }
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _hits.clear()
+        _misses.clear()
+
+
+def seconds_until(transition, now):
+    """Whole seconds from ``now`` until ``transition`` (a datetime, or the start of a date), at least 1."""
+    if not isinstance(transition, datetime):
+        transition = datetime.combine(transition, datetime.min.time())
+    return max(1, math.ceil((transition - now).total_seconds()))
+
+
+def _compute(cycle_type, source_date, now, tz):
+    if cycle_type == 'daily':
+        return get_daily_cycle(now, tz=tz)
+    if cycle_type == 'soul':
+        return get_soul_cycle(now.date())
+    return _DATED_CYCLE_FUNCTIONS[cycle_type](source_date, today=now.date())
+
+
+def _anchor(cycle_type, source_date, today):
+    """What the period dates of ``cycle_type`` are laid out from on ``today``, beyond the transition."""
+    if cycle_type == 'soul':
+        return f'{today.year}-{"dec" if today.month == 12 else "jan"}'
+    if cycle_type == 'business':
+        return _business_cycle_start(source_date, today).isoformat()
+    return None
+
+
+def cached_cycle(cycle_type, source_date=None, now=None, tz=None):
+    """Return the ``get_*`` result for ``cycle_type``, cached until its next transition.
+
+    ``source_date`` is the birth date (establishment date for ``business``) and
+    is ignored for ``daily`` and ``soul``. ``tz`` makes the daily cycle follow
+    that timezone (see ``get_daily_cycle``). The return shape matches the
+    wrapped function: ``(periods, current_period)`` for daily and
+    ``(periods, current_period, progress)`` for everything else.
+    """
+    if cycle_type not in _DATED_CYCLE_FUNCTIONS and cycle_type not in ('daily', 'soul'):
+        raise ValueError(f'unsupported cycle_type: {cycle_type!r}')
+    if cycle_type != 'daily':
+        tz = None
+    if tz is not None:
+        tz = get_zone(tz).key
+        now = now or datetime.now(timezone.utc)
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=timezone.utc)
+    now = now or datetime.now()
+    if not isinstance(now, datetime):
+        now = datetime.combine(now, datetime.min.time())
+    source_date = _ensure_date(source_date) if cycle_type in _DATED_CYCLE_FUNCTIONS else None
+    if cycle_type in _DATED_CYCLE_FUNCTIONS and not source_date:
+        return _DATED_CYCLE_FUNCTIONS[cycle_type](None)
+
+    transition = get_next_transition(cycle_type, source_date, now, tz=tz)
+    parts = [
+        CACHE_KEY_PREFIX,
+        cycle_type,
+        source_date.isoformat() if source_date else (tz or '-'),
+        transition.isoformat() if transition else 'final',
+    ]
+    anchor = _anchor(cycle_type, source_date, now.date())
+    if anchor is not None:
+        parts.append(anchor)
+    key = ':'.join(parts)
+    cached = cache.get(key)
+    if cached is not None:
+        _record(_hits, cycle_type)
+        periods, index = cached
+    else:
+        _record(_misses, cycle_type)
+        result = _compute(cycle_type, source_date, now, tz)
+        periods, current_period = result[0], result[1]
+        index = periods.index(current_period) if current_period in periods else None
+        # the final human/reincarnation period never ends, so keep it until evicted
+        timeout = seconds_until(transition, now) if transition else None
+        cache.set(key, (periods, index), timeout)
+
+    current_period = periods[index] if index is not None else None
+    if cycle_type == 'daily':
+        return periods, current_period
+    return periods, current_period, get_cycle_progress(cycle_type, source_date, now.date())
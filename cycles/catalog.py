@@ -0,0 +1,99 @@
+"""In-process catalog of CycleTemplate rows.
+
+Every template is loaded in a single query and indexed by
+``(cycle_type, period_number)`` with ``start_age``/``end_age``/``advice``
+already pulled out of ``effects``. The catalog is immutable; saving or
+deleting a CycleTemplate invalidates it (see ``signals.py``) and the next
+lookup reloads it.
+"""
+import hashlib
+import json
+import threading
+from types import MappingProxyType
+
+from asgiref.sync import sync_to_async
+
+from .models import CycleTemplate
+
+
+def _flatten(tpl):
+    """Return the flattened template dict served by the views and API."""
+    effects = tpl.effects or {}
+    return {
+        'description': tpl.description,
+        'effects': effects,
+        'start_age': effects.get('start_age'),
+        'end_age': effects.get('end_age'),
+        'advice': effects.get('advice') or effects.get('summary'),
+        'full_description': tpl.description,
+    }
+
+
+class TemplateCatalog:
+    """Immutable ``(cycle_type, period_number)`` index of flattened templates."""
+
+    def __init__(self, templates):
+        entries = {}
+        digest = hashlib.sha1()
+        modified = []
+        for tpl in sorted(templates, key=lambda t: (t.cycle_type, t.period_number)):
+            entries[(tpl.cycle_type, tpl.period_number)] = MappingProxyType(_flatten(tpl))
+            digest.update(json.dumps([tpl.cycle_type, tpl.period_number, tpl.description, tpl.effects], sort_keys=True, default=str).encode('utf-8'))
+            if tpl.updated_at is not None:
+                modified.append(tpl.updated_at.timestamp())
+        self._entries = MappingProxyType(entries)
+        # Content hash, identical in every worker that loaded the same rows.
+        self.version = digest.hexdigest()[:12]
+        # When a template was last saved, also the same in every worker; a
+        # deleted template does not move it (``version`` still changes).
+        self.modified_at = max(modified, default=None)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, cycle_type, period_number):
+        """Return a copy of the flattened template, or None if there is none."""
+        entry = self._entries.get((cycle_type, period_number))
+        return dict(entry) if entry is not None else None
+
+    def description(self, cycle_type, period_number, default=''):
+        entry = self._entries.get((cycle_type, period_number))
+        return entry['description'] if entry is not None else default
+
+
+_lock = threading.Lock()
+_catalog = None
+
+
+def get_catalog():
+    """Return the current catalog, loading it with one query if needed."""
+    global _catalog
+    catalog = _catalog
+    if catalog is None:
+        with _lock:
+            if _catalog is None:
+                _catalog = TemplateCatalog(CycleTemplate.objects.all())
+            catalog = _catalog
+    return catalog
+
+
+async def aget_catalog():
+    """Async ``get_catalog``: returns the loaded catalog directly, loading it in a worker thread if needed."""
+    catalog = _catalog
+    if catalog is not None:
+        return catalog
+    return await sync_to_async(get_catalog)()
+
+
+def invalidate():
+    """Drop the loaded catalog so the next lookup reloads it from the database."""
+    global _catalog
+    with _lock:
+        _catalog = None
+
+
+def get_template(cycle_type, period_number):
+    return get_catalog().get(cycle_type, period_number)
@@ -0,0 +1,229 @@
+"""Conditional GET and boundary-aligned Cache-Control for the cycle views.
+
+Validators are derived from what a response depends on (the profile, the
+businesses queried, the window during which the cycle payload cannot change
+and the template catalog version), so a 304 is answered without computing
+any cycle. ``max-age`` is the time left until that window ends: the next
+period transition, or the next day/birthday when the reported progress moves
+sooner.
+"""
+import asyncio
+import hashlib
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from .catalog import get_catalog
+from .ical import feed_modified_at, parse_feed_options
+from .models import Business, UserProfile
+from .pagination import BusinessPager
+from .utils import (
+    DAILY_PERIOD_MINUTES,
+    _birthday_cycle_start,
+    _daily_position,
+    _daily_position_in_zone,
+    _replace_year,
+)
+
+
+CycleValidators = namedtuple('CycleValidators', ['etag', 'last_modified', 'max_age', 'private'])
+
+BIRTH_DATE_CYCLES = ('human', 'yearly', 'health', 'reincarnation')
+
+
+def _midnight(d):
+    return datetime.combine(d, datetime.min.time())
+
+
+def payload_window(cycle_type, source_date=None, now=None, tz=None):
+    """Return ``(start, end)`` of the window in which a cycle payload cannot change.
+
+    Daily windows are single periods (aware instants when ``tz`` is given).
+    Age-based cycles only move on birthdays; every other cycle reports progress
+    that moves daily, so its window is the current day.
+    """
+    if cycle_type == 'daily':
+        if tz is not None:
+            now = now or datetime.now(timezone.utc)
+            if now.tzinfo is None:
+                now = now.replace(tzinfo=timezone.utc)
+            boundaries, index = _daily_position_in_zone(now, tz)
+            return boundaries[index], boundaries[index + 1]
+        now = now or datetime.now()
+        start_of_day, index = _daily_position(now)
+        start = start_of_day + timedelta(minutes=DAILY_PERIOD_MINUTES * index)
+        end = start_of_day + timedelta(days=1) if index == 6 else start + timedelta(minutes=DAILY_PERIOD_MINUTES)
+        return start, end
+
+    now = now or datetime.now()
+    today = now.date()
+    if cycle_type in ('human', 'reincarnation') and source_date:
+        last_birthday = _birthday_cycle_start(source_date, today)
+        return _midnight(last_birthday), _midnight(_replace_year(source_date, last_birthday.year + 1))
+    return _midnight(today), _midnight(today + timedelta(days=1))
+
+
+def _timestamp(moment):
+    # naive datetimes are server-local, like the rest of the cycle engine
+    return moment.timestamp()
+
+
+def _etag(*parts):
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def _validators(parts, window, now, last_modified_candidates, private=True):
+    start, end = window
+    if last_modified_candidates is None:
+        last_modified = None
+    else:
+        last_modified = max([_timestamp(start)] + last_modified_candidates)
+    max_age = max(0, int((end - now).total_seconds()))
+    return CycleValidators(_etag(*parts, start.isoformat()), last_modified, max_age, private)
+
+
+def user_cycle_validators(request, cycle_type):
+    """Validators for ``user_cycle_api``; None when the request is not cacheable."""
+    user = request.user
+    if not getattr(user, 'is_authenticated', False) or not getattr(user, 'pk', None):
+        return None
+    profile = UserProfile.objects.filter(user=user).first()
+    catalog = get_catalog()
+
+    if cycle_type == 'business':
+        period, order = request.GET.get('period'), request.GET.get('order')
+        business_id = request.GET.get('business_id')
+        try:
+            if business_id:
+                if not business_id.isdigit():
+                    return None
+                businesses = user.business_set.by_cycle(period, order).filter(pk=int(business_id))
+            else:
+                # only the requested page, so the ETag costs the same for any number of businesses
+                businesses = BusinessPager.from_request(user.business_set.all(), request.GET).queryset
+        except ValueError:
+            return None
+        fingerprint = tuple(businesses.values_list('pk', 'name', 'establishment_date'))
+        now = datetime.now()
+        parts = (
+            'business', user.pk, business_id, period, order,
+            request.GET.get('cursor'), request.GET.get('limit'), fingerprint, catalog.version,
+        )
+        # deletions leave no timestamp behind, so business responses rely on the ETag alone
+        return _validators(parts, payload_window('business', now=now), now, None)
+
+    if cycle_type not in BIRTH_DATE_CYCLES + ('daily', 'soul'):
+        return None
+    birth_date = profile.date_of_birth if profile else None
+    if cycle_type in BIRTH_DATE_CYCLES and not birth_date:
+        return None
+    tz = profile.timezone if (profile and cycle_type == 'daily') else None
+    now = datetime.now(timezone.utc) if tz else datetime.now()
+    window = payload_window(cycle_type, birth_date, now, tz)
+    parts = (cycle_type, user.pk, birth_date, tz, profile.updated_at if profile else None, catalog.version)
+    candidates = [catalog.modified_at] if catalog.modified_at is not None else []
+    if profile and profile.updated_at:
+        candidates.append(profile.updated_at.timestamp())
+    return _validators(parts, window, now, candidates)
+
+
+def calendar_validators(request, token):
+    """Validators for the calendar feed; None for unknown tokens or invalid options.
+
+    The feed only changes when the dates or the catalog change, or when the
+    day rolls over (the horizon moves), so hourly polls mostly get a 304.
+    The ETag covers the feed's ``DTSTAMP`` as well.
+    """
+    options = parse_feed_options(request.GET)
+    profile = UserProfile.objects.filter(calendar_token=token).values(
+        'pk', 'user_id', 'date_of_birth', 'updated_at',
+    ).first()
+    if options is None or profile is None:
+        return None
+    businesses = ()
+    if 'business' in options[1]:
+        businesses = tuple(
+            Business.objects.filter(user_id=profile['user_id']).order_by('pk')
+            .values_list('pk', 'name', 'establishment_date')
+        )
+    now = datetime.now()
+    catalog = get_catalog()
+    parts = (
+        'calendar', profile['pk'], profile['date_of_birth'], businesses, options, catalog.version,
+        feed_modified_at(profile['updated_at'], catalog),
+    )
+    return _validators(parts, payload_window('soul', now=now), now, None)
+
+
+def home_validators(request):
+    """Validators for the anonymous home page; None for users or pending messages."""
+    if request.user.is_authenticated:
+        return None
+    storage = getattr(request, '_messages', None)
+    if storage is not None and len(storage):
+        return None
+    now = datetime.now()
+    return _validators(('home',), payload_window('daily', now=now), now, [], private=False)
+
+
+def _precondition(request, validators):
+    """Return ``(etag, last_modified, 304/412 response or None)``."""
+    etag = quote_etag(validators.etag)
+    last_modified = int(validators.last_modified) if validators.last_modified is not None else None
+    return etag, last_modified, get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def _finish(response, validators, etag, last_modified):
+    response.headers.setdefault('ETag', etag)
+    if last_modified is not None:
+        response.headers.setdefault('Last-Modified', http_date(last_modified))
+    if validators.private:
+        patch_cache_control(response, private=True, max_age=validators.max_age)
+    else:
+        patch_cache_control(response, public=True, max_age=validators.max_age)
+    return response
+
+
+def conditional_cycle_view(validators_func):
+    """Like ``django.views.decorators.http.condition`` but with one validator call and a max-age.
+
+    ``validators_func(request, *args, **kwargs)`` returns ``CycleValidators``
+    or None to serve the view unconditionally. Async views are supported; their
+    validators run in a worker thread.
+    """
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def async_inner(request, *args, **kwargs):
+                if request.method not in ('GET', 'HEAD'):
+                    return await view(request, *args, **kwargs)
+                validators = await sync_to_async(validators_func)(request, *args, **kwargs)
+                if validators is None:
+                    return await view(request, *args, **kwargs)
+                etag, last_modified, response = _precondition(request, validators)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                    if response.status_code != 200:
+                        return response
+                return _finish(response, validators, etag, last_modified)
+            return async_inner
+
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            validators = validators_func(request, *args, **kwargs)
+            if validators is None:
+                return view(request, *args, **kwargs)
+            etag, last_modified, response = _precondition(request, validators)
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            return _finish(response, validators, etag, last_modified)
+        return inner
+    return decorator
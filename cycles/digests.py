@@ -0,0 +1,216 @@
+"""Period-change digests: one email per user on a day their cycles move on.
+
+A user gets a digest on a (local) day when one of their yearly, health,
+human or reincarnation periods starts, when one of their businesses enters
+a new business period, or when the shared soul cycle does. The digest lists
+every such period with its CycleTemplate text, followed by the day's daily
+cycle timetable in the user's timezone.
+
+``iter_digests`` streams the affected users in keyset-paginated chunks of
+profiles (see ``materialize_user_cycles``): a chunk is one profile query
+that does the selection in SQL (birthday cohorts via ``birth_month_day``,
+businesses via the indexed ``cycle_anchor``) plus one query for the
+chunk's businesses, so memory depends on the chunk size, not on the number
+of profiles. ``send_digests`` renders the messages and hands them to one
+email connection in batches.
+
+The ``send_period_digests`` command runs this hourly for the timezones
+where it is ``CYCLES_DIGEST_HOUR`` (6:00 a.m., the start of the daily
+cycle), or once for every timezone. It keeps no record of what was sent: a
+second run for the same hour sends the same digests again.
+"""
+from collections import namedtuple
+from contextlib import nullcontext
+from datetime import timezone
+from functools import lru_cache
+from zoneinfo import available_timezones
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Exists, OuterRef, Q
+from django.template.loader import get_template
+from django.utils.formats import date_format
+
+from .catalog import get_catalog
+from .models import Business, UserProfile
+from .utils import (
+    CYCLE_DAY_BOUNDS,
+    DAYS_IN_CYCLE,
+    birthday_cohort,
+    daily_boundaries,
+    get_period_names,
+    get_zone,
+    iter_cycle_segments,
+)
+
+
+# Cycles computed from the date of birth; all of them change on a birthday.
+PERSONAL_CYCLES = ('yearly', 'health', 'human', 'reincarnation')
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_BATCH_SIZE = 100
+
+DigestEntry = namedtuple('DigestEntry', ['cycle_type', 'label', 'period', 'name', 'description'])
+DailyPeriod = namedtuple('DailyPeriod', ['period', 'name', 'start'])
+Recipient = namedtuple('Recipient', ['user_id', 'username', 'first_name', 'email', 'timezone'])
+Digest = namedtuple('Digest', ['recipient', 'day', 'entries', 'daily'])
+
+
+@lru_cache(maxsize=1)
+def _known_zones():
+    return frozenset(available_timezones())
+
+
+def zones_at_hour(moment, hour):
+    """Return ``{local date: zone names}`` for the zones where ``moment`` falls in local ``hour``.
+
+    Zones more than a day apart can share the hour on different dates, so
+    they are grouped by their local date. Profile timezones that are not a
+    known zone are treated as UTC (see ``get_zone``) and go with ``UTC``.
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    groups = {}
+    for name in sorted(_known_zones()):
+        local = moment.astimezone(get_zone(name))
+        if local.hour == hour:
+            groups.setdefault(local.date(), []).append(name)
+    return groups
+
+
+def _zone_condition(zones):
+    condition = Q(timezone__in=zones)
+    if 'UTC' in zones:
+        condition |= ~Q(timezone__in=_known_zones())
+    return condition
+
+
+def birthday_condition(day):
+    """Profiles whose yearly and health periods may start on ``day`` (a superset of human/reincarnation)."""
+    condition = Q()
+    for index in range(len(CYCLE_DAY_BOUNDS)):
+        cycle_start, low, high = birthday_cohort(index, day)
+        condition |= Q(birth_month_day__range=(low, high), date_of_birth__lte=cycle_start)
+    return condition
+
+
+def entering_businesses(day):
+    """Businesses that enter a new business period on ``day``."""
+    ordinal = day.toordinal()
+    anchors = [(ordinal - (start_day - 1)) % DAYS_IN_CYCLE for start_day, _ in CYCLE_DAY_BOUNDS]
+    return Business.objects.filter(cycle_anchor__in=anchors, establishment_date__lte=day)
+
+
+def period_starting(cycle_type, source_date, day):
+    """Return the number of the ``cycle_type`` period that starts on ``day``, or None."""
+    for segment in iter_cycle_segments(cycle_type, source_date, day, day):
+        return segment.period if segment.start == day else None
+    return None
+
+
+def _entry(catalog, cycle_type, period, label=''):
+    return DigestEntry(
+        cycle_type, label, period, get_period_names(cycle_type)[period - 1], catalog.description(cycle_type, period),
+    )
+
+
+def _daily_periods(tz_name, day):
+    """The daily periods of ``day`` with their local start times (``HH:MM``) in ``tz_name``."""
+    zone = get_zone(tz_name)
+    names = get_period_names('daily')
+    return tuple(
+        DailyPeriod(number, name, start.astimezone(zone).strftime('%H:%M'))
+        for number, (name, start) in enumerate(zip(names, daily_boundaries(tz_name, day)), 1)
+    )
+
+
+def iter_digests(day, zones=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield a ``Digest`` for every user with an email address who has a period starting on ``day``.
+
+    With ``zones`` only profiles in those timezones are considered. Profiles
+    are read in chunks of ``chunk_size`` in primary key order, as plain rows:
+    model instances of a user and its profile reference each other and would
+    pile up until the garbage collector's next full pass.
+    """
+    catalog = get_catalog()
+    soul_period = period_starting('soul', None, day)
+    soul_entries = [_entry(catalog, 'soul', soul_period)] if soul_period else []
+    businesses = entering_businesses(day)
+
+    profiles = UserProfile.objects.exclude(user__email='')
+    if zones is not None:
+        profiles = profiles.filter(_zone_condition(zones))
+    if not soul_entries:
+        profiles = profiles.filter(birthday_condition(day) | Q(Exists(businesses.filter(user=OuterRef('user_id')))))
+    profiles = profiles.order_by('pk').values_list(
+        'pk', 'date_of_birth', 'user_id', 'user__username', 'user__first_name', 'user__email', 'timezone',
+    )
+
+    # one timetable per timezone, shared by every digest in it
+    timetables = {}
+    last_pk = 0
+    while True:
+        chunk = list(profiles.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        last_pk = chunk[-1][0]
+        owned = {}
+        for user_id, name, establishment_date in businesses.filter(
+            user_id__in=[row[2] for row in chunk],
+        ).order_by('user_id', 'name', 'pk').values_list('user_id', 'name', 'establishment_date'):
+            owned.setdefault(user_id, []).append((name, establishment_date))
+
+        for _, date_of_birth, *user in chunk:
+            recipient = Recipient(*user)
+            entries = list(soul_entries)
+            if date_of_birth and date_of_birth <= day:
+                for cycle_type in PERSONAL_CYCLES:
+                    period = period_starting(cycle_type, date_of_birth, day)
+                    if period:
+                        entries.append(_entry(catalog, cycle_type, period))
+            for name, establishment_date in owned.get(recipient.user_id, ()):
+                period = period_starting('business', establishment_date, day)
+                if period:
+                    entries.append(_entry(catalog, 'business', period, label=name))
+            if entries:
+                daily = timetables.get(recipient.timezone)
+                if daily is None:
+                    daily = timetables[recipient.timezone] = _daily_periods(recipient.timezone, day)
+                yield Digest(recipient, day, entries, daily)
+
+
+def send_digests(digests, batch_size=DEFAULT_BATCH_SIZE, connection=None, dry_run=False):
+    """Render ``digests`` and send them over one email connection, ``batch_size`` messages at a time.
+
+    Returns the number of digests. With ``dry_run`` the messages are
+    rendered but not sent and no connection is opened.
+    """
+    subject_template = get_template('cycles/email/period_digest_subject.txt')
+    body_template = get_template('cycles/email/period_digest.txt')
+    if not dry_run:
+        connection = connection or get_connection()
+    count = 0
+    batch = []
+    # ``(long, short)`` labels of each day, formatted once rather than per message
+    day_labels = {}
+
+    def flush():
+        if batch and not dry_run:
+            connection.send_messages(batch)
+        batch.clear()
+
+    with nullcontext() if dry_run else connection:
+        for digest in digests:
+            labels = day_labels.get(digest.day)
+            if labels is None:
+                labels = day_labels[digest.day] = (date_format(digest.day, 'l, F j, Y'), date_format(digest.day, 'F j'))
+            context = {
+                'recipient': digest.recipient, 'entries': digest.entries, 'daily': digest.daily,
+                'day': labels[0], 'short_day': labels[1],
+            }
+            subject = ' '.join(subject_template.render(context).split())
+            batch.append(EmailMessage(subject, body_template.render(context), settings.DEFAULT_FROM_EMAIL, [digest.recipient.email]))
+            count += 1
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    return count
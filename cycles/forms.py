@@ -1,6 +1,7 @@
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from django import forms
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from .models import UserProfile, Business
 
 class UserProfileForm(forms.ModelForm):
@@ -14,6 +15,14 @@ class UserProfileForm(forms.ModelForm):
             'other_dates': forms.Textarea(attrs={'class': 'shadow appearance-none border rounded w-full py-2 px-3 text-gray-700 leading-tight focus:outline-none focus:shadow-outline bg-gray-700 border-purple-700 text-white', 'rows': 2}),
         }
 
+    def clean_timezone(self):
+        tz_name = self.cleaned_data.get('timezone') or 'UTC'
+        try:
+            ZoneInfo(tz_name)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise forms.ValidationError('Enter a valid IANA timezone name, e.g. Europe/London.')
+        return tz_name
+
 # User registration form
 class UserRegisterForm(UserCreationForm):
     email = forms.EmailField(required=True, widget=forms.EmailInput(attrs={'class': 'shadow appearance-none border rounded w-full py-2 px-3 text-gray-700 leading-tight focus:outline-none focus:shadow-outline bg-gray-700 border-purple-700 text-white'}))
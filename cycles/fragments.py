@@ -0,0 +1,128 @@
+"""Per-section fragment caching for the dashboard.
+
+Each dashboard section is cached under a key built from what it displays:
+the section's current period (and its dates), the profile date it depends on
+and the template catalog version. A section is therefore only re-rendered
+when its own period changes; its entry expires at the section's next
+boundary. Forms and CSRF tokens are kept outside the cached fragments.
+"""
+import hashlib
+import threading
+from collections import Counter, namedtuple
+from datetime import date, datetime, timedelta, timezone
+
+from .caching import seconds_until
+from .utils import get_next_transition
+
+
+FRAGMENT_KEY_PREFIX = 'cycles:fragment:v1'
+
+FragmentVersion = namedtuple('FragmentVersion', ['key', 'timeout'])
+
+_stats_lock = threading.Lock()
+_hits = Counter()
+_misses = Counter()
+
+
+def record(section, hit, request=None):
+    """Count a fragment lookup, process-wide and on ``request`` when given."""
+    with _stats_lock:
+        (_hits if hit else _misses)[section] += 1
+    if request is not None:
+        per_request = getattr(request, '_fragment_cache', None)
+        if per_request is None:
+            per_request = request._fragment_cache = Counter()
+        per_request['hits' if hit else 'misses'] += 1
+
+
+def _hit_rate(hits, misses):
+    return hits / (hits + misses) if hits + misses else None
+
+
+def fragment_cache_stats():
+    """Return this process's fragment hits, misses and hit rate, overall and per section."""
+    with _stats_lock:
+        sections = sorted(set(_hits) | set(_misses))
+        hits, misses = sum(_hits.values()), sum(_misses.values())
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': _hit_rate(hits, misses),
+            'by_section': {
+                s: {'hits': _hits[s], 'misses': _misses[s], 'hit_rate': _hit_rate(_hits[s], _misses[s])}
+                for s in sections
+            },
+        }
+
+
+def reset_fragment_stats():
+    with _stats_lock:
+        _hits.clear()
+        _misses.clear()
+
+
+def request_fragment_header(request):
+    """Return the ``X-Fragment-Cache`` value for a rendered request, or None."""
+    per_request = getattr(request, '_fragment_cache', None)
+    if not per_request:
+        return None
+    return f"hits={per_request['hits']} misses={per_request['misses']}"
+
+
+def _key(section, parts):
+    digest = hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+    return f'{FRAGMENT_KEY_PREFIX}:{section}:{digest}'
+
+
+def _index(periods, current):
+    return periods.index(current) if current in periods else None
+
+
+def _until_period_end(current, now):
+    """Seconds until the day after ``current['end_date']`` (the next period), or until tomorrow."""
+    end_date = current.get('end_date') if current else None
+    if isinstance(end_date, date):
+        return seconds_until(end_date + timedelta(days=1), now)
+    return seconds_until(now.date() + timedelta(days=1), now)
+
+
+def dashboard_fragments(context, catalog_version, now=None):
+    """Return ``{section: FragmentVersion}`` for the dashboard ``context``."""
+    now = now or datetime.now()
+    profile = context['user_profile']
+    birth_date = profile.date_of_birth
+    tomorrow = seconds_until(now.date() + timedelta(days=1), now)
+    fragments = {}
+
+    daily_index = _index(context['daily_periods'], context['current_daily_period'])
+    # the cards only differ by which one is current, so every user shares them
+    utc_now = datetime.now(timezone.utc)
+    transition = get_next_transition('daily', now=utc_now, tz=profile.timezone)
+    fragments['daily'] = FragmentVersion(_key('daily', (daily_index,)), seconds_until(transition, utc_now))
+
+    for section in ('yearly', 'health', 'soul'):
+        periods, current = context[f'{section}_periods'], context[f'current_{section}_period']
+        starts = tuple(p['start_date'] for p in periods)
+        parts = (birth_date if section != 'soul' else None, starts, _index(periods, current), catalog_version)
+        fragments[section] = FragmentVersion(_key(section, parts), _until_period_end(current, now))
+
+    periods, current = context['reincarnation_periods'], context['current_reincarnation_period']
+    fragments['reincarnation'] = FragmentVersion(
+        _key('reincarnation', (birth_date, _index(periods, current), catalog_version)),
+        _until_period_end(current, now),
+    )
+
+    periods, current = context['human_periods'], context['current_human_period']
+    fragments['human'] = FragmentVersion(
+        _key('human', (birth_date, _index(periods, current), context['human_progress'])),
+        _until_period_end(current, now),
+    )
+
+    # business cards show a progress bar, which moves daily
+    business_parts = tuple(
+        (c['business']['id'], c['business']['name'], _index(c['periods'], c['current_period']),
+         (c['current_period'] or {}).get('start_date'), c['progress'])
+        for c in context['business_cycles']
+    )
+    fragments['business'] = FragmentVersion(_key('business', (business_parts, catalog_version)), tomorrow)
+    return fragments
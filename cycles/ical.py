@@ -0,0 +1,169 @@
+"""Subscribable iCalendar feed of upcoming period transitions.
+
+Each transition becomes an all-day event on the day the new period starts.
+The feed is generated as a stream: events are produced one cycle at a time
+and businesses are read with an iterator, so nothing is built up in memory.
+Every value in the feed is derived from the stored data and the request
+day, so the same inputs on the same day give byte-identical output (see
+``calendar_validators``). ``DTSTAMP`` is when that data last changed: the
+newer of the profile's and the templates' ``updated_at`` (``feed_modified_at``).
+"""
+import secrets
+from datetime import datetime, timedelta, timezone
+
+from .utils import get_period_names, iter_cycle_segments
+
+
+# The daily cycle changes seven times a day, which is noise in a calendar.
+FEED_CYCLE_TYPES = ('yearly', 'health', 'soul', 'human', 'reincarnation', 'business')
+DEFAULT_HORIZON_DAYS = 365
+MAX_HORIZON_DAYS = 3650
+
+_CYCLE_LABELS = {
+    'yearly': 'Yearly cycle',
+    'health': 'Health cycle',
+    'soul': 'Soul cycle',
+    'human': 'Human life cycle',
+    'reincarnation': 'Reincarnation cycle',
+    'business': 'Business cycle',
+}
+
+
+def ensure_calendar_token(profile):
+    """Return the profile's feed token, issuing one on first use."""
+    if not profile.calendar_token:
+        profile.calendar_token = secrets.token_urlsafe(24)
+        profile.save(update_fields=['calendar_token'])
+    return profile.calendar_token
+
+
+def reset_calendar_token(profile):
+    """Issue a new feed token, revoking the old feed URL."""
+    profile.calendar_token = secrets.token_urlsafe(24)
+    profile.save(update_fields=['calendar_token'])
+    return profile.calendar_token
+
+
+def parse_feed_options(params):
+    """Return ``(horizon_days, cycle_types)`` from query params, or None when they are invalid."""
+    days = params.get('days')
+    if days is None:
+        horizon = DEFAULT_HORIZON_DAYS
+    elif days.isdigit() and 1 <= int(days) <= MAX_HORIZON_DAYS:
+        horizon = int(days)
+    else:
+        return None
+    raw_types = params.get('types')
+    if raw_types:
+        cycle_types = tuple(dict.fromkeys(t.strip() for t in raw_types.split(',') if t.strip()))
+        if not cycle_types or any(t not in FEED_CYCLE_TYPES for t in cycle_types):
+            return None
+    else:
+        cycle_types = FEED_CYCLE_TYPES
+    return horizon, cycle_types
+
+
+def iter_transitions(cycle_type, source_date, start, end):
+    """Yield ``(day, period_number, period_name)`` for each period starting after ``start`` up to ``end``."""
+    names = get_period_names(cycle_type)
+    for segment in iter_cycle_segments(cycle_type, source_date, start, end):
+        if segment.start > start:
+            yield segment.start, segment.period, names[segment.period - 1]
+
+
+def feed_modified_at(profile_updated_at, catalog):
+    """Return when the feed's profile or templates last changed, as a UTC datetime, or None."""
+    candidates = [profile_updated_at.timestamp()] if profile_updated_at else []
+    if catalog.modified_at is not None:
+        candidates.append(catalog.modified_at)
+    return datetime.fromtimestamp(int(max(candidates)), timezone.utc) if candidates else None
+
+
+def _escape(text):
+    return (
+        str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """Fold a content line at 75 octets as RFC 5545 requires."""
+    if len(line.encode('utf-8')) <= 75:
+        return line + '\r\n'
+    parts = []
+    current = ''
+    limit = 75
+    for char in line:
+        if len((current + char).encode('utf-8')) > limit:
+            parts.append(current)
+            current = ''
+            limit = 74  # continuation lines start with a space
+        current += char
+    parts.append(current)
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _event(uid, day, stamp, summary, description):
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{uid}',
+        f'DTSTAMP:{stamp}',
+        f'DTSTART;VALUE=DATE:{day:%Y%m%d}',
+        f'DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}',
+        f'SUMMARY:{_escape(summary)}',
+    ]
+    if description:
+        lines.append(f'DESCRIPTION:{_escape(description)}')
+    lines += ['TRANSP:TRANSPARENT', 'END:VEVENT']
+    return ''.join(_fold(line) for line in lines)
+
+
+def stream_feed(profile, businesses, today, horizon_days, cycle_types, catalog):
+    """Yield the feed for ``profile`` piece by piece.
+
+    ``businesses`` is iterated once, only when ``business`` is requested, so a
+    lazy queryset iterator keeps memory flat.
+    """
+    end = today + timedelta(days=horizon_days)
+    modified_at = feed_modified_at(profile.updated_at, catalog)
+    if modified_at is None:
+        modified_at = datetime.combine(today, datetime.min.time(), timezone.utc)
+    stamp = modified_at.strftime('%Y%m%dT%H%M%SZ')
+    yield ''.join(_fold(line) for line in [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Cycles//Period transitions//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{_escape("Cycles - " + profile.user.username)}',
+        'REFRESH-INTERVAL;VALUE=DURATION:PT1H',
+        'X-PUBLISHED-TTL:PT1H',
+    ])
+
+    for cycle_type in cycle_types:
+        if cycle_type == 'business':
+            continue
+        source_date = profile.date_of_birth
+        if cycle_type != 'soul' and not source_date:
+            continue
+        for day, number, name in iter_transitions(cycle_type, source_date, today, end):
+            yield _event(
+                f'{cycle_type}-{profile.pk}-{day:%Y%m%d}@cycles',
+                day,
+                stamp,
+                f'{_CYCLE_LABELS[cycle_type]}: {name}',
+                catalog.description(cycle_type, number),
+            )
+
+    if 'business' in cycle_types:
+        for business in businesses:
+            for day, number, name in iter_transitions('business', business.establishment_date, today, end):
+                yield _event(
+                    f'business-{business.pk}-{day:%Y%m%d}@cycles',
+                    day,
+                    stamp,
+                    f'{business.name} - {_CYCLE_LABELS["business"]}: {name}',
+                    catalog.description('business', number),
+                )
+
+    yield 'END:VCALENDAR\r\n'
@@ -0,0 +1,82 @@
+import json
+import platform
+from datetime import datetime
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from cycles import bench
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the cycle engine, the dashboard and the cycle API, print the results as JSON '
+        'and optionally fail on regressions against a saved baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--businesses', default='0,10,1000', help='Comma-separated business counts to benchmark the views with.')
+        parser.add_argument('--requests', type=int, default=50, help='Timed requests per view and business count.')
+        parser.add_argument('--min-time', type=float, default=0.2, help='Seconds spent timing each get_* function.')
+        parser.add_argument('--skip-functions', action='store_true', help='Only benchmark the views and templates.')
+        parser.add_argument('--skip-views', action='store_true', help='Only benchmark the get_* functions.')
+        parser.add_argument('--output', default=None, help='Write the JSON results to this file instead of stdout.')
+        parser.add_argument('--baseline', default=None, help='JSON results of an earlier run to compare against.')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Relative slowdown that counts as a regression (0.2 = 20%%). Query counts regress on any increase.')
+
+    def handle(self, *args, **options):
+        try:
+            business_counts = [int(n) for n in options['businesses'].split(',') if n.strip()]
+        except ValueError:
+            raise CommandError('--businesses must be a comma-separated list of integers')
+        if any(n < 0 for n in business_counts) or options['requests'] < 1 or options['threshold'] < 0:
+            raise CommandError('--businesses, --requests and --threshold must not be negative')
+        baseline = self._load_baseline(options['baseline']) if options['baseline'] else None
+
+        metrics = {}
+        if not options['skip_functions']:
+            metrics.update(bench.bench_functions(options['min_time']))
+        if not options['skip_views'] and business_counts:
+            # the benchmark user and its businesses are never committed
+            with transaction.atomic():
+                metrics.update(bench.bench_requests(business_counts, options['requests']))
+                transaction.set_rollback(True)
+
+        result = {
+            'meta': {
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'businesses': business_counts,
+                'requests': options['requests'],
+            },
+            'metrics': metrics,
+        }
+        output = json.dumps(result, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(output + '\n')
+            self.stderr.write(f'Wrote {len(metrics)} metrics to {options["output"]}')
+        else:
+            self.stdout.write(output)
+
+        if baseline is None:
+            return
+        regressions, improvements = bench.compare(metrics, baseline, options['threshold'])
+        for name, old, new in improvements:
+            self.stderr.write(self.style.SUCCESS(f'improved  {name}: {old} -> {new}'))
+        for name, old, new in regressions:
+            self.stderr.write(self.style.ERROR(f'regressed {name}: {old} -> {new}'))
+        if regressions:
+            raise CommandError(f'{len(regressions)} metric(s) regressed beyond the {options["threshold"]:.0%} threshold')
+        self.stderr.write(self.style.SUCCESS('No regressions against the baseline'))
+
+    def _load_baseline(self, path):
+        try:
+            with open(path) as fh:
+                data = json.load(fh)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Cannot read baseline {path}: {exc}')
+        return data.get('metrics', data)
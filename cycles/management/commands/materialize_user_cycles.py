@@ -0,0 +1,78 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cycles.models import UserProfile, UserCycle
+from cycles.snapshots import build_snapshot_rows
+from cycles.utils import _ensure_date, _ensure_today
+
+
+class Command(BaseCommand):
+    help = 'Materialize UserCycle snapshots, rewriting only rows whose period changed since the last run.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Profiles per work unit.')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes; 1 computes in-process.')
+        parser.add_argument('--as-of', default=None, help='Compute snapshots for this date (YYYY-MM-DD) instead of today.')
+
+    def handle(self, *args, **options):
+        as_of = _ensure_date(options['as_of']) if options['as_of'] else _ensure_today(None)
+        chunk_size = max(1, options['chunk_size'])
+        workers = max(1, options['workers'])
+
+        written = 0
+        profiles = 0
+        if workers == 1:
+            for chunk, existing in self._chunks(chunk_size):
+                profiles += len(chunk)
+                written += self._write(build_snapshot_rows(chunk, existing, as_of))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = []
+                for chunk, existing in self._chunks(chunk_size):
+                    profiles += len(chunk)
+                    pending.append(pool.submit(build_snapshot_rows, chunk, existing, as_of))
+                    # keep a bounded number of chunks in flight so memory stays flat
+                    if len(pending) >= workers * 2:
+                        written += self._write(pending.pop(0).result())
+                for future in pending:
+                    written += self._write(future.result())
+
+        removed, _ = UserCycle.objects.filter(user_profile__date_of_birth__isnull=True).delete()
+        self.stdout.write(self.style.SUCCESS(
+            f'Materialized cycles for {profiles} profiles as of {as_of}: {written} rows written, {removed} removed'
+        ))
+
+    def _chunks(self, chunk_size):
+        """Yield ``(profiles, existing)`` per keyset-paginated chunk of profiles with a birth date."""
+        last_pk = 0
+        while True:
+            chunk = list(
+                UserProfile.objects.filter(pk__gt=last_pk, date_of_birth__isnull=False)
+                .order_by('pk')
+                .values_list('pk', 'date_of_birth')[:chunk_size]
+            )
+            if not chunk:
+                return
+            last_pk = chunk[-1][0]
+            existing = {
+                (profile_id, cycle_type): (current_period, source_date, valid_until)
+                for profile_id, cycle_type, current_period, source_date, valid_until in UserCycle.objects.filter(
+                    user_profile_id__in=[pk for pk, _ in chunk]
+                ).values_list('user_profile_id', 'cycle_type', 'current_period', 'source_date', 'valid_until')
+            }
+            yield chunk, existing
+
+    def _write(self, rows):
+        if not rows:
+            return 0
+        with transaction.atomic():
+            UserCycle.objects.bulk_create(
+                [UserCycle(**row) for row in rows],
+                update_conflicts=True,
+                unique_fields=['user_profile', 'cycle_type'],
+                update_fields=['start_date', 'current_period', 'report_data', 'source_date', 'valid_until', 'updated_at'],
+            )
+        return len(rows)
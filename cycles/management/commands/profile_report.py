@@ -0,0 +1,53 @@
+import io
+import json
+import pstats
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cycles.profiling import collected_profiles, profile_dir
+
+
+SORT_KEYS = {'cumulative': pstats.SortKey.CUMULATIVE, 'tottime': pstats.SortKey.TIME, 'calls': pstats.SortKey.CALLS}
+
+
+class Command(BaseCommand):
+    help = 'Aggregate the sampled request profiles and list the slowest functions and largest allocation sites.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', default=None, help='Profile directory (default: CYCLES_PROFILE_DIR).')
+        parser.add_argument('--view', default=None, help='Only aggregate profiles of this view, e.g. dashboard.')
+        parser.add_argument('--sort', choices=sorted(SORT_KEYS), default='cumulative', help='Order of the function list.')
+        parser.add_argument('--limit', type=int, default=25, help='Functions and allocation sites to list.')
+
+    def handle(self, *args, **options):
+        directory = options['dir'] or profile_dir()
+        profiles = collected_profiles(directory, options['view'])
+        if not profiles:
+            raise CommandError(f'No profiles found in {directory}')
+        limit = max(1, options['limit'])
+
+        stream = io.StringIO()
+        stats = pstats.Stats(*[str(p) for p in profiles], stream=stream)
+        stats.strip_dirs().sort_stats(SORT_KEYS[options['sort']]).print_stats(limit)
+        self.stdout.write(f'{len(profiles)} profiles from {directory}')
+        self.stdout.write(stream.getvalue())
+
+        sites = defaultdict(lambda: [0, 0])
+        traced = 0
+        for profile in profiles:
+            memory_file = profile.with_suffix('.mem.json')
+            if not memory_file.exists():
+                continue
+            with open(memory_file) as fh:
+                memory = json.load(fh)
+            traced += 1
+            for site in memory['sites']:
+                sites[site['site']][0] += site['size']
+                sites[site['site']][1] += site['count']
+        if not traced:
+            return
+        self.stdout.write(f'Largest allocation sites, averaged over {traced} traced requests:')
+        ranked = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        for site, (size, count) in ranked:
+            self.stdout.write(f'{size / traced / 1024:10.1f} KiB {count / traced:10.1f} blocks  {site}')
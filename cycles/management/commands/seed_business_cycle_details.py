@@ -1,46 +1,9 @@
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
-from cycles.models import CycleTemplate
+
 
 class Command(BaseCommand):
-    help = 'Seeds the database with detailed descriptions for the Business Cycle.'
+    help = 'Seeds the database with detailed descriptions for the Business Cycle (alias of seed_templates --types business).'
 
     def handle(self, *args, **options):
-        business_cycle_periods = [
-            {
-                "period_number": 1,
-                "description": "During the first 52 days of the yearly cycle of each business, beginning with its birthday and covering the 52 days following, each business will find greater success in all forms of promotion that solicit or depend for their success upon the good will and the preferment of the public. It is not as excellent a period for the actual building up of sales and return of money as it is a period for securing approval, favor, recognition, and general good will. This would be the period to solicit endorsements or high recognition by eminent persons and concerns that would either result eventually in sales through such persons, or in giving widespread publicity and advertising to the concern. It is also an excellent period in which to advertise a business widely, not so much for direct sales as to build up prestige and public recognition. It is a good period for the sending forth of emissaries, representatives, or high members of the firm to meet other eminent persons in the business world and, therefore, secure recognition and high favor. For this reason it is an excellent period to deal with government officials, judges of the court, or senators, or congressmen from whom you desire preferment, special favors, or the passage of protective bills or regulations. This makes the period also good for the securing of political influence, political cooperation, and recognition. The thought of the concern during this period should be not of money, but of name, reputation, and prestige."
-            },
-            {
-                "period_number": 2,
-                "description": "During this period any firm or business of any nature will find that it is a good time to make important changes of a temporary nature in regard to important employees, modifications in business practice, temporary locations, and for trying out short-time plans and propositions. On the other hand, it is a very unfavorable period during which to make any new agreements, any new plans of a definite nature, or to enter into any contracts or agreements of any kind unless they are reduced to writing, and properly sealed and signed so as to give them a long-time standing. Verbal agreements and arrangements entered into at this time are apt to be cast aside quickly and changed very rapidly or suddenly, and amount to nothing. It is also a good period for the building up of business friendships, and every business firm would do well to take advantage of this period to contact new and prospective customers in a friendly way, for business friendships of a very helpful nature have generally been built up during this period."
-            },
-            {
-                "period_number": 3,
-                "description": "Here we have a period of construction and great energizing power. It is during this period that any business proposition should be pushed to its utmost. Every facility and every means of manufacturing, selling, producing, advertising, promoting, and extending the business should be adopted and utilized to the utmost during this period. It is also a good period for the arrangement of plans for collections, or to send out collectors or letters intended to collect money, but it is not a good period for attempting to fight any issues in court that have to do with the activities of business enemies, business rivals, or business competition. Other legal matters, however, may be pushed at this period, and will generally receive more favorable reaction than at any other period, especially if the matter is one that calls for the expenditure of a great deal of energy and of considerable fighting for the protection of certain issues or rights. On the other hand, every firm and business should watch out for dangerous accidents, disasters, and troubles through enemies, through fires, or through sudden explosions of wrath, enmity, or hatred during this period. Manufacturing plants and other propositions should be careful of fires or explosions from fires, gases, and stored-up energies of any kind during this period. It is during this period also that personal enemies of the business will attempt to wreck it or even to injure the character or life of a person connected with a business, if the business has attained any degree of enmity on the part of competitors or others. It is a very good period for dealing with army and navy matters, the military departments of the government, engineering, munitions, machinery, or firms or individuals associated with these."
-            },
-            {
-                "period_number": 4,
-                "description": "This is the period in which any firm or business would do well to enter into its largest campaign of widespread advertising, whether this be nationwide advertising or the mere solicitation by letter of customers in a limited area. Whatever writing, planning, and scheming of promotion a business firm or individual may want to do in any year of its business, it will be found to be most successful during this period of the business cycle of each year. On the other hand, it is also an excellent period for the drawing up of new contracts, new agreements, papers of incorporation, documents, transfers, and so forth. It is an excellent period to deal with newspapermen, diplomats, arbitrators, or others who can use their mentalities or printed or written words to further the interests of the concern. On the other hand, firms must be careful during this period to watch out for deception by word of mouth or writing, for forgeries, and for tricky agreements or plans cleverly presented and which are apt to have a serious reaction in many ways."
-            },
-            {
-                "period_number": 5,
-                "description": "Here is a period of growth and financial success for any concern or business proposition. This is the period in which to seek investment, or seek to secure credit and extend the time in which payments must be made or negotiations closed. It is one of the best periods in the business year for selling, and the actual distribution of material on a sales basis, if immediate results and a quick and fair return of money are desired. It is an excellent period in which to collect bad or old debts, and it is an excellent time in which to bring matters into court where the favorable decision desired hangs by a slender thread. For all things being quick and right, this period is favorable to a constructive and just decision. It is an excellent period also for the promotion of the business into foreign lands or distant places or with large concerns that deal in international matters or have international distribution and sales agreements. It seems to be an especially good period for business firms to promote their affairs with railroad, railway, and electric companies, and with all companies and concerns that deal in things that cater to the pleasures and happiness of the public."
-            },
-            {
-                "period_number": 6,
-                "description": "This is the period in each year when every business should relax its activities if it finds it necessary to relax at all, and should plan its periods for the vacation or absence of any of its important directors or operators. It is also an excellent period for the promotion of certain branches of business such as those that deal with the art world, or with music, poetry, sculpting, artists' materials, women's clothing, or articles of adornment, beauty preparations, high-grade shoes, hosiery, evening wraps, hats, luxurious automobiles, oriental rugs, antique furniture, fine books, expensive musical instruments, concerts, operas, and other things representing the luxuries, refinements, and clean and wholesome pleasures of life. Therefore, it is well to push the sale of things of this nature during this period, or to promote good will or interest among persons who are associated with such lines of business. This is an excellent period for the heads of a concern or the individual owner of any kind of business to make the acquaintance of his customers, and to make such intimate contacts with persons as may be helpful to the business or the individuals of the business in the near future. It is also a good period for the collection of money, the buying of stocks and bonds, or the promotion of the finances of the company through investment in conservative stocks of other concerns. Therefore, it would be an excellent period for the bringing about of partnerships, monopolistic corporations, and the formation of subsidiary associations and alliances of a similar nature."
-            },
-            {
-                "period_number": 7,
-                "description": "Here we have the reconstruction period for all business propositions, and during these last 52 days before the birthday of the concern or business, great care must be taken not to start any new line of activity or to go too heavily into advertising that is intended to build up a new department or a new phase of the business, or to do otherwise than cooperate with the cosmic tendencies to reconstruct. Since it is the period during which changes of a tearing down nature must be expected, it is a wrong period in which to plan to do reconstruction without the preliminary stage of tearing down. In other words, during this period no expansion must be expected unless it is associated in some way with a breaking down or tearing down process as a part of the reconstruction. Since some form of breaking down and change is very apt to take place during these 52 days, every business concern or individual should see that any contemplated changes or tearing down processes that have been in mind are brought to issue during this time, and therefore permitted to expend themselves or manifest themselves while such a period is favorable. Certainly no new alliances, affiliations, partnerships, or agreements, contracts, or offers of agreement or contract should be made during this period. It is an excellent time to consult with persons in retirement, or who have been in business and have retired, or with judges, referees, or advisers of any kind. All acts must be guarded with a conservative attitude, and extreme caution and providence manifested in every line of activity. Great diplomacy must be shown in every act, and every business should take advantage of this period to conserve its activities, hold steady to its line of progress, and not allow anything of a radical nature in either advertising, selling, buying, or planning to occur."
-            }
-        ]
-
-        for period_data in business_cycle_periods:
-            CycleTemplate.objects.update_or_create(
-                cycle_type='business',
-                period_number=period_data['period_number'],
-                defaults={'description': period_data['description']}
-            )
-
-        self.stdout.write(self.style.SUCCESS('Successfully seeded detailed descriptions for the Business Cycle.'))
+        call_command('seed_templates', types='business', stdout=self.stdout, stderr=self.stderr)
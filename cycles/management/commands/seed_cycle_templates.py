@@ -1,248 +1,9 @@
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
-from cycles.models import CycleTemplate
+
 
 class Command(BaseCommand):
-    help = 'Seed CycleTemplate entries with basic descriptions'
+    help = 'Seed CycleTemplate entries for every cycle type (alias of seed_templates).'
 
     def handle(self, *args, **options):
-        # Structured placeholder templates (non-copyright summaries)
-        templates = [
-            # Human life cycles: 7-year-ish periods (common system uses 12 periods as example)
-            # Paraphrased human period descriptions (book-aligned, reworded for brevity)
-            ('human', 1, 'Inception & Foundations', {
-                'summary': 'A phase of dependence where basic patterns, trust and attachment form.',
-                'advice': 'Provide steady care, consistent routines and nurturing environments.',
-                'start_age': 0, 'end_age': 6,
-                'effects': ['Rapid physical and sensory development', 'Primary bonding and trust formation']
-            }),
-            ('human', 2, 'Exploration & Skill Building', {
-                'summary': 'Curiosity and early learning expand physical and social abilities.',
-                'advice': 'Encourage play-based learning, language, and social skills.',
-                'start_age': 7, 'end_age': 13,
-                'effects': ['Language and motor skill growth', 'Social interaction patterns emerge']
-            }),
-            ('human', 3, 'Identity & Apprenticeship', {
-                'summary': 'Forming personal identity and beginning serious learning or training.',
-                'advice': 'Support mentorship, education and responsible risk-taking.',
-                'start_age': 14, 'end_age': 20,
-                'effects': ['Self-definition', 'Educational focus and skill acquisition']
-            }),
-            ('human', 4, 'Initiation & Independence', {
-                'summary': 'Establishing independence, early career moves and intimate bonds.',
-                'advice': 'Prioritise skill application, relationship-building and steady routines.',
-                'start_age': 21, 'end_age': 27,
-                'effects': ['Career starts', 'Forming long-term partnerships']
-            }),
-            ('human', 5, 'Consolidation & Responsibility', {
-                'summary': 'Growth into stable roles, responsibility and longer-term planning.',
-                'advice': 'Balance commitments, save, and build reliable systems.',
-                'start_age': 28, 'end_age': 34,
-                'effects': ['Financial and familial responsibilities', 'Career development']
-            }),
-            ('human', 6, 'Reassessment & Reorientation', {
-                'summary': 'A turning point for reassessment, possible change and renewed learning.',
-                'advice': 'Reflect on priorities, invest in health and broaden skills.',
-                'start_age': 35, 'end_age': 41,
-                'effects': ['Career transitions', 'Shifting life priorities']
-            }),
-            ('human', 7, 'Authority & Mentorship', {
-                'summary': 'Leadership, mastery and passing on knowledge to others.',
-                'advice': 'Share expertise, mentor younger people and solidify legacy work.',
-                'start_age': 42, 'end_age': 48,
-                'effects': ['Leadership roles', 'Mentoring responsibilities']
-            }),
-            ('human', 8, 'Perspective & Stewardship', {
-                'summary': 'Broader perspective on life priorities and preparing transitions.',
-                'advice': 'Plan succession, balance legacy goals with personal wellbeing.',
-                'start_age': 49, 'end_age': 55,
-                'effects': ['Strategic thinking', 'Succession planning']
-            }),
-            ('human', 9, 'Harvest & Sharing', {
-                'summary': 'Reaping rewards of earlier efforts and increased community focus.',
-                'advice': 'Share knowledge, invest in community ties and mentorship.',
-                'start_age': 56, 'end_age': 62,
-                'effects': ['Community engagement', 'Mentorship and wisdom-sharing']
-            }),
-            ('human', 10, 'Reflection & Wellbeing', {
-                'summary': 'Slower pace, emphasis on wellbeing and reflection on accomplishments.',
-                'advice': 'Prioritise health, close meaningful projects and enjoy family time.',
-                'start_age': 63, 'end_age': 69,
-                'effects': ['Reflection', 'Health-focused routines']
-            }),
-            ('human', 11, 'Inward Work & Legacy', {
-                'summary': 'Turning inward to reconcile life lessons and preserve memories.',
-                'advice': 'Document wisdom, nurture relationships and settle practical matters.',
-                'start_age': 70, 'end_age': 76,
-                'effects': ['Spiritual integration', 'Archivist and legacy activities']
-            }),
-            ('human', 12, 'Completion & Handover', {
-                'summary': 'A time of completion, handing over roles and final priorities.',
-                'advice': 'Ensure affairs are in order and support carers and successors.',
-                'start_age': 77, 'end_age': 99,
-                'effects': ['Finalisation', 'Generational handover']
-            }),
-
-            # Yearly cycle paraphrases
-            ('yearly', 1, 'Initiation (Year)', {
-                'summary': 'A phase for new goals and setting direction for the year.',
-                'advice': 'Set priorities and outline achievable milestones.'
-            }),
-            ('yearly', 2, 'Execution (Year)', {
-                'summary': 'Period focused on carrying out plans and refining efforts.',
-                'advice': 'Monitor progress and adjust tactics as needed.'
-            }),
-
-            # Daily cycle paraphrases
-            ('daily', 1, 'Morning', {
-                'summary': 'Highest clarity and planning potential; start important tasks here.',
-                'advice': 'Schedule mental work and planning sessions.',
-                'effects': ['High focus', 'Good planning capacity']
-            }),
-            ('daily', 2, 'Afternoon', {
-                'summary': 'Sustained energy for execution and collaboration.',
-                'advice': 'Use for meetings, implementation and steady effort.',
-                'effects': ['Task completion', 'Collaborative work']
-            }),
-            ('daily', 3, 'Evening', {
-                'summary': 'Winding down; review and creative reflection.',
-                'advice': 'Review progress and handle low-effort creative tasks.',
-                'effects': ['Reflection', 'Creative exploration']
-            }),
-
-            # Business cycle paraphrases (7-part business year mapping)
-            ('business', 1, 'Launch Phase', {
-                'summary': 'Initiate offerings, test the market and gain early traction.',
-                'advice': 'Focus on MVP, customer feedback, and quick iterations.',
-                'effects': ['Product testing', 'Early customer discovery']
-            }),
-            ('business', 2, 'Stabilization', {
-                'summary': 'Strengthen operations and customer relationships.',
-                'advice': 'Improve processes and prioritize customer retention.',
-                'effects': ['Process improvement', 'Customer support emphasis']
-            }),
-            ('business', 3, 'Optimization', {
-                'summary': 'Refine offerings and optimise cost and delivery.',
-                'advice': 'Streamline operations and iterate on product-market fit.',
-                'effects': ['Efficiency gains', 'Refined product-market fit']
-            }),
-            ('business', 4, 'Growth', {
-                'summary': 'Scale successful initiatives and expand reach.',
-                'advice': 'Invest in marketing and scalable infrastructure.',
-                'effects': ['Revenue growth', 'Scaling challenges']
-            }),
-            ('business', 5, 'Maturity', {
-                'summary': 'Stable operations with predictable cashflow and market position.',
-                'advice': 'Consolidate strengths and protect market share.',
-                'effects': ['Stable revenues', 'Brand solidity']
-            }),
-            ('business', 6, 'Renewal', {
-                'summary': 'Reassess strategy, pivot if necessary, and invest in renewal.',
-                'advice': 'Explore new offerings and invest in people development.',
-                'effects': ['Strategic pivots', 'Investment in talent']
-            }),
-            ('business', 7, 'Succession & Legacy', {
-                'summary': 'Prepare leadership transitions and long-term handover plans.',
-                'advice': 'Document processes and plan succession carefully.',
-                'effects': ['Legacy planning', 'Succession readiness']
-            }),
-            # Soul cycle paraphrases (larger spiritual/inner cycles)
-            ('soul', 1, 'March 22 to May 12', {
-                'summary': 'THOSE in this period inherit from the Cosmic a very lofty nature, with a deep-seated desire to achieve a high place or a high position in the esteem of the public and in the hearts of their closest acquaintances. They carry over from their previous incarnations the lessons and tribulations which have taught them the necessity for looking above and beyond the commonplace things of life and holding a vision of the highest ideals as their goals. They also carry into this life recollections of the experience of having achieved a notable place or position in life in some foreign land, and having tasted of a full cup with many of the luxurious and beautiful things of earthly existence. Therefore, in this incarnation, no matter in what station socially, racially, or financially they may be, there is always the inner urge to try to live a noble life, or at least one that will be above the commonplace, and that will bring them the respect and perhaps the adoration of the multitude. There is not just the desire for wealth, or the material luxuries of life, although there is a taste for these things slightly beyond the average; but the great desire, the great longing, that actuates these persons in their subjective thinking and planning is the attainment of public renown and approval. For this reason, these persons reluctantly deal with sordid things and constantly struggle against things that are mean, lowly, or objectionable to good taste and high ethical standards. This means that if these persons are starting this incarnation or the lessons of this life in a lowly social or financial position, there is a continual restlessness and dissatisfaction that urges them onward and upward. They always sense the nobility of their last life. They are generally trustworthy, for they have learned in the past that deceit, falsity, underhandedness, and unethical practices hold them back in the progress they wish to make. Their words are generally their bonds, and their aspirations are not dreamy or mystical, but practical, and adhere to a straight line of progress. There is, of course, the natural tendency carried over from the past to want to rule and dominate, and, therefore, be the heads or be the leaders of any plan, organization, or group of interests with which they may be connected, and in such capacities they will succeed because of the other inherent qualities. They are generally careful in the selection of their words, and the use of language in writing, and have commanding personalities when they are allowed to develop properly, and well-developed dramatic faculties. Such persons are usually affable among their peers, with perhaps a slight tendency to be impatient with those who do not aspire to rise, or who may be classed in their subconscious minds as the lowly serfs of a past kingdom. These persons can always be reached and appealed to through suggestions of sumptuousness and magnificence, and whatever may be honorable. They will succeed best in business matters wherein they may be managers, directors, controllers, or overseers, mayors, governors, or any high governmental officers, or holders of important positions in the courts of law. In more humble positions they will succeed as sheriffs, magistrates of small courts, or executive positions of a similar nature. They have an excellent preparation and faculty for the study of law, and in an artistic manner they are fond of metals and working in metals, not as jewelers, but as designers and creators of beautiful and magnificent things of metal. As second choice, they would succeed as designers and creators of magnificent buildings or arrangers of beautiful homes, or the creators of beautiful costumes, and articles of adornment. The physical weakness which they have inherited in this life are affections of the heart and brain, perhaps through overwork mentally, and tendencies toward weakness of the eyes, and toward fevers. They will find joy and recollection of familiar things from the past in traveling in such countries as Chaldea, Phoenicia, Italy, Sicily, Switzerland, and Scotland.',
-                'advice': ''
-            }),
-            ('soul', 2, 'Polarity A (March 22 to April 17)', {
-                'summary': 'Persons born in the first half of Period No. 1 will be more active in fighting their way to the top of the ladder of their ambitions than those in the B polarity. They will use all of their vital energy and power, and every physical means to achieve leadership and dominating positions, and they will be like warriors in mastering and controlling any situation or any line of work with which they are connected. Their constitutions will be fiery and strong, and their personal magnetism well developed, with excellent speaking voices and commanding style in writing.',
-                'advice': ''
-            }),
-            ('soul', 3, 'Polarity B (April 17 to May 12)', {
-                'summary': 'Those born in the last half of Period No. 1 will have greater tendencies to seek the goals of their ambitions in the fine arts or in the more refined and delicate places of life. They will be more genteel than those in the A polarity, if given the opportunity to develop their inherent tendencies, and they will be more subtle, more smiling, and more quiet in their achievements of success than those in the A polarity. Nevertheless, there is the same determination, with an additional characteristic that some may call bull-headedness. These persons will be found associated with art, drama, and music, either as hobbies or as professions if they have the opportunities to allow their natural tendencies to guide them.',
-                'advice': ''
-            }),
-            ('soul', 4, 'May 12 to July 3', {
-                'summary': "Persons born in this period come into this life carrying from the Cosmic and from their last previous incarnations memories of many peculiar experiences and tendencies, characteristics, that make strange combinations. In the first place, they bring into this life from the past a deep-seated desire to travel and move about, or they have been successful and happy in this in a previous life. The continuation in this life in any one place or in any one line of thought, or in any one hobby for a long time spells monotony to these persons, and however they may try outwardly to associate themselves permanently with some place or set of conditions, the inner restlessness causes them to feel uncomfortable and to seek a change. In one of their incarnations they have been not only experienced in journeying, but in exploring, investigating, and in trying to taste all phases of life. Everything that they associate themselves with is of the more delicate, refined, and temperamental nature. They have inherent desires to be well-mannered, thereby expressing tender natures, and the wish to be well-received and well-considered. There is a cosmic desire to search for novelties and the passing pleasures of human life that are wholesome, and yet filled with joy and happiness. Yet there is another equally strong desire, carried over from an old incarnation by each of these persons, to delve occasionally into the sciences and the more practical things of life, and these two desires constitute the strange complex that occasionally manifests itself in the lives of these persons. They are practical, saving, conservative in many ways, and yet their lives are of the present hour always, and they have a tendency to let the future take care of itself because of their faith in the just reward that will come. They prefer to live free of the cares of this life, seeking peace and quiet whenever they are troubled; they are not easily led into quarrels, arguments, or disagreements. They love to spend much time in meditation. In many affairs there is a tendency to be fickle, or we may say that those judging them outwardly would believe this to be so, whereas in truth it is only another form of the expression of the desire for change and for new experiences. They are honest, careful, ethically precise in many ways, and clean and wholesome in character, but are very apt to be misjudged because of their changeable natures. These persons must guard against being led into the company of those who seek only the pleasures of the flesh, for once they are started on a downward path, they become heavy drinkers, and are beggarly, careless, and given to disregard the niceties of life. In the trades and professions, these persons will succeed well as traveling representatives, or persons connected with business affairs that require changes of location, changes of contact, with many branches, and fluctuating interests. There are inherent faculties and abilities which will make them excellent secretaries, designers, artists, saleswomen or salesmen, actors or actresses, concert entertainers, newspaper reporters, or servants in fine homes. A peculiar tendency on the part of these persons is that of marrying persons who will bestow titles upon them or will bring changes of position into their lives. Very often the women marry men who look upon them and treat them as queens or as countesses, and pay continued adoration to them, whereas the men often marry women who are well-to-do, and who look upon their husbands as kings in the homes. Inherited physical weaknesses give a tendency toward troubles with the bladder, and toward rheumatic diseases, colds, and coughs. Often these colds will manifest through disturbance in the stomach or in the feet or eyes. These persons will find joy and interest in traveling through such countries as Norway, Denmark, the Netherlands, and Belgium, where they will contact sights and conditions familiar to them from the past.",
-                'advice': ''
-            }),
-            ('soul', 5, 'Polarity A (May 12 to June 8)', {
-                'summary': 'Those born in the first half of Period No. 2 will have very quick intellects, and will be more apt to enter into businesses that permit them to use their minds and fingers rather than all of the muscles of their bodies. In other words, quick minds, quick tongues, and quick hands will serve them usually well, and they are very apt to be employed in two occupations or have two hobbies and interests at the same time, and to give the impression to others that they are almost dual in their manner of living and expressing themselves. They should do everything that is in their power to develop the intellectual and mental side of their lives, because of inherited mental faculties. Persons in this polarity will make themselves known by their intellectual pursuits and will be credited with excellent education and excellent training, even if they have not actually had them in any school or academy.',
-                'advice': ''
-            }),
-            ('soul', 6, 'Polarity B (June 8 to July 3)', {
-                'summary': 'Those born in the last half of Period No. 2 are generally outstanding characters in the intellectual world, for they continually associate themselves with those interests or industries that deal with education, the fine arts, or the law. Their intellectual capabilities are more reserved and must be discovered, and they usually manifest in excellent memories, fine appreciation of language, intuitive senses that enable them to foresee and prophesy or perhaps sense oncoming conditions before anyone else may think of them. They are somewhat more stable in their physical changes of location, although the love of travel and of change of residence causes them to move occasionally. They will vacillate more in their intellectual pursuits and in their reading and studying than in their physical environment, however. These persons are able to serve as secretaries or associates in business to a greater degree than those in any other period or polarity.',
-                'advice': ''
-            }),
-            ('soul', 7, 'July 4 to August 25', {
-                'summary': "Persons born in this period carry from the past into this life the experiences of great struggles and achievement through determination and self-mastership. In other words, we have in this period those who are already potentially self-masters and masters of fate. And they have a strong constitution, a fiery, impetuous nature, and the will power and ability to accomplish against great odds, if there is sufficient motive and some encouragement. In addition to this inner nature, which is a part of their soul consciousness, their births during this period have given them from the Cosmic other related faculties and abilities which will enable them to be bold, confident, invisible characters in the achievement of any great purpose. These persons will challenge any obstacles that may arise in their lives, even though outwardly they may not realize that they have been stirred to action or aroused to a fighting spirit by obstacles that others may have looked upon as insurmountable or perhaps insignificant according to their natures. In other words, this is the type of person who can be encouraged and led into action by presenting an obstacle to him, as being one that others have failed to overcome. Naturally these persons are lovers of contest, and seekers of honors in contests, not merely for the aggrandizement, but because of the mastership it will establish. They are apt at times to be boastful of their abilities and in this thing demonstrate a weakness that must be overcome. They never hesitate to risk lives or limbs, or their best interests, to achieve anything that they believe was destined for them to master, whether it is in association with their own personal interests or not. Naturally these persons, if properly placed and properly trained, become great leaders in movements or employments calling for the use of strong will power, strong hands, and strong principles. If allowed to have their own choice in professions, they will most generally succeed as captains or officers in an army, or as leaders in great movements calling for strong, masterful leadership. In more conservative positions they will succeed as surgeons or chemists, or even as carpenters and contractors. They have an inherited inclination and liking, brought over from the past, for the making of small things that are intricate and of a mechanical nature. Therefore, they often are inventive and are successful in such lines as watchmaking, electrical designing, or the making of small mechanical devices of a very important nature. Their physical weaknesses may manifest in the tendency toward diseases of the blood, such as carbuncles, ringworm, eczema, sores of the skin, yellow jaundice, and similar conditions. There is also a tendency toward trouble from gallstones or burning fevers, and these persons should be very careful of their diet, for they are apt to eat highly seasoned foods and too much meat. We will find these persons attracted to and interested in such places as Lombardy, Bavaria, northern France, and Paris, for there they will recall conditions that seem familiar.",
-                'advice': ''
-            }),
-            ('soul', 8, 'Polarity A (July 4 to July 31)', {
-                'summary': 'Persons born in the first half of Period No. 3 are very apt to be adventuresome and to travel a great deal seeking adventure and the doing of things that call for the risking of life and limb, and they are, therefore, natural explorers and investigators. If unable to travel considerably, they will explore even in their own immediate country, and be known by their restless desires to delve into the mystery of conditions that baffle the conservative nature of a person who is not so ready to risk his life. These persons make good leaders of armies, or leaders of naval forces, and they are often associated with political or reform movements, for they love conquest and can carry an issue to victory. These persons often lead double lives in many ways, for they will have many interests and two outstanding occupations or methods of applying the faculties of their natures.',
-                'advice': ''
-            }),
-            ('soul', 9, 'Polarity B (July 31 to August 24)', {
-                'summary': 'Those born in the last half of Period No. 3 generally succeed in achieving the attainment of some position that places them at the head of some great organization, as in some high political office equivalent to that of a governor, mayor, judge, or president. They are naturally kingly and queenly by all of their instincts and habits, and they love pomp and ceremony, limelight, and adoration and approval of the public. They live their lives in keeping with these desires, and, therefore, carefully guard their weaknesses and those habits which might jeopardize the high positions they seek, or which they attain, for they learned this lesson in a previous life. In any occupation, whether on the stage, in literary work, in business, or in social affairs, the persons in this polarity are leaders or outstanding characters, and the mediocre positions in life will not satisfy them. Children born in this polarity should be given every form of education and training that will enable them to hold high positions with efficiency and with honor to themselves and their parents.',
-                'advice': ''
-            }),
-            ('soul', 10, 'August 25 to October 15', {
-                'summary': "Persons born in this period carry into this life from a previous incarnation the attainment of high personal powers, the positions of leadership that have to do with education, the fine arts, and especially the development of civilization, and the best interests of the public. Together with these characteristics, such persons have received from the Cosmic the additional benefits of wonderful faculties for study, and the attainment of knowledge, and the ability to express themselves in words or writing together with very fine memories, the ability to reason logically, and to live a life of estheticism if the opportunity is afforded. These persons are hard to become acquainted with objectively, for their intellectual abilities and knowledge enable them to clothe themselves with the colors of their environment and to meet persons on their own level. We may find these persons in the most humble positions of life, seemingly occupied with pursuits and affairs of a lowly type, and yet we will discover through acquaintanceship that they are truly prepared and trained for higher and better positions then those in which we find them. On the other hand, we may find these persons in the highest positions of the literary world, or at the head of educational institutions where they give more thought to the advancement of humanity than to their own advancement. The cosmic rhythm has created in them a natural desire for learning and for research, and they are very fond of mysteries, whether in fiction or in actuality. These persons also have the tendency to appreciate the power of words and the fine points in law and scientific knowledge. There is a tendency toward searching into the occult and into the secret and arcane wisdom of all ages, as well as into philosophy and religion, but in the latter sense the tendency is toward nonsectarianism and the building up of universal brotherhood and love. These persons are very capable in trade or business, and make excellent merchants because of their ability to read human nature and to understand the desires and wishes of others. For that reason they would make good salesmen or saleswomen, or good instructors of sales forces, or writers and preparers of advertising and sales literature. Their ability to reason logically and to express their ideas with logical arguments makes them qualified for many positions where this natural ability can be used. Very often their abilities lead them into politics, where they succeed well, but not to the same extent that they would in some truly humanitarian profession. These persons have usually acquired considerable advancement in metaphysical and occult illumination in a previous incarnation, and very often they were formerly adepts in one of the arcane brotherhoods, most often the Rosicrucian Order. There is something about their soul personality development and spiritual attainment that makes them truly great masters inwardly, and they are restless and unhappy until they contact in this incarnation that place or point in their soul progress where they left off in the last incarnation. These persons should be guided to the Rosicrucian work or some similar course of study and development at an early age, for that will be the beginning of another phase of rapid progress and development for them. Honor, temperance, and mystical idealism, accompanied by an unusually wonderful imagination, are the keynotes of their real inner characters. We find these persons very often occupied in the present incarnation as literary workers, mathematicians, secretaries, writers, sculptors, poets, orators, school teachers, college professors, bankers, clergymen, or ambassadors. The physical weaknesses, which are subtle physical tendencies of their natures, generally express themselves in so-called vertigoes, dizziness of the head or brain fatigue, accompanied sometimes by a slight degree of stammering or imperfection of enunciation, due to the rapid thinking and the attempt at rapid expression of thought. There may also be a tendency toward hoarseness, dry cough, or colds in the head. These persons will find great joy and happiness in visiting or traveling through such places as Flanders, Egypt, India, and most of all, the southern part of France.",
-                'advice': ''
-            }),
-            ('soul', 11, 'Polarity A (August 25 to September 20)', {
-                'summary': 'Persons born in the first half of Period No. 4 are generally shining lights in the educational and intellectual world. More women than men come into this period and become teachers of music, fine arts, or in a more humble way creators of costumes or workers at fine sewing and other trades or arts requiring nimbleness of finger and hand. On the other hand, the men of this period have a natural tendency toward the spiritual things of life, and would be excellent clergymen or teachers of ethics, philosophy, and morals, if they could express themselves freely and outside of the limitations of sectarianism. Persons in this polarity are generally very genial, good-natured, polished, cultured, and artistically and musically inclined. But this polarity also gives great strength of character and a dominating magnetism that would make them well qualified as physicians and surgeons, or judges and magistrates. Children born in this polarity must be directed very carefully, because the imagination is highly developed and this may create in them imaginary ideas which they will represent as truth and thus fall into the habit of making false statements. They, too, much be guarded against a restlessness of nature, ever seeking the strange and peculiar things of life and ignoring the practical. Overstudy on the part of such children must be guarded against, because the nervous and mental systems will not stand the strain during childhood and early youth.',
-                'advice': ''
-            }),
-            ('soul', 12, 'Polarity B (September 20 to October 15)', {
-                'summary': 'Persons born in the last half of Period No. 4 are particularly well adapted to the use of their mental abilities and logical reasoning in making decisions and in coming to reasonable conclusions. They are well balanced in all of their faculties and have a great desire to balance all their thoughts and all their knowledge. In examining the evidence or the statements on any subject, or in any matter of dispute, they are sure to seek for the balance and to want to establish an equality in all things. The tendency in their lives is to be more or less esthetic, with a great love for the pretty, beautiful, luxurious, nice, and comfortable things of life. They are generally supporters or patrons of the arts and music, as well as drama, and make good artists and writers, especially of happy and fantastic tales with good moral principles involved. These persons are seldom ruffled or upset, and go through life with a tranquility and evenness that is a great help to others as well as themselves. They, therefore, should occupy such positions as enable them to hold conditions in certain bounds, or to direct the lives of children and young people along the lines of peace, harmony, and beauty.',
-                'advice': ''
-            }),
-            ('soul', 13, 'October 16 to December 6', {
-                'summary': "Persons born in this period are generally those who attain great success and fame in their particular callings, although this success may not always be measured in worldly things or in a financial way. These persons carry over from the past incarnation one lesson which they have learned well, and which becomes the keynote of their inner, secret natures, and that is, that as one gives and does for others, so one attains and succeeds in life. Therefore, these persons are fundamentally generous, good-natured, kindly, and often free in their actions and lives to such an extent that their own success and progress seems to be nil from a material point of view, and for this reason they are often misjudged as failures in life. On the other hand, they do acquire an unusual amount of knowledge, a great deal of culture and polish, an extreme amount of happiness and pleasure, and withal are comfortable and satisfied with their lot in life, even though it may be in poor circumstances or in humble position. In every crisis the Cosmic comes to their rescue and brings about satisfactory conditions. This, however, does not prevent them from seeking greater things and a greater abundance of this life’s blessings. But they are philosophically inclined through the lessons they have learned in the past, and believe that they should give thanks every morning for life itself, and not complain if they have the least of the worldly blessings, for they realize that they have in their knowledge and in their mystical powers a greater asset than most other human beings, and for this they are eternally thankful. These persons also bring into this life from the Cosmic, through the vibrations of the period in which they were born, an unusually philosophical nature, accompanied with the ability to acquire languages and to understand the spiritual and natural laws of the universe to an unusual degree. This makes it simple for them to acquire and master the principle of harmony in art, music, writing, and even in chemistry. Being capable, therefore, of expressing themselves in so many different ways, these persons are really in possession of more hobbies throughout life than those born in any other period. Whenever they seek relaxation or a change from occupation, they can turn their hands to music, to mechanics, to art, or to the sciences, and dabble in any one of these things to a degree that almost borders upon professional expertness. For this reason they may enter into various occupations in their youth and change often as they go through life. They finally settle into positions where their complex abilities can be used, one by one, throughout the weeks and months, and thereby hold unique positions which other persons could not fill. Fundamentally, there is a great love for animals, for outdoor sports, and for nature itself. They are open, frank, honest, and cheerful, and deplore deceit and underhandedness. They have carried over with them a very high degree of mystical development and of religious and spiritual attunement, and are often thrown into deep spells of spiritual meditation that others may look upon as despondency. They seem to sense the sufferings of the world as well as the pleasures of the world. These persons would make excellent directors of organizations, where they are concerned with the scope of larger plans and things of a national or international importance rather than with the smaller details of executive management. They are capable of planning great schemes and carrying them out successfully, and for this reason they may enter the profession of advertisement writing and planning, sales organization work, or the control and management of schools, colleges, and universities. In business methods, however, their generosity, charity, and liberal nature does not bring them personal fortune, nor help to build up the financial end of their plans, but it does bring success in every other direction, which eventually leads to financial success. We are more apt to find these persons in the positions of judges, senators, lawyers, priests, doctors of law, professors in universities, newspaper editors, or magazine editors, or conductors of shops or places of antiques, or dealers in the arcane and mystical things of life. In physical weaknesses the most common manifestation is in connection with inflammation of various parts of the body though colds or overwork, accompanied by conditions of the blood due to overeating or irregular eating, or the eating of rich foods. Skin diseases, rheumatic conditions, quinsy, and apoplexy are general conditions found with these people. These persons will find great joy and happiness in journeying through or visiting Babylon, Persia, Egypt, Palestine, and the strange byways of the Orient where they may come in contact with ancient familiarities, especially in Egypt, China, and Japan.",
-                'advice': ''
-            }),
-            ('soul', 14, 'Polarity A (October 16 to November 11)', {
-                'summary': 'Persons born in the first half of Period No. 5 are very aggressive in their business affairs because they have a nature that is filled with determination and energy. They do not rise to heights in the same channels as those in the B polarity, because those in the A polarity have a feeling that they must fight their way through life and must be everlastingly at something in order to keep themselves from slipping back into a mediocre position. The aggressiveness of the persons in this polarity leads them into many unique positions and makes them outstanding characters in their ability to accomplish difficult things. They have a tendency, however, toward accidents and toward delays through their own rash exertions. These persons will find themselves best fitted for positions in connection with the government, or as attorneys, occupied daily in arguments and dissensions, fighting for certain principles with considerable success.',
-                'advice': ''
-            }),
-            ('soul', 15, 'Polarity B (November 11 to December 6)', {
-                'summary': 'Those born in the last half of Period No. 5 are almost the opposite of those born in the A polarity in regard to aggressiveness. The warlike spirit of their nature is greatly subdued and they would rather stay away from a quarrel or argument than take any part in it. They believe that everything will eventually adjust itself successfully and properly without contention. They are more happy, cheerful, and free in their living than those in the A polarity, and while not seeking positions or labors or problems that call for strenuous physical effort, they do love to tackle problems that call for mystical understanding or intellectual mastership, and careful, logical reasoning for a solution. These persons make very dependable friends, are often leaders of humanitarian movements, and occupy themselves more in helping others than in helping themselves. They enjoy the nice things of life, but always have an inclination to seek places that are covered, secret, or out of the way, and to associate with the persons who are of lowly or humble station and try to help them. On the other hand, these persons live an open, noble life, and constantly try to rise to greatest of mystical heights and become spiritually attuned with the highest forces in the universe. Great masters, great adepts, and those ready for the highest forms of mystical initiation are generally found in this polarity.',
-                'advice': ''
-            }),
-            ('soul', 16, 'December 7 to January 27', {
-                'summary': "Those persons born in this period bring with them from the past incarnation a benediction which they have earned through suffering and much trial and pain. This benediction is in the form of a reward, and brings to these persons that happiness, joy, and indulgence in the pleasant things of life which they have not had before, but which they may have had an opportunity to enjoy, but discarded or cast aside in some previous incarnation, and then had to do without for a long time to learn the great lesson. However, being born in this period brings the benediction and blessing of attainment, peace, and attunement with the pleasant, cheerful, lovely things of human life. As they use these pleasures, however, in this incarnation, so will they determine for themselves what their fate will be in their next incarnation. If they abuse the benediction that is theirs this time or cast it lightly aside in any way, it will be denied to them at the close of this incarnation and in a future one. To carry out this benediction, the cosmic vibrations of this period have given them certain faculties and functions which, if developed and applied properly, will bring them the joy and happiness they should have. Therefore, these persons have a natural tendency toward music, toward merriment, amusements, singing, pleasant voice, pleasing disposition, and a cheerful aspect of life. There is a distaste born in them in this incarnation for anything sordid or deceitful, and virtue and honor are constant urges of their present, inner dispositions. For this reason, these people are not usually given to quarrelling or wrangling, nor to viciousness of any kind. Early in childhood and all through life they will show a tendency toward cleanliness in health, cleanliness in habits, and even a conservative attitude toward all indulgences. This makes many of the persons born in this period of the esthetic type, and we may easily recognize most of them by their physical appearance, for they seem to be of the mental temperament, and what one would casually call the artistic or musical type. Seldom are they of very robust build or even of really robust health. Naturally, they tend to become musicians, artists, sculptors, actors, actresses, designers, or teachers of these arts and professions. The men make excellent jewelers, when they are not engaged in music, art, or drama, or dealers in silks and fine dress materials, embroideries, and things of this kind; for while they may go into these lines of business for the money there is in them, the real instinctive reason is their desire to be with and around fine materials and artistic creations. For the same reason they may go into the business of manufacturing and selling perfumes, or works of art, and become engravers or dealers in commodities that are for personal adornment or the decoration of homes. These characters are ones which need sympathy and understanding if one is to become well acquainted with them, and they should never be forced to go into lines of business that deal with mechanics or heavy machinery, or coarse and muscular occupations. They are easily frightened and easily annoyed, and should never be placed as children or young people where there is great disturbance and a lack of quiet and peace. For such persons to be driven into war or into the melee of Wall Street or conditions of this kind is to be forced into an early annihilation of their best faculties and abilities, and to bring about a gradual breaking down of the body leading to early transition. These persons are really the makers of the mirth in life, and are usually the wholesome, sweet characters that we love to idealize. In physical weaknesses, they generally suffer from nervousness due to overstudy or unpleasant environment, or very often from the suppression of natural functions due to an extreme moral viewpoint. In fact, this moral viewpoint may lead some of them to refrain from marriage until late in life, and in this repression they bring about a weakening of the constitution. Most of their physical suffering will be in parts of the body located in the abdomen, and especially in the bladder, kidneys, and bowels. These persons will find great joy and happiness in traveling through or visiting Arabia, parts of Austria, especially around Vienna, along the Mediterranean coast, and England and the New England states of America.",
-                'advice': ''
-            }),
-            ('soul', 17, 'Polarity A (December 7 to January 2)', {
-                'summary': 'Persons born in the first half of Period No. 6 are a little more serious in life than those in Polarity B, for they generally have a tendency to want to teach and promulgate their esthetic ideas and to help establish these things in their own community or nation. For this reason they may become associated with reform movements, or with educational movements, promulgating philosophy and ethics. Very often these persons become critics of the drama or of art and music, for it is their desire to separate the bad from the best in life. Even in all that seems perfect to others they see flaws, and can constructively and helpfully analyze and point out the errors that others do not see. For this reason we find these persons in this polarity occupying very definite positions, generally as critics or teachers of a distinct class or even as judges in competitions, or as readers for magazines and newspapers, where they may pass judgment upon matter that is submitted for use. Their analytical minds enable them to accomplish a great deal of good for humanity, and especially in all of the arts and sciences, where they are more successful as analytical experts than as real developers of any one of the principles involved in any of the sciences and arts.',
-                'advice': ''
-            }),
-            ('soul', 18, 'Polarity B (January 2 to January 27)', {
-                'summary': 'Persons born in the last half of Period No. 6 are critical to an extreme extent, and while they do not allow this criticism to be applied for the benefit of others (for they hesitate to become known as reformers or to be identified with the criticism of matters of any kind), they nevertheless become critical of their own lives and of their own actions. This causes them considerable unrest and often makes them of that type which we call Aquarian. In other words, they often find themselves changing their opinions and doing things hastily and impulsively because of a sudden impression or a sudden critical attitude, and after the act is completed or the words spoken, they again analyze and criticize their actions and wonder why they did or said the things that have passed. These persons also become antiquarians and love to delve into old bookshops, museums, and places of research, for they find pleasure and happiness in analyzing and criticizing, examining and studying the unusual things of life. They make wonderful friends and are good entertainers, for they can talk well and long of unusual experiences and things which they have witnessed or enjoyed in life. There is the ability to build up stories and fictitious pictures and situations which enable them to become excellent writers of plays, dramas, or scenarios. These persons enjoy life in a peculiar way through indulgence in their own unique forms of pleasure, and are often looked upon as being Bohemian, queer, or unusual in life. They are never accused, however, of being peculiar in their mental equipment, or of being irrational in any sense. They are always greatly loved by a large number of friends, and in all parties, entertainments, and associations are far from being wallflowers, or undesirable elements. These persons often attract to themselves an excellent companion for life in either marriage or business, and are really one of the important types making up the complex nature of humanity.',
-                'advice': ''
-            }),
-            ('soul', 19, 'January 28 to March 21', {
-                'summary': "Those born in this period carry from their previous lives into this one the necessity for accomplishing very serious and important work in connection with the evolution of humanity. They are those who have brought into their lives through their own actions in the last incarnation, the need for learning, first, the serious aspects of life and, second, teaching these things to others through their own living or through their instruction. They are usually those who have gone through a great many incarnations and are highly evolved and experienced in the lessons to be learned from all the experiences that life has to give in many foreign lands. For this reason, early in life these persons as children, or even as little babies, would be called old souls, and considered older than their years. From the Cosmic they have also inherited as a gift the ability to recall much of their past instruction, and most of the experiences they have had in life along with the additional faculty to systematize their knowledge and to acquire readily new knowledge and relate it to that which they have already stored up in the inner consciousness. Therefore, it is not surprising to find that these persons in this period have an unusually deep imagination that seems to be prophetic and capable of imagining things which occurred in great antiquity, or which will occur in the future. They also have the ability to argue, to explain logically, and to present their thoughts and pictures systematically. They are, however, reserved in their utterances and reserved and dignified in all of their actions. They give one the feeling constantly of a person who feels that he or she is being observed and watched and analyzed, and, therefore, must be on guard in connection with every thought and act. In judgment, they are severe because they are strict and careful. Unlike those in the fifth period, they do not allow their hearts to influence their judgments. To these persons the law is the law, and is both merciful and just, and no exceptions and no variations of the law must be allowed because of sentiment. Therefore, being stern and just they are generally greatly honored and respected, and seldom accused of being too severe or unfairly strict. These persons believe that the great things of life are attained through study, and the careful building up of acquisitions along definite lines. They are extremely systematic, and take advantage of every principle of natural law and of man-made laws to assure themselves of the things they want in life and to protect what they have. They are not mercenary, but on the other hand they are not overly generous. They are, of course, naturally honest and more severe in regard to the exactness of statement and precision of things than those in any of the other periods. For all these reasons, these persons would make excellent judges, magistrates, or heads of large corporations and big business propositions. A peculiar thing, however, is that in moderate circumstances and when born in mediocre positions, they often become employed in connection with such lines as plumbing, bricklaying, plastering, building, gardening, dyeing of cloth, printing, or in one of the other trades or businesses that are usually united in unions or under define wage scales as labor-trades. If these persons only knew that their inherent desire for exactness, precision, and truthfulness could lead them into higher occupations, such as magistrates and judges, they would seek education and training for such positions early in life and succeed well indeed. On the other hand, their firm belief that the benefits of life and the necessities can be acquired only by slow acquisition and the careful attainment of them leads them into occupations that are well established, protected by union laws and government laws, and which seldom fluctuate in hours of employment or in salaries. Thus they hamper their own progress by a false understanding of the principles of life. Many of these persons also become nuns, monks, or members of monastic organizations or bodies, and live secluded lives where they can labor in their definite systematic manner to bring into their lives that which they feel is right. The diseases which are natural to them through the vibrations of their period are impediments of the ears, teeth, or eyes, and sometimes of speech, and such conditions as proceed from colds, such as tuberculosis, and often pneumonia. On the other hand, their excellent constitutions enable them to live to a very old age, and they suffer only from jaundice or dropsy, with occasionally a touch of palsy or apoplexy. These persons are not usually ill until late in life, and are able to fight off many of the ailments that come to others. They will find great joy and pleasure in visiting such countries as Turkey, the Balkan states, Spain, parts of Africa, and South America.",
-                'advice': ''
-            }),
-            ('soul', 20, 'Polarity A (January 28 to February 23)', {
-                'summary': 'Persons born in the first half of Period No. 7 are very often led into occupations that are unusual, such as those of chemical experts, criminologists, investigators, explorers, research workers in ancient history, archeology, geology, and similar subjects. They are easily classified as being profound in knowledge, and devoted to only one, or possibly two, subjects in life. They usually dress in a quiet manner and give the appearance of being much older than they are. They show extreme reserve, a tendency toward orthodox and religious devotion, caring little for the gaieties of life, and seldom patronizing anything that is frivolous or transitory. They are diligent workers, consistent, dependable, careful, and often employed in the same positions or same lines of work throughout their entire lives. These persons are often known as the salt of the earth, and are wonderful friends to those who can make a contact beneath the surface and win their favor. There is a desire to reform the world in certain regards, but these persons are consistent enough to adopt the reform themselves and live the life and set an example.',
-                'advice': ''
-            }),
-            ('soul', 21, 'Polarity B (February 23 to March 21)', {
-                'summary': 'Persons born in the last half of Period No. 7 are quite opposite to those of Polarity A, inasmuch as they are not quite so serious in life and do seek some pleasure and happiness as a relaxation and reaction from their more serious studies and occupations. The persons in this polarity have an unusual tendency toward mysticism, occultism, and the mysterious things of the universe, and of nature. The persons in this polarity seem to acquire more fortune in a material sense than those in Polarity A, and often attain considerable fame in their particular fields of effort. However, they are quite dual in nature, and are capable of living a dual life inasmuch as they may be outwardly at the head of a great organization, or contacting the public in a smiling, happy mood, while at home or in the privacy of their own seclusion they may be quiet, reserved, and more interested in the deep, more serious things of life than one would suspect. These persons have a great magnetic power, which they can exert easily over others, and have a tendency to read easily the minds of other persons and to project their consciousness into space and there sense the thoughts and actions of others. These persons also love to be near the water and love to take long journeys, more for the purpose of studying human nature or studying the history and conditions of the country and place than for pleasure, although they do enjoy being on the water and in cities near it.',
-                'advice': ''
-            })
-        ]
-
-        created = 0
-        for t in templates:
-            # template tuples are inconsistent to allow quick additions; normalize
-            cycle_type = t[0]
-            period_number = t[1]
-            description = t[2] if len(t) > 2 else ''
-            effects = t[3] if len(t) > 3 else {}
-            obj, _ = CycleTemplate.objects.update_or_create(
-                cycle_type=cycle_type, period_number=period_number,
-                defaults={'description': description, 'effects': effects}
-            )
-            created += 1
-
-        self.stdout.write(self.style.SUCCESS(f'Created/Updated {created} CycleTemplate entries'))
+        call_command('seed_templates', stdout=self.stdout, stderr=self.stderr)
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from cycles.seeding import SEED_CYCLE_TYPES, SEED_DATA_DIR, SeedDataError, seed_templates
+
+
+class Command(BaseCommand):
+    help = 'Seed CycleTemplate rows from cycles/seed_data, writing only the periods whose content changed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--types', default=','.join(SEED_CYCLE_TYPES), help='Comma-separated cycle types to seed (default: all).')
+        parser.add_argument('--data-dir', default=str(SEED_DATA_DIR), help='Directory holding the <cycle_type>.json files.')
+        parser.add_argument('--prune', action='store_true', help='Delete templates of the seeded types that are not in the data.')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would change without writing.')
+
+    def handle(self, *args, **options):
+        cycle_types = tuple(t.strip() for t in options['types'].split(',') if t.strip())
+        try:
+            result = seed_templates(options['data_dir'], cycle_types, prune=options['prune'], dry_run=options['dry_run'])
+        except SeedDataError as exc:
+            raise CommandError(str(exc))
+        versions = ', '.join(f'{cycle_type} v{version}' for cycle_type, version in result.versions.items())
+        prefix = 'Dry run: would seed' if options['dry_run'] else 'Seeded'
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix} {versions}: {result.created} created, {result.updated} updated, '
+            f'{result.unchanged} unchanged, {result.removed} removed'
+        ))
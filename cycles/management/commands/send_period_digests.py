@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from cycles.digests import DEFAULT_BATCH_SIZE, DEFAULT_CHUNK_SIZE, iter_digests, send_digests, zones_at_hour
+from cycles.utils import _ensure_date, _ensure_today
+
+
+class Command(BaseCommand):
+    help = (
+        'Email a digest to every user with a cycle or business entering a new period. Run it hourly: '
+        'each run covers the timezones where it is CYCLES_DIGEST_HOUR. With --all-timezones it covers '
+        'everyone for one date instead, for a single daily run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--at', default=None, help='Run as of this ISO datetime (UTC if naive) instead of now.')
+        parser.add_argument('--hour', type=int, default=None, help='Local hour digests go out at (default CYCLES_DIGEST_HOUR).')
+        parser.add_argument('--all-timezones', action='store_true', help='Send for every timezone at once.')
+        parser.add_argument('--date', default=None, help='With --all-timezones: the date (YYYY-MM-DD) to send for, default today.')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Profiles read per query.')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Messages handed to the email backend at once.')
+        parser.add_argument('--dry-run', action='store_true', help='Render the digests but send nothing.')
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        batch_size = max(1, options['batch_size'])
+
+        if options['all_timezones']:
+            if options['at'] or options['hour'] is not None:
+                raise CommandError('--at and --hour do not apply with --all-timezones')
+            day = _ensure_date(options['date']) if options['date'] else _ensure_today(None)
+            if day is None:
+                raise CommandError('--date must be YYYY-MM-DD')
+            groups = {day: None}
+        else:
+            if options['date']:
+                raise CommandError('--date needs --all-timezones; use --at for an hourly run')
+            hour = getattr(settings, 'CYCLES_DIGEST_HOUR', 6) if options['hour'] is None else options['hour']
+            if not 0 <= hour <= 23:
+                raise CommandError('--hour must be between 0 and 23')
+            try:
+                moment = datetime.fromisoformat(options['at']) if options['at'] else datetime.now(timezone.utc)
+            except ValueError:
+                raise CommandError('--at must be an ISO datetime')
+            groups = zones_at_hour(moment, hour)
+
+        sent = 0
+        for day, zones in sorted(groups.items()):
+            count = send_digests(
+                iter_digests(day, zones, chunk_size=chunk_size), batch_size=batch_size, dry_run=options['dry_run'],
+            )
+            where = 'every timezone' if zones is None else f'{len(zones)} timezones'
+            self.stdout.write(f'{day}: {count} digests for {where}')
+            sent += count
+        verb = 'Rendered' if options['dry_run'] else 'Sent'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {sent} digests'))
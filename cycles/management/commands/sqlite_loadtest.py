@@ -0,0 +1,162 @@
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.test.utils import override_settings
+
+from cycles.bench import percentile
+from cycles.models import Business, UserProfile
+from cycles.writes import immediate_atomic, is_locked_error, retry_on_locked
+
+
+# stock: Django's own backend, rollback journal, deferred BEGIN, no retries.
+# tuned: this project's backend with WAL, BEGIN IMMEDIATE and retry on lock.
+MODES = {
+    'stock': 'django.db.backends.sqlite3',
+    'tuned': 'cycle_project.sqlite_backend',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure read throughput while writers are active on a scratch SQLite file, '
+        'with the stock backend and with the WAL/BEGIN IMMEDIATE/retry setup.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5.0, help='Duration of each run.')
+        parser.add_argument('--readers', type=int, default=4, help='Reader threads (dashboard business query).')
+        parser.add_argument('--writers', type=int, default=2, help='Writer threads (profile update plus business insert).')
+        parser.add_argument('--businesses', type=int, default=200, help='Businesses owned by the test user.')
+        parser.add_argument('--modes', default='stock,tuned', help='Comma-separated modes to run: stock, tuned.')
+
+    def handle(self, *args, **options):
+        modes = [m.strip() for m in options['modes'].split(',') if m.strip()]
+        if not modes or any(m not in MODES for m in modes):
+            raise CommandError(f'--modes must be a comma-separated subset of {", ".join(MODES)}')
+        if options['seconds'] <= 0 or options['readers'] < 1 or options['writers'] < 0:
+            raise CommandError('--seconds and --readers must be positive and --writers not negative')
+
+        with tempfile.TemporaryDirectory() as directory:
+            for mode in modes:
+                result = self._run(mode, Path(directory) / f'{mode}.sqlite3', options)
+                self.stdout.write(
+                    f'{mode:>6}: {result["reads_per_s"]:8.0f} reads/s  '
+                    f'(p95 {result["read_p95_ms"]:.1f}ms, {result["read_errors"]} failed)  '
+                    f'{result["writes_per_s"]:6.0f} writes/s  ({result["write_errors"]} failed)'
+                )
+
+    def _run(self, mode, path, options):
+        alias = f'loadtest_{mode}'
+        connections.settings[alias] = connections.configure_settings({
+            DEFAULT_DB_ALIAS: dict(connections.settings[DEFAULT_DB_ALIAS]),
+            alias: {'ENGINE': MODES[mode], 'NAME': str(path)},
+        })[alias]
+        try:
+            # the project's router sends every write to 'default'; without
+            # routers, related objects stay on the scratch alias of the
+            # instance they were reached from
+            with override_settings(DATABASE_ROUTERS=[]):
+                call_command('migrate', database=alias, verbosity=0, interactive=False)
+                user_id = self._populate(alias, options['businesses'])
+                return self._hammer(mode, alias, user_id, options)
+        finally:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+
+    def _populate(self, alias, count):
+        user = User.objects.db_manager(alias).create_user('loadtest')
+        profile = user.userprofile
+        profile.date_of_birth = date(1990, 5, 17)
+        profile.save()
+        start = date(2000, 1, 1)
+        businesses = [Business(user=user, name=f'Business {i}', establishment_date=start + timedelta(days=i * 7)) for i in range(count)]
+        Business.objects.using(alias).bulk_create(businesses)
+        return user.pk
+
+    def _hammer(self, mode, alias, user_id, options):
+        deadline = time.perf_counter() + options['seconds']
+        read_latencies, counts, lock = [], {'writes': 0, 'read_errors': 0, 'write_errors': 0}, threading.Lock()
+
+        def read():
+            UserProfile.objects.using(alias).get(user_id=user_id)
+            list(Business.objects.using(alias).filter(user_id=user_id).by_cycle(order='next_transition')[:50])
+
+        def write(n):
+            profile = UserProfile.objects.using(alias).get(user_id=user_id)
+            UserProfile.objects.using(alias).filter(pk=profile.pk).update(timezone='UTC' if n % 2 else 'Europe/Berlin')
+            Business.objects.using(alias).bulk_create([
+                Business(user_id=user_id, name=f'Load {n}', establishment_date=date(2020, 1, 1)),
+            ])
+
+        if mode == 'tuned':
+            def write_transaction(n):
+                with immediate_atomic(using=alias):
+                    write(n)
+            write_transaction = retry_on_locked(write_transaction, using=alias)
+        else:
+            def write_transaction(n):
+                with transaction.atomic(using=alias):
+                    write(n)
+
+        def reader():
+            latencies = []
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        read()
+                    except OperationalError as exc:
+                        if not is_locked_error(exc):
+                            raise
+                        with lock:
+                            counts['read_errors'] += 1
+                        continue
+                    latencies.append(time.perf_counter() - started)
+            finally:
+                connections[alias].close()
+            with lock:
+                read_latencies.extend(latencies)
+
+        def writer(offset):
+            n = offset
+            try:
+                while time.perf_counter() < deadline:
+                    n += options['writers']
+                    try:
+                        write_transaction(n)
+                    except OperationalError as exc:
+                        if not is_locked_error(exc):
+                            raise
+                        with lock:
+                            counts['write_errors'] += 1
+                        continue
+                    with lock:
+                        counts['writes'] += 1
+            finally:
+                connections[alias].close()
+
+        threads = [threading.Thread(target=reader) for _ in range(options['readers'])]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(options['writers'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        seconds = options['seconds']
+        return {
+            'reads_per_s': len(read_latencies) / seconds,
+            'read_p95_ms': percentile(read_latencies, 95) * 1000 if read_latencies else 0.0,
+            'read_median_ms': statistics.median(read_latencies) * 1000 if read_latencies else 0.0,
+            'read_errors': counts['read_errors'],
+            'writes_per_s': counts['writes'] / seconds,
+            'write_errors': counts['write_errors'],
+        }
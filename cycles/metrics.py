@@ -0,0 +1,242 @@
+"""Process metrics served at ``/metrics`` in the Prometheus text format.
+
+Recorded here:
+
+* ``cycles_view_duration_seconds``: a histogram per view, fed by
+  ``timing.ServerTimingMiddleware``, with ``cycles_view_db_queries_total``;
+* ``cycles_function_duration_seconds``: a histogram per ``get_*`` cycle
+  function, fed by ``timing.engine_timer``.
+
+The cycle and fragment cache hit/miss counters (``caching.cache_stats`` and
+``fragments.fragment_cache_stats``) are added when a snapshot is taken. The
+profile and business gauges are read from the database at scrape time.
+
+Recording takes one uncontended lock and a few list updates. Each process
+keeps its own totals; with ``CYCLES_METRICS_DIR`` set, every process also
+writes its totals to ``metrics-<pid>-<start time>.json`` there (at most
+every few seconds). The endpoint then sums the files, so several workers
+report as one. The start time keeps a new process that reuses a PID from
+overwriting the old one's file. The file of a process that is no longer
+running is deleted when the endpoint finds it, so its totals drop out of
+the sums: scrapers see a counter reset, as they would after a restart.
+That liveness check only sees processes on the same host, so the
+directory must not be shared between hosts.
+"""
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+
+
+VIEW_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FUNCTION_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.01, 0.05)
+
+HISTOGRAMS = {
+    'cycles_view_duration_seconds': ('Time spent handling requests, per view.', VIEW_BUCKETS),
+    'cycles_function_duration_seconds': ('Time spent in each get_* cycle function.', FUNCTION_BUCKETS),
+}
+COUNTERS = {
+    'cycles_view_db_queries_total': 'Database queries run by each view.',
+    'cycles_cache_hits_total': 'Cycle result cache hits, per cycle type.',
+    'cycles_cache_misses_total': 'Cycle result cache misses, per cycle type.',
+    'cycles_fragment_cache_hits_total': 'Dashboard fragment cache hits, per section.',
+    'cycles_fragment_cache_misses_total': 'Dashboard fragment cache misses, per section.',
+}
+
+FLUSH_INTERVAL = 5.0
+
+_STARTED = time.time_ns() // 1000000  # when this process (or its parent, before fork) imported the module
+_FILE_NAME = re.compile(r'metrics-(\d+)-(\d+)\.json')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+class Registry:
+    """Thread-safe counters and histograms of one process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {name: {} for name in HISTOGRAMS}
+        self._counters = {name: {} for name in COUNTERS}
+        self._last_flush = time.monotonic()
+
+    def observe(self, name, labels, value):
+        buckets = HISTOGRAMS[name][1]
+        index = bisect_left(buckets, value)
+        with self._lock:
+            series = self._histograms[name].get(labels)
+            if series is None:
+                # one count per bucket plus +Inf, then the sum
+                series = self._histograms[name][labels] = [0] * (len(buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def inc(self, name, labels, amount=1):
+        with self._lock:
+            self._counters[name][labels] = self._counters[name].get(labels, 0) + amount
+
+    def snapshot(self):
+        """Return this process's totals, including the cache counters, as plain data."""
+        from .caching import cache_stats
+        from .fragments import fragment_cache_stats
+
+        with self._lock:
+            data = {
+                'histograms': {name: {k: list(v) for k, v in series.items()} for name, series in self._histograms.items()},
+                'counters': {name: dict(series) for name, series in self._counters.items()},
+            }
+        counters = data['counters']
+        for cycle_type, stats in cache_stats()['by_cycle'].items():
+            counters['cycles_cache_hits_total'][_labels(cycle_type=cycle_type)] = stats['hits']
+            counters['cycles_cache_misses_total'][_labels(cycle_type=cycle_type)] = stats['misses']
+        for section, stats in fragment_cache_stats()['by_section'].items():
+            counters['cycles_fragment_cache_hits_total'][_labels(section=section)] = stats['hits']
+            counters['cycles_fragment_cache_misses_total'][_labels(section=section)] = stats['misses']
+        return data
+
+    def reset(self):
+        with self._lock:
+            for series in self._histograms.values():
+                series.clear()
+            for series in self._counters.values():
+                series.clear()
+
+    def maybe_flush(self):
+        now = time.monotonic()
+        if now - self._last_flush < FLUSH_INTERVAL:
+            return
+        self._last_flush = now
+        flush()
+
+
+registry = Registry()
+
+
+def observe_request(view, seconds, queries):
+    labels = _labels(view=view)
+    registry.observe('cycles_view_duration_seconds', labels, seconds)
+    registry.inc('cycles_view_db_queries_total', labels, queries)
+    registry.maybe_flush()
+
+
+def observe_function(function, seconds):
+    registry.observe('cycles_function_duration_seconds', _labels(function=function), seconds)
+
+
+def metrics_dir():
+    directory = getattr(settings, 'CYCLES_METRICS_DIR', None)
+    return Path(directory) if directory else None
+
+
+def _file_name():
+    # the PID changes after a fork, so it is read on every call
+    return f'metrics-{os.getpid()}-{_STARTED}.json'
+
+
+def _running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # running, as another user
+    return True
+
+
+def flush():
+    """Write this process's totals to ``CYCLES_METRICS_DIR``, if it is set."""
+    directory = metrics_dir()
+    if directory is None:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / _file_name()
+    partial = path.with_suffix('.tmp')
+    with open(partial, 'w') as fh:
+        json.dump(registry.snapshot(), fh)
+    os.replace(partial, path)
+
+
+def collect():
+    """Return the totals of every running process: the files in ``CYCLES_METRICS_DIR`` plus this process, live.
+
+    Files of processes that have exited are deleted.
+    """
+    snapshots = [registry.snapshot()]
+    directory = metrics_dir()
+    if directory is not None and directory.is_dir():
+        own = _file_name()
+        for path in directory.glob('metrics-*.json'):
+            match = _FILE_NAME.fullmatch(path.name)
+            if path.name == own or match is None:
+                continue
+            if not _running(int(match.group(1))):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass  # already removed by another process
+                continue
+            try:
+                with open(path) as fh:
+                    snapshots.append(json.load(fh))
+            except (OSError, ValueError):
+                continue  # being replaced by its process
+    return merge(snapshots)
+
+
+def merge(snapshots):
+    merged = {'histograms': {name: {} for name in HISTOGRAMS}, 'counters': {name: {} for name in COUNTERS}}
+    for snapshot in snapshots:
+        for name, series in snapshot.get('histograms', {}).items():
+            target = merged['histograms'].get(name)
+            if target is None:
+                continue
+            for labels, values in series.items():
+                if labels in target:
+                    target[labels] = [a + b for a, b in zip(target[labels], values)]
+                else:
+                    target[labels] = list(values)
+        for name, series in snapshot.get('counters', {}).items():
+            target = merged['counters'].get(name)
+            if target is None:
+                continue
+            for labels, value in series.items():
+                target[labels] = target.get(labels, 0) + value
+    return merged
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(totals, gauges=()):
+    """Render merged totals and ``(name, help, value)`` gauges in the text exposition format."""
+    lines = []
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+        for labels, values in sorted(totals['histograms'][name].items()):
+            cumulative = 0
+            prefix = f'{labels},' if labels else ''
+            for bound, count in zip(buckets + ('+Inf',), values[:-1]):
+                cumulative += count
+                le = bound if bound == '+Inf' else repr(float(bound))
+                lines.append(f'{name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{{labels}}} {_number(values[-1])}')
+            lines.append(f'{name}_count{{{labels}}} {cumulative}')
+    for name, help_text in COUNTERS.items():
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+        for labels, value in sorted(totals['counters'][name].items()):
+            lines.append(f'{name}{{{labels}}} {_number(value)}')
+    for name, help_text, value in gauges:
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge', f'{name} {_number(value)}']
+    return '\n'.join(lines) + '\n'
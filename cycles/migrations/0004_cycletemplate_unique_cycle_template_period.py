@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-18 13:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cycles', '0003_cycletemplate_userprofile_business_start_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='cycletemplate',
+            constraint=models.UniqueConstraint(fields=('cycle_type', 'period_number'), name='unique_cycle_template_period'),
+        ),
+    ]
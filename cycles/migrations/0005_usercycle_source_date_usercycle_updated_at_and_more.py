@@ -0,0 +1,32 @@
+# Generated by Django 4.2.23 on 2026-10-18 13:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cycles', '0004_cycletemplate_unique_cycle_template_period'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usercycle',
+            name='source_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='usercycle',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='usercycle',
+            name='valid_until',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='usercycle',
+            constraint=models.UniqueConstraint(fields=('user_profile', 'cycle_type'), name='unique_user_cycle_snapshot'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-18 13:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cycles', '0006_userprofile_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='calendar_token',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
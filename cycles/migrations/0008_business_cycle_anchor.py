@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+def populate_cycle_anchor(apps, schema_editor):
+    Business = apps.get_model('cycles', 'Business')
+    db_alias = schema_editor.connection.alias
+    businesses = list(Business.objects.using(db_alias).only('pk', 'establishment_date'))
+    for business in businesses:
+        business.cycle_anchor = business.establishment_date.toordinal() % 365
+    Business.objects.using(db_alias).bulk_update(businesses, ['cycle_anchor'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cycles', '0007_userprofile_calendar_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='business',
+            name='cycle_anchor',
+            field=models.PositiveSmallIntegerField(editable=False, null=True),
+        ),
+        migrations.RunPython(populate_cycle_anchor, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='business',
+            name='cycle_anchor',
+            field=models.PositiveSmallIntegerField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['user', 'cycle_anchor'], name='business_user_cycle_anchor'),
+        ),
+    ]
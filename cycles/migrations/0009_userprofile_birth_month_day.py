@@ -0,0 +1,32 @@
+# Generated by Django 4.2.23 on 2026-10-18 14:39
+
+from django.db import migrations, models
+
+
+def populate_birth_month_day(apps, schema_editor):
+    UserProfile = apps.get_model('cycles', 'UserProfile')
+    db_alias = schema_editor.connection.alias
+    profiles = list(UserProfile.objects.using(db_alias).filter(date_of_birth__isnull=False).only('pk', 'date_of_birth'))
+    for profile in profiles:
+        profile.birth_month_day = profile.date_of_birth.month * 100 + profile.date_of_birth.day
+    UserProfile.objects.using(db_alias).bulk_update(profiles, ['birth_month_day'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cycles', '0008_business_cycle_anchor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='birth_month_day',
+            field=models.PositiveSmallIntegerField(editable=False, null=True),
+        ),
+        migrations.RunPython(populate_birth_month_day, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['birth_month_day', 'date_of_birth'], name='profile_birthday_cohort'),
+        ),
+    ]
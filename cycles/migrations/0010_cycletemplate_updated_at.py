@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-18 15:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cycles', '0009_userprofile_birth_month_day'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cycletemplate',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -1,38 +1,211 @@
-from django.db import models
+import copy
+
+from django.db import models, transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.functions import Mod
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
-from django.dispatch import receiver
+
+from .utils import (
+    CYCLE_DAY_BOUNDS,
+    DAYS_IN_CYCLE,
+    _ensure_date,
+    _ensure_today,
+    birth_month_day,
+    birthday_cohort,
+    business_anchor_ranges,
+    business_cycle_anchor,
+)
+
+class UserProfileQuerySet(models.QuerySet):
+    BIRTHDAY_CYCLES = ('yearly', 'health')
+
+    def entering_period(self, cycle_type, period, today=None):
+        """Profiles whose ``cycle_type`` period ``period`` (name or number) starts on ``today``.
+
+        ``cycle_type`` is ``yearly`` or ``health``, the cycles that restart on
+        each birthday. One range scan of the birthday index, however many
+        profiles there are. Raises ValueError for other cycle types or an
+        unknown period.
+        """
+        from .windows import resolve_period
+        if cycle_type not in self.BIRTHDAY_CYCLES:
+            raise ValueError('unsupported_cycle_type')
+        number = resolve_period(cycle_type, period)
+        if number is None:
+            raise ValueError('invalid_period')
+        cycle_start, low, high = birthday_cohort(number - 1, today)
+        return self.filter(birth_month_day__range=(low, high), date_of_birth__lte=cycle_start)
+
 
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     date_of_birth = models.DateField(null=True, blank=True)
+    # date_of_birth as MMDD, kept in sync by save(); lets the database find
+    # everyone starting a yearly or health period (see UserProfileQuerySet).
+    birth_month_day = models.PositiveSmallIntegerField(null=True, editable=False)
     business_start_date = models.DateField(null=True, blank=True)
     other_dates = models.JSONField(default=dict, blank=True)  # For custom cycles/events
     timezone = models.CharField(max_length=50, default='UTC')
+    updated_at = models.DateTimeField(auto_now=True)
+    # Secret for the subscribable calendar feed; issued on first use.
+    calendar_token = models.CharField(max_length=64, unique=True, null=True, blank=True)
+
+    objects = UserProfileQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['birth_month_day', 'date_of_birth'], name='profile_birthday_cohort'),
+        ]
+
+    # Compared by changed_fields(), so a User save only writes a cached
+    # profile that was actually edited (see signals.ensure_user_profile).
+    TRACKED_FIELDS = ('date_of_birth', 'business_start_date', 'other_dates', 'timezone', 'calendar_token')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_saved_values()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._remember_saved_values()
+
+    def save(self, *args, **kwargs):
+        date_of_birth = _ensure_date(self.date_of_birth)
+        self.birth_month_day = birth_month_day(date_of_birth) if date_of_birth else None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'date_of_birth' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'birth_month_day'}
+        super().save(*args, **kwargs)
+        self._remember_saved_values()
+
+    def _remember_saved_values(self):
+        self._saved_values = {
+            name: copy.deepcopy(self.__dict__[name]) for name in self.TRACKED_FIELDS if name in self.__dict__
+        }
+
+    def changed_fields(self):
+        """Tracked fields changed since the profile was loaded or saved; all of them if it never was."""
+        saved = getattr(self, '_saved_values', None)
+        if saved is None:
+            return list(self.TRACKED_FIELDS)
+        return [
+            name for name in self.TRACKED_FIELDS
+            if name in self.__dict__ and (name not in saved or self.__dict__[name] != saved[name])
+        ]
 
     def __str__(self):
         return self.user.username
 
-@receiver(post_save, sender=User)
-def create_user_profile(sender, instance, created, **kwargs):
-    # Ensure a UserProfile exists for every user; use get_or_create to be idempotent.
-    UserProfile.objects.get_or_create(user=instance)
-
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    # Save the related profile if present; guard against missing related object.
-    try:
-        profile = getattr(instance, 'userprofile', None)
-        if profile:
-            profile.save()
-    except Exception:
-        # Avoid raising during user save; profile will be created by get_or_create above if missing.
-        pass
+
+class BusinessQuerySet(models.QuerySet):
+    ORDERINGS = {
+        'name': ('name', 'pk'),
+        'next_transition': ('days_until_transition', 'pk'),
+        'period': ('cycle_day', 'pk'),
+    }
+
+    # bulk_create, bulk_update and update skip Business.save(), so they keep
+    # cycle_anchor in sync themselves.
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for business in objs:
+            business.set_cycle_anchor()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if 'establishment_date' in fields:
+            for business in objs:
+                business.set_cycle_anchor()
+            fields = [*fields, 'cycle_anchor']
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        if 'establishment_date' not in kwargs or 'cycle_anchor' in kwargs:
+            return super().update(**kwargs)
+        establishment_date = _ensure_date(kwargs['establishment_date'])
+        if establishment_date is not None:
+            return super().update(cycle_anchor=business_cycle_anchor(establishment_date), **kwargs)
+        # an expression: read the new dates back and set each anchor
+        self._for_write = True
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list('pk', flat=True))
+            count = super().update(**kwargs)
+            rows = self.model._base_manager.using(self.db).filter(pk__in=pks)
+            by_anchor = {}
+            for pk, updated in rows.values_list('pk', 'establishment_date'):
+                by_anchor.setdefault(business_cycle_anchor(updated), []).append(pk)
+            for anchor, anchored in by_anchor.items():
+                rows.filter(pk__in=anchored).update(cycle_anchor=anchor)
+        return count
+
+    def in_business_period(self, period_number, today=None):
+        """Businesses whose current business period is ``period_number`` (1-based), via the indexed anchor."""
+        condition = Q()
+        for low, high in business_anchor_ranges(period_number - 1, today):
+            condition |= Q(cycle_anchor__range=(low, high))
+        return self.filter(condition)
+
+    def with_cycle_position(self, today=None):
+        """Annotate the 1-based ``cycle_day`` and the ``days_until_transition`` of each business."""
+        today_ordinal = _ensure_today(today).toordinal()
+        return self.annotate(
+            cycle_day=Mod(Value(today_ordinal) - F('cycle_anchor'), Value(DAYS_IN_CYCLE)) + 1,
+        ).annotate(
+            days_until_transition=Case(
+                *[When(cycle_day__lte=end_day, then=Value(end_day + 1) - F('cycle_day')) for _, end_day in CYCLE_DAY_BOUNDS],
+                output_field=IntegerField(),
+            ),
+        )
+
+    def by_cycle(self, period=None, order=None, today=None):
+        """Filter by ``period`` (name or number) and sort by ``order``; raises ValueError for unknown values."""
+        from .windows import resolve_period
+        queryset = self
+        if period:
+            number = resolve_period('business', period)
+            if number is None:
+                raise ValueError('invalid_period')
+            queryset = queryset.in_business_period(number, today)
+        if order:
+            if order not in self.ORDERINGS:
+                raise ValueError('invalid_order')
+            queryset = queryset.with_cycle_position(today).order_by(*self.ORDERINGS[order])
+        else:
+            queryset = queryset.order_by('pk')
+        return queryset
+
 
 class Business(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     name = models.CharField(max_length=255)
     establishment_date = models.DateField()
+    # establishment_date.toordinal() % 365, kept in sync by save() and by the
+    # queryset's bulk_create(), bulk_update() and update(); lets the database
+    # select businesses by current period (see BusinessQuerySet). Raw SQL and
+    # migrations that write establishment_date must set it too.
+    cycle_anchor = models.PositiveSmallIntegerField(editable=False)
+
+    objects = BusinessQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'cycle_anchor'], name='business_user_cycle_anchor'),
+        ]
+
+    def set_cycle_anchor(self):
+        establishment_date = _ensure_date(self.establishment_date)
+        if establishment_date:
+            self.cycle_anchor = business_cycle_anchor(establishment_date)
+
+    def save(self, *args, **kwargs):
+        self.set_cycle_anchor()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'establishment_date' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'cycle_anchor'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -52,6 +225,12 @@ class CycleTemplate(models.Model):
     period_number = models.IntegerField()
     description = models.TextField()
     effects = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['cycle_type', 'period_number'], name='unique_cycle_template_period'),
+        ]
 
     def __str__(self):
         return f"{self.get_cycle_type_display()} Period {self.period_number}"
@@ -64,6 +243,16 @@ class UserCycle(models.Model):
     current_period = models.IntegerField()
     report_data = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Birth date the snapshot was computed from and the day its period ends
+    # (null when the current period is the last one).
+    source_date = models.DateField(null=True, blank=True)
+    valid_until = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user_profile', 'cycle_type'], name='unique_user_cycle_snapshot'),
+        ]
 
     def __str__(self):
         return f"{self.user_profile.user.username} - {self.cycle_type} cycle"
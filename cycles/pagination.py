@@ -0,0 +1,103 @@
+"""Keyset pagination for the business list and the business cycle API.
+
+A page holds the ``limit`` businesses after the cursor in the requested
+order (``BusinessQuerySet.ORDERINGS``, or creation order), read with
+``WHERE (key, id) > (cursor key, cursor id) ... LIMIT limit + 1``. There
+is no OFFSET and no count, so every page costs the same however many
+businesses an account has.
+
+The cursor is opaque, URL-safe base64 JSON. It carries the ordering and
+the date the cycle positions were computed for, so ``next_transition`` and
+``period`` pages stay consistent when a client pages across midnight.
+"""
+import base64
+import json
+from collections import namedtuple
+from datetime import date
+
+from django.db.models import Q
+
+from .models import BusinessQuerySet
+from .utils import _ensure_today
+
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+Page = namedtuple('Page', ['items', 'next_cursor'])
+
+
+def encode_cursor(order, today, values):
+    payload = json.dumps([order or '', today.toordinal(), values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return ``(order, today, values)``; raises ValueError('invalid_cursor') if malformed."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        order, ordinal, values = json.loads(payload)
+        today = date.fromordinal(ordinal)
+    except (ValueError, TypeError, OverflowError):
+        raise ValueError('invalid_cursor')
+    if not isinstance(order, str) or not isinstance(values, list) or not all(
+        isinstance(value, (str, int, float)) and not isinstance(value, bool) for value in values
+    ):
+        raise ValueError('invalid_cursor')
+    return order, today, values
+
+
+def _after(keys, values):
+    """Rows after ``values`` in ``keys`` order: (k1 > v1) or (k1 = v1 and k2 > v2) ..."""
+    condition = Q()
+    for i, key in enumerate(keys):
+        condition |= Q(**dict(zip(keys[:i], values[:i])), **{f'{key}__gt': values[i]})
+    return condition
+
+
+class BusinessPager:
+    """One page of a user's businesses, filtered by period and sorted by order.
+
+    ``queryset`` is the page query (one row more than ``limit``, to tell if
+    there is a next page), so callers can run it sync or async and pass
+    the rows to ``page()``. Raises ValueError for an unknown period or order,
+    or for a cursor that is malformed or was issued for another order.
+    """
+
+    def __init__(self, businesses, period=None, order=None, cursor=None, limit=DEFAULT_LIMIT):
+        self.order = order or ''
+        self.limit = limit
+        self.today = _ensure_today(None)
+        after = None
+        if cursor:
+            cursor_order, self.today, after = decode_cursor(cursor)
+            if cursor_order != self.order:
+                raise ValueError('invalid_cursor')
+        queryset = businesses.by_cycle(period, order, self.today)
+        self.keys = BusinessQuerySet.ORDERINGS.get(order, ('pk',))
+        if after is not None:
+            if len(after) != len(self.keys):
+                raise ValueError('invalid_cursor')
+            queryset = queryset.filter(_after(self.keys, after))
+        self.queryset = queryset[:limit + 1]
+
+    @classmethod
+    def from_request(cls, businesses, params):
+        """Build the pager from ``period``, ``order``, ``cursor`` and ``limit`` query parameters."""
+        limit = params.get('limit')
+        if limit is None:
+            limit = DEFAULT_LIMIT
+        elif limit.isdigit() and 1 <= int(limit) <= MAX_LIMIT:
+            limit = int(limit)
+        else:
+            raise ValueError('invalid_limit')
+        return cls(businesses, params.get('period'), params.get('order'), params.get('cursor'), limit)
+
+    def page(self, rows):
+        rows = list(rows)
+        items = rows[:self.limit]
+        next_cursor = None
+        if len(rows) > self.limit:
+            last = items[-1]
+            next_cursor = encode_cursor(self.order, self.today, [getattr(last, key) for key in self.keys])
+        return Page(items, next_cursor)
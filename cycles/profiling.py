@@ -0,0 +1,151 @@
+"""Opt-in sampled profiling of the dashboard and the cycle API.
+
+``sampled_profile`` runs a view under cProfile (and tracemalloc, for
+memory) for a ``CYCLES_PROFILE_SAMPLE_RATE`` fraction of requests, or for
+any request from a staff user that sends ``X-Cycles-Profile: 1``. Each
+profiled request leaves a ``.prof`` file (``pstats`` format) and, with
+memory tracing, a ``.mem.json`` of the top allocation sites in
+``CYCLES_PROFILE_DIR``; only the newest ``CYCLES_PROFILE_MAX_FILES``
+profiles are kept. ``manage.py profile_report`` aggregates them.
+
+One request per process is profiled at a time; concurrent sampled requests
+run unprofiled. For async views only the event loop thread is profiled, not
+the ``sync_to_async`` threads it waits on. With the default rate of 0 and no
+header the only cost is a settings lookup.
+"""
+import cProfile
+import json
+import random
+import threading
+import time
+import tracemalloc
+import uuid
+from functools import wraps
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+
+
+PROFILE_HEADER = 'X-Cycles-Profile'
+MEMORY_TOP_SITES = 50
+
+_lock = threading.Lock()
+
+
+def profile_dir():
+    return Path(getattr(settings, 'CYCLES_PROFILE_DIR', Path(settings.BASE_DIR) / 'profiles'))
+
+
+def _wants_profile(request):
+    if request.headers.get(PROFILE_HEADER) == '1':
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_staff:
+            return True
+    rate = getattr(settings, 'CYCLES_PROFILE_SAMPLE_RATE', 0)
+    return rate > 0 and random.random() < rate
+
+
+def _rotate(directory, keep):
+    profiles = sorted(directory.glob('*.prof'), key=lambda p: p.stat().st_mtime)
+    for old in profiles[:max(0, len(profiles) - keep)]:
+        old.unlink(missing_ok=True)
+        old.with_suffix('.mem.json').unlink(missing_ok=True)
+
+
+def _memory_sites(snapshot):
+    return [
+        {'site': f'{stat.traceback[0].filename}:{stat.traceback[0].lineno}', 'size': stat.size, 'count': stat.count}
+        for stat in snapshot.statistics('lineno')[:MEMORY_TOP_SITES]
+    ]
+
+
+class _Session:
+    """One profiled request: starts the profilers and writes their results."""
+
+    def __init__(self, view_name):
+        self.view_name = view_name
+        self.trace_memory = getattr(settings, 'CYCLES_PROFILE_MEMORY', True) and not tracemalloc.is_tracing()
+        self.profiler = cProfile.Profile()
+
+    def start(self):
+        if self.trace_memory:
+            tracemalloc.start()
+        self.started = time.perf_counter()
+        self.profiler.enable()
+
+    def abort(self):
+        self.profiler.disable()
+        if self.trace_memory:
+            tracemalloc.stop()
+
+    def stop(self, response):
+        self.profiler.disable()
+        elapsed = time.perf_counter() - self.started
+        memory = None
+        if self.trace_memory:
+            memory = {'peak': tracemalloc.get_traced_memory()[1], 'sites': _memory_sites(tracemalloc.take_snapshot())}
+            tracemalloc.stop()
+
+        directory = profile_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f'{time.strftime("%Y%m%dT%H%M%S")}-{self.view_name}-{elapsed * 1000:.0f}ms-{uuid.uuid4().hex[:8]}'
+        self.profiler.dump_stats(directory / f'{name}.prof')
+        if memory is not None:
+            memory.update(view=self.view_name, elapsed_ms=round(elapsed * 1000, 1))
+            with open(directory / f'{name}.mem.json', 'w') as fh:
+                json.dump(memory, fh)
+        _rotate(directory, getattr(settings, 'CYCLES_PROFILE_MAX_FILES', 200))
+        response[PROFILE_HEADER] = f'{name}.prof'
+        return response
+
+
+def sampled_profile(view):
+    """Profile a sample of the requests to ``view``; see the module docstring."""
+    view_name = view.__name__
+
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_inner(request, *args, **kwargs):
+            if not _wants_profile(request) or not _lock.acquire(blocking=False):
+                return await view(request, *args, **kwargs)
+            try:
+                session = _Session(view_name)
+                session.start()
+                try:
+                    response = await view(request, *args, **kwargs)
+                except BaseException:
+                    session.abort()
+                    raise
+                return session.stop(response)
+            finally:
+                _lock.release()
+        return async_inner
+
+    @wraps(view)
+    def inner(request, *args, **kwargs):
+        if not _wants_profile(request) or not _lock.acquire(blocking=False):
+            return view(request, *args, **kwargs)
+        try:
+            session = _Session(view_name)
+            session.start()
+            try:
+                response = view(request, *args, **kwargs)
+            except BaseException:
+                session.abort()
+                raise
+            return session.stop(response)
+        finally:
+            _lock.release()
+    return inner
+
+
+def collected_profiles(directory=None, view=None):
+    """Return the ``.prof`` files in ``directory``, oldest first, optionally for one view."""
+    directory = Path(directory) if directory else profile_dir()
+    if not directory.is_dir():
+        return []
+    profiles = sorted(directory.glob('*.prof'), key=lambda p: p.stat().st_mtime)
+    if view:
+        profiles = [p for p in profiles if p.name.split('-')[1:2] == [view]]
+    return profiles
@@ -0,0 +1,162 @@
+"""Send cycle reads to read replicas and everything else to the primary.
+
+``PrimaryReplicaRouter`` reads ``CycleTemplate``, ``Business``,
+``UserProfile`` and ``UserCycle`` from a random alias in
+``CYCLES_READ_REPLICAS``. All writes, and every read of another model, go
+to ``default``. With no replicas configured it routes everything to
+``default``.
+
+A replica may lag behind the primary, so reads stay on the primary:
+
+* inside a transaction on ``default``;
+* for the rest of a request (or, outside requests, the current context)
+  once it has written one of the replicated models;
+* for ``CYCLES_REPLICA_PIN_SECONDS`` after that, for every request of the
+  same user. ``ReplicaPinningMiddleware`` records the pin in the default
+  cache. It only holds across worker processes when that cache is shared
+  (Memcached, Redis); the default LocMemCache is per process.
+
+A write is an INSERT, UPDATE or DELETE of a replicated table on the
+primary, seen by ``record_write`` (installed on every connection from
+``signals.py``). Asking the router for a write alias is not enough:
+``get_or_create`` does that even when the row exists.
+"""
+import contextvars
+import random
+from functools import lru_cache
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+REPLICATED_MODELS = frozenset({'cycles.CycleTemplate', 'cycles.Business', 'cycles.UserProfile', 'cycles.UserCycle'})
+PIN_KEY_PREFIX = 'cycles:replica-pin'
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+# whether the current request's user is pinned to the primary
+_pinned = contextvars.ContextVar('cycles_replica_pinned', default=False)
+# whether the current request (or context) has written a replicated model
+_wrote = contextvars.ContextVar('cycles_replica_wrote', default=False)
+
+
+def replica_aliases():
+    return getattr(settings, 'CYCLES_READ_REPLICAS', ())
+
+
+def pin_key(user_id):
+    return f'{PIN_KEY_PREFIX}:{user_id}'
+
+
+def pin_user(user_id):
+    """Read from the primary for ``user_id`` during the next ``CYCLES_REPLICA_PIN_SECONDS``."""
+    cache.set(pin_key(user_id), True, getattr(settings, 'CYCLES_REPLICA_PIN_SECONDS', 10))
+
+
+def user_is_pinned(user_id):
+    return cache.get(pin_key(user_id), False)
+
+
+@lru_cache(maxsize=None)
+def _replicated_tables():
+    return tuple(f'"{apps.get_model(label)._meta.db_table}"' for label in REPLICATED_MODELS)
+
+
+def record_write(execute, sql, params, many, context):
+    """Execute wrapper: note that the current context wrote a replicated table on the primary."""
+    if (
+        not _wrote.get()
+        and sql.lstrip()[:7].upper().startswith(WRITE_STATEMENTS)
+        and any(table in sql for table in _replicated_tables())
+    ):
+        _wrote.set(True)
+    return execute(sql, params, many, context)
+
+
+def install_write_recorder(connection):
+    if connection.alias == DEFAULT_DB_ALIAS and record_write not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_write)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if (
+            not replicas
+            or model._meta.label not in REPLICATED_MODELS
+            or _pinned.get()
+            or _wrote.get()
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # replicas get their schema from the primary
+        return db not in replica_aliases()
+
+
+class ReplicaPinningMiddleware:
+    """Pin users who write a replicated model to the primary for a short window.
+
+    Goes after ``AuthenticationMiddleware``. Without replicas it only resets
+    the per-request state.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        user_id = self._user_id(request)
+        pinned = user_id is not None and user_is_pinned(user_id)
+        pinned_token, wrote_token = _pinned.set(pinned), _wrote.set(False)
+        try:
+            response = self.get_response(request)
+            self._finish(request)
+        finally:
+            _pinned.reset(pinned_token)
+            _wrote.reset(wrote_token)
+        return response
+
+    async def __acall__(self, request):
+        user_id = await sync_to_async(self._user_id)(request)
+        pinned = user_id is not None and await sync_to_async(user_is_pinned)(user_id)
+        pinned_token, wrote_token = _pinned.set(pinned), _wrote.set(False)
+        try:
+            response = await self.get_response(request)
+            await sync_to_async(self._finish)(request)
+        finally:
+            _pinned.reset(pinned_token)
+            _wrote.reset(wrote_token)
+        return response
+
+    def _user_id(self, request):
+        if not replica_aliases():
+            return None
+        user = getattr(request, 'user', None)
+        return user.pk if user is not None and user.is_authenticated else None
+
+    def _finish(self, request):
+        # request.user again: the request may have logged the user in
+        if _wrote.get():
+            user_id = self._user_id(request)
+            if user_id is not None:
+                pin_user(user_id)
@@ -0,0 +1,113 @@
+"""Change-detecting seeding of CycleTemplate rows from ``cycles/seed_data``.
+
+Each cycle type has a versioned JSON file listing its periods. Seeding
+hashes every period's content, compares it with the hash of the row in the
+database and writes only the rows that are new or changed, with a single
+``bulk_create(update_conflicts=True)`` inside one transaction. A re-seed
+with nothing to change is one read query, and the template catalog is only
+invalidated when something was written.
+"""
+import hashlib
+import json
+from collections import namedtuple
+from pathlib import Path
+
+from django.db import transaction
+
+from . import catalog
+from .models import CycleTemplate
+
+
+SEED_DATA_DIR = Path(__file__).resolve().parent / 'seed_data'
+SEED_CYCLE_TYPES = tuple(value for value, _ in CycleTemplate.CYCLE_TYPES)
+
+SeedResult = namedtuple('SeedResult', ['created', 'updated', 'unchanged', 'removed', 'versions'])
+
+
+class SeedDataError(ValueError):
+    """A seed data file is missing or malformed."""
+
+
+def content_hash(description, effects):
+    """Hash of a template's content, independent of key order in ``effects``."""
+    payload = json.dumps([description, effects], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_seed_data(directory=SEED_DATA_DIR, cycle_types=SEED_CYCLE_TYPES):
+    """Return ``(rows, versions)`` from the data files of ``cycle_types``.
+
+    ``rows`` maps ``(cycle_type, period_number)`` to ``(description, effects)``;
+    ``versions`` maps each cycle type to its file's version.
+    """
+    rows, versions = {}, {}
+    for cycle_type in cycle_types:
+        if cycle_type not in SEED_CYCLE_TYPES:
+            raise SeedDataError(f'unknown cycle type {cycle_type!r}')
+        path = Path(directory) / f'{cycle_type}.json'
+        try:
+            with open(path, encoding='utf-8') as fh:
+                data = json.load(fh)
+        except (OSError, ValueError) as exc:
+            raise SeedDataError(f'{path}: {exc}')
+        if data.get('cycle_type') != cycle_type or not isinstance(data.get('periods'), list):
+            raise SeedDataError(f'{path}: expected cycle_type {cycle_type!r} and a list of periods')
+        versions[cycle_type] = data.get('version')
+        for period in data['periods']:
+            number = period.get('period_number')
+            description = period.get('description')
+            effects = period.get('effects', {})
+            if not isinstance(number, int) or number < 1 or not isinstance(description, str) or not isinstance(effects, dict):
+                raise SeedDataError(f'{path}: invalid period {period!r:.80}')
+            if (cycle_type, number) in rows:
+                raise SeedDataError(f'{path}: period {number} is listed twice')
+            rows[(cycle_type, number)] = (description, effects)
+    return rows, versions
+
+
+def seed_templates(directory=SEED_DATA_DIR, cycle_types=SEED_CYCLE_TYPES, prune=False, dry_run=False):
+    """Bring the CycleTemplate rows of ``cycle_types`` in line with the seed data.
+
+    With ``prune``, rows of those cycle types that are not in the data are
+    deleted. With ``dry_run`` nothing is written; the result still reports
+    what would change.
+    """
+    rows, versions = load_seed_data(directory, cycle_types)
+    with transaction.atomic():
+        existing = {
+            (cycle_type, number): (pk, content_hash(description, effects))
+            for pk, cycle_type, number, description, effects in CycleTemplate.objects.filter(
+                cycle_type__in=cycle_types,
+            ).values_list('pk', 'cycle_type', 'period_number', 'description', 'effects')
+        }
+        changed = []
+        created = updated = 0
+        for (cycle_type, number), (description, effects) in sorted(rows.items()):
+            current = existing.get((cycle_type, number))
+            if current is not None and current[1] == content_hash(description, effects):
+                continue
+            if current is None:
+                created += 1
+            else:
+                updated += 1
+            changed.append(CycleTemplate(
+                cycle_type=cycle_type, period_number=number, description=description, effects=effects,
+            ))
+        stale = [pk for key, (pk, _) in existing.items() if key not in rows] if prune else []
+
+        if not dry_run:
+            if changed:
+                CycleTemplate.objects.bulk_create(
+                    changed,
+                    update_conflicts=True,
+                    unique_fields=['cycle_type', 'period_number'],
+                    update_fields=['description', 'effects', 'updated_at'],
+                )
+            if stale:
+                CycleTemplate.objects.filter(pk__in=stale).delete()
+            if changed or stale:
+                # bulk_create sends no post_save, so the catalog is invalidated here
+                transaction.on_commit(catalog.invalidate)
+
+    unchanged = len(rows) - created - updated
+    return SeedResult(created, updated, unchanged, len(stale), versions)
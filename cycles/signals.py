@@ -1,17 +1,52 @@
 # cycles/signals.py
 
-from django.db.models.signals import post_save
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
 from django.dispatch import receiver
-from .models import UserProfile
+from . import catalog, routers, timing
+from .models import UserProfile, CycleTemplate
 
 @receiver(post_save, sender=User)
-def create_profile(sender, instance, created, **kwargs):
-    """Ensure a UserProfile exists for each User; use get_or_create to be idempotent.
+def ensure_user_profile(sender, instance, created, raw=False, using=None, **kwargs):
+    """Create the UserProfile of a new User, and save a cached profile only if it was edited.
 
-    The previous unconditional create could raise IntegrityError when another
-    part of the code (or tests) already created a profile for the user. Using
-    get_or_create prevents UNIQUE constraint failures.
+    Most User saves (such as the ``last_login`` update on every login) leave
+    the profile alone, so they cost no profile query or write.
     """
+    if raw:
+        return
     if created:
-        UserProfile.objects.get_or_create(user=instance)
+        # another receiver, a fixture or a data migration may have created it already
+        UserProfile.objects.using(using).get_or_create(user=instance)
+        return
+    relation = User.userprofile.related
+    if relation.is_cached(instance):
+        profile = relation.get_cached_value(instance)
+        if profile is None:
+            return
+        if profile.pk is None:
+            profile.save(using=using)
+            return
+        changed = profile.changed_fields()
+        if changed:
+            profile.save(using=using, update_fields=[*changed, 'updated_at'])
+
+
+@receiver(post_save, sender=CycleTemplate)
+@receiver(post_delete, sender=CycleTemplate)
+def invalidate_template_catalog(sender, **kwargs):
+    """Reload the in-process template catalog after any template change."""
+    catalog.invalidate()
+
+
+@receiver(connection_created)
+def record_request_queries(sender, connection, **kwargs):
+    """Count every query towards the current request's Server-Timing."""
+    timing.install_query_recorder(connection)
+
+
+@receiver(connection_created)
+def record_replicated_writes(sender, connection, **kwargs):
+    """Keep reads on the primary once a request has written a replicated model (see ``routers``)."""
+    routers.install_write_recorder(connection)
@@ -0,0 +1,136 @@
+"""Materialized UserCycle snapshots.
+
+``build_snapshot_rows`` is the pure computation used by the
+``materialize_user_cycles`` command; it imports no models so it can run in a
+process pool under any start method. ``load_fresh_snapshots`` is the read
+side used by the views (``aload_user_snapshots`` for the async views).
+"""
+from datetime import date
+
+import numpy as np
+
+from .batch import compute_cycles_batch
+from .utils import (
+    _ensure_today,
+    get_cycle_progress,
+    get_health_cycle,
+    get_human_life_cycle,
+    get_reincarnation_cycle,
+    get_yearly_cycle,
+)
+
+
+# Cycles that depend only on the profile's date of birth.
+SNAPSHOT_CYCLE_FUNCTIONS = {
+    'human': get_human_life_cycle,
+    'yearly': get_yearly_cycle,
+    'health': get_health_cycle,
+    'reincarnation': get_reincarnation_cycle,
+}
+
+_DATE_KEYS = ('start_date', 'end_date')
+
+
+def _dump_period(period):
+    return {k: (v.isoformat() if k in _DATE_KEYS and isinstance(v, date) else v) for k, v in period.items()}
+
+
+def _load_period(period):
+    return {k: (date.fromisoformat(v) if k in _DATE_KEYS and isinstance(v, str) else v) for k, v in period.items()}
+
+
+def _snapshot_row(profile_id, cycle_type, birth_date, valid_until, as_of):
+    periods, current_period, _ = SNAPSHOT_CYCLE_FUNCTIONS[cycle_type](birth_date, today=as_of)
+    number = periods.index(current_period) + 1
+    return {
+        'user_profile_id': profile_id,
+        'cycle_type': cycle_type,
+        'start_date': current_period['start_date'],
+        'current_period': number,
+        'source_date': birth_date,
+        'valid_until': valid_until,
+        'report_data': {
+            'periods': [_dump_period(p) for p in periods],
+            'current_period_number': number,
+        },
+    }
+
+
+def build_snapshot_rows(profiles, existing, as_of):
+    """Return snapshot rows for the profiles whose period changed since the last run.
+
+    ``profiles`` is a list of ``(profile_id, date_of_birth)``; ``existing`` maps
+    ``(profile_id, cycle_type)`` to the stored ``(current_period, source_date,
+    valid_until)``. Current periods are found with the batch engine; the full
+    period list is only built for rows that need rewriting.
+    """
+    if not profiles:
+        return []
+    ids = [pid for pid, _ in profiles]
+    birth_dates = [dob for _, dob in profiles]
+    rows = []
+    for cycle_type in SNAPSHOT_CYCLE_FUNCTIONS:
+        result = compute_cycles_batch(cycle_type, birth_dates, as_of)
+        for i, profile_id in enumerate(ids):
+            number = int(result.period_index[i]) + 1
+            transition = result.next_transition[i]
+            valid_until = None if np.isnat(transition) else transition.astype(object)
+            stored = existing.get((profile_id, cycle_type))
+            if stored is not None:
+                stored_number, stored_source, stored_until = stored
+                unchanged = (
+                    stored_number == number
+                    and stored_source == birth_dates[i]
+                    and stored_until == valid_until
+                )
+                if unchanged:
+                    continue
+            rows.append(_snapshot_row(profile_id, cycle_type, birth_dates[i], valid_until, as_of))
+    return rows
+
+
+def select_fresh_snapshots(snapshots, birth_date, today):
+    """Return ``{cycle_type: (periods, current_period, progress)}`` for the fresh ``snapshots``.
+
+    A snapshot is fresh when it was computed from the profile's current date of
+    birth and today lies inside its period. Progress is recomputed for today.
+    """
+    fresh = {}
+    if not birth_date:
+        return fresh
+    for snapshot in snapshots:
+        if snapshot.cycle_type not in SNAPSHOT_CYCLE_FUNCTIONS or snapshot.source_date != birth_date:
+            continue
+        if snapshot.start_date > today:
+            continue
+        if snapshot.valid_until is not None and snapshot.valid_until <= today:
+            continue
+        periods = [_load_period(p) for p in snapshot.report_data.get('periods', [])]
+        if not 1 <= snapshot.current_period <= len(periods):
+            continue
+        progress = get_cycle_progress(snapshot.cycle_type, birth_date, today)
+        fresh[snapshot.cycle_type] = (periods, periods[snapshot.current_period - 1], progress)
+    return fresh
+
+
+def load_fresh_snapshots(user_profile, today=None):
+    """Return the profile's fresh snapshots (see ``select_fresh_snapshots``)."""
+    from .models import UserCycle
+
+    birth_date = user_profile.date_of_birth
+    if not birth_date or not user_profile.pk:
+        return {}
+    today = _ensure_today(today)
+    snapshots = UserCycle.objects.filter(user_profile=user_profile, source_date=birth_date, start_date__lte=today)
+    return select_fresh_snapshots(snapshots, birth_date, today)
+
+
+async def aload_user_snapshots(user_id, today=None):
+    """Fetch a user's snapshots with the async ORM, without waiting for the profile.
+
+    Pass the result to ``select_fresh_snapshots`` once the profile is known.
+    """
+    from .models import UserCycle
+
+    today = _ensure_today(today)
+    return [s async for s in UserCycle.objects.filter(user_profile__user_id=user_id, start_date__lte=today)]
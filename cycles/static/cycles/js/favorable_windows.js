@@ -0,0 +1,66 @@
+document.addEventListener('DOMContentLoaded', function() {
+  const form = document.getElementById('favorableWindowForm');
+  const results = document.getElementById('favorableWindowResults');
+  if (!form || !results) return;
+
+  function formatMoment(value) {
+    // date-only boundaries (midnight) read better without a time
+    const moment = new Date(value);
+    const options = {year: 'numeric', month: 'short', day: 'numeric'};
+    if (!value.includes('T00:00:00')) {
+      options.hour = '2-digit';
+      options.minute = '2-digit';
+    }
+    return moment.toLocaleString(undefined, options);
+  }
+
+  function showMessage(text) {
+    results.innerHTML = '';
+    const li = document.createElement('li');
+    li.className = 'text-gray-400';
+    li.textContent = text;
+    results.appendChild(li);
+  }
+
+  form.addEventListener('submit', function(event) {
+    event.preventDefault();
+    const constraints = [];
+    form.querySelectorAll('select').forEach(function(select) {
+      if (select.name !== 'business_id' && select.value) {
+        constraints.push(select.name + ':' + select.value);
+      }
+    });
+    if (!constraints.length) {
+      showMessage('Choose at least one period.');
+      return;
+    }
+    const params = new URLSearchParams({constraints: constraints.join(','), limit: '5', days: '1825'});
+    const business = form.querySelector('select[name="business_id"]');
+    if (business) params.set('business_id', business.value);
+
+    showMessage('Searching...');
+    fetch(form.dataset.url + '?' + params.toString())
+      .then(function(resp) { return resp.json().then(function(data) { return {ok: resp.ok, data: data}; }); })
+      .then(function(result) {
+        if (!result.ok) {
+          const messages = {
+            birth_date_missing: 'Set your birth date in your profile first.',
+            business_not_found: 'Add a business first.',
+          };
+          showMessage(messages[result.data.error] || 'Could not search for windows.');
+          return;
+        }
+        if (!result.data.windows.length) {
+          showMessage('No matching window in the next five years.');
+          return;
+        }
+        results.innerHTML = '';
+        result.data.windows.forEach(function(w) {
+          const li = document.createElement('li');
+          li.textContent = formatMoment(w.start) + ' – ' + (w.end ? formatMoment(w.end) : 'onwards');
+          results.appendChild(li);
+        });
+      })
+      .catch(function() { showMessage('Could not search for windows.'); });
+  });
+});
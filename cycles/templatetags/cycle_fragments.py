@@ -0,0 +1,47 @@
+from django import template
+from django.core.cache import cache
+
+from .. import fragments
+
+register = template.Library()
+
+
+class CycleFragmentNode(template.Node):
+    def __init__(self, nodelist, section, version):
+        self.nodelist = nodelist
+        self.section = section
+        self.version = version
+
+    def render(self, context):
+        section = self.section.resolve(context)
+        version = self.version.resolve(context)
+        if not version:
+            return self.nodelist.render(context)
+        request = context.get('request')
+        content = cache.get(version.key)
+        if content is None:
+            fragments.record(section, False, request)
+            content = self.nodelist.render(context)
+            cache.set(version.key, content, version.timeout)
+        else:
+            fragments.record(section, True, request)
+        return content
+
+
+@register.tag('cycle_fragment')
+def do_cycle_fragment(parser, token):
+    """Cache the enclosed block under a ``FragmentVersion`` built by ``fragments.dashboard_fragments``.
+
+    Usage::
+
+        {% cycle_fragment 'yearly' fragments.yearly %} ... {% endcycle_fragment %}
+
+    Without a version (e.g. a context that has no ``fragments``) the block is
+    rendered uncached.
+    """
+    bits = token.split_contents()
+    if len(bits) != 3:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' takes a section name and a fragment version")
+    nodelist = parser.parse(('endcycle_fragment',))
+    parser.delete_first_token()
+    return CycleFragmentNode(nodelist, parser.compile_filter(bits[1]), parser.compile_filter(bits[2]))
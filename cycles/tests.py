@@ -1,6 +1,15 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
-from .utils import get_daily_cycle, get_yearly_cycle, get_business_cycle, get_soul_cycle, get_human_life_cycle
-from datetime import datetime
+import numpy as np
+from . import caching, catalog
+from .batch import compute_cycles_batch
+from .windows import find_favorable_windows, resolve_period
+from .models import CycleTemplate
+from .utils import get_daily_cycle, get_yearly_cycle, get_business_cycle, get_soul_cycle, get_human_life_cycle, get_health_cycle, get_reincarnation_cycle, get_cycle_progress, get_next_transition, daily_boundaries, get_cycle_segments, iter_cycle_segments
+from datetime import datetime, date, time, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
 
 class CycleUtilsTestCase(TestCase):
     def test_get_daily_cycle(self):
@@ -38,3 +47,308 @@ class CycleUtilsTestCase(TestCase):
         self.assertIsNotNone(current_period)
         self.assertGreaterEqual(progress, 0)
         self.assertLessEqual(progress, 100)
+    def test_yearly_cycle_on_birthday_is_first_period(self):
+        birth_date = datetime(1990, 6, 15).date()
+        periods, current_period, progress = get_yearly_cycle(birth_date, today=datetime(2024, 6, 15).date())
+        self.assertIs(current_period, periods[0])
+        self.assertEqual(progress, 0)
+
+    def test_feb_29_birth_date_on_non_leap_year(self):
+        birth_date = datetime(2000, 2, 29).date()
+        today = datetime(2023, 3, 1).date()
+        for fn in (get_yearly_cycle, get_health_cycle, get_human_life_cycle, get_reincarnation_cycle, get_business_cycle):
+            periods, current_period, progress = fn(birth_date, today=today)
+            self.assertIn(current_period, periods)
+        periods, current_period, _ = get_yearly_cycle(birth_date, today=today)
+        self.assertEqual(periods[0]['start_date'], datetime(2023, 2, 28).date())
+
+
+class CycleBatchTestCase(TestCase):
+    SCALAR_FUNCTIONS = {
+        'yearly': get_yearly_cycle,
+        'health': get_health_cycle,
+        'business': get_business_cycle,
+        'human': get_human_life_cycle,
+        'reincarnation': get_reincarnation_cycle,
+    }
+
+    def setUp(self):
+        start = date(1920, 1, 1)
+        self.dates = [start + timedelta(days=offset) for offset in range(0, 36000, 97)]
+        self.dates += [date(2000, 2, 29), date(1990, 6, 15)]
+
+    def test_batch_matches_scalar_functions(self):
+        for as_of in (date(2023, 2, 28), date(2024, 2, 29), date(2024, 6, 15), date(2024, 12, 31)):
+            for cycle_type, fn in self.SCALAR_FUNCTIONS.items():
+                result = compute_cycles_batch(cycle_type, self.dates, as_of)
+                for i, birth_date in enumerate(self.dates):
+                    periods, current_period, progress = fn(birth_date, today=as_of)
+                    index = periods.index(current_period)
+                    self.assertEqual(result.period_index[i], index, (cycle_type, birth_date, as_of))
+                    self.assertAlmostEqual(result.progress[i], progress)
+                    self.assertAlmostEqual(get_cycle_progress(cycle_type, birth_date, as_of), progress)
+                    if cycle_type != 'business' and index + 1 < len(periods):
+                        self.assertEqual(result.next_transition[i], np.datetime64(periods[index + 1]['start_date']))
+
+    def test_next_transition_is_first_day_of_a_new_period(self):
+        as_of = date(2024, 6, 15)
+        for cycle_type in ('yearly', 'health', 'business'):
+            fn = self.SCALAR_FUNCTIONS[cycle_type]
+            result = compute_cycles_batch(cycle_type, self.dates, as_of)
+            for birth_date, index, transition in zip(self.dates, result.period_index, result.next_transition):
+                transition = transition.astype(object)
+                periods, before, _ = fn(birth_date, today=transition - timedelta(days=1))
+                self.assertIs(before, periods[index])
+                periods, after, _ = fn(birth_date, today=transition)
+                self.assertIsNot(after, periods[index])
+
+    def test_missing_dates_and_unsupported_cycle(self):
+        result = compute_cycles_batch('yearly', [None, date(1990, 1, 1)], date(2024, 1, 1))
+        self.assertEqual(result.period_index[0], -1)
+        self.assertTrue(np.isnan(result.progress[0]))
+        self.assertTrue(np.isnat(result.next_transition[0]))
+        self.assertEqual(result.period_index[1], 0)
+        with self.assertRaises(ValueError):
+            compute_cycles_batch('soul', [date(1990, 1, 1)])
+
+
+class TemplateCatalogTestCase(TestCase):
+    def setUp(self):
+        catalog.invalidate()
+        self.addCleanup(catalog.invalidate)
+        CycleTemplate.objects.create(cycle_type='human', period_number=1, description='First', effects={'start_age': 0, 'end_age': 6, 'summary': 'sum'})
+        CycleTemplate.objects.create(cycle_type='yearly', period_number=2, description='Second', effects={'advice': 'go'})
+
+    def test_loads_all_templates_in_one_query(self):
+        with self.assertNumQueries(1):
+            loaded = catalog.get_catalog()
+            self.assertEqual(len(loaded), 2)
+            tpl = loaded.get('human', 1)
+            self.assertEqual(tpl['start_age'], 0)
+            self.assertEqual(tpl['end_age'], 6)
+            self.assertEqual(tpl['advice'], 'sum')
+            self.assertEqual(loaded.get('yearly', 2)['advice'], 'go')
+            self.assertIsNone(loaded.get('yearly', 3))
+            self.assertEqual(loaded.description('yearly', 3), '')
+        with self.assertNumQueries(0):
+            catalog.get_catalog()
+
+    def test_save_and_delete_invalidate(self):
+        before = catalog.get_catalog()
+        tpl = CycleTemplate.objects.create(cycle_type='yearly', period_number=3, description='Third')
+        after_save = catalog.get_catalog()
+        self.assertIsNot(before, after_save)
+        self.assertNotEqual(before.version, after_save.version)
+        self.assertEqual(after_save.description('yearly', 3), 'Third')
+        tpl.delete()
+        self.assertIsNone(catalog.get_catalog().get('yearly', 3))
+        self.assertEqual(catalog.get_catalog().version, before.version)
+
+    def test_entries_are_not_shared_with_callers(self):
+        tpl = catalog.get_template('human', 1)
+        tpl['description'] = 'changed'
+        self.assertEqual(catalog.get_template('human', 1)['description'], 'First')
+
+
+class NextTransitionTestCase(TestCase):
+    def test_daily_transitions(self):
+        self.assertEqual(get_next_transition('daily', now=datetime(2024, 5, 1, 6, 0)), datetime(2024, 5, 1, 9, 26))
+        self.assertEqual(get_next_transition('daily', now=datetime(2024, 5, 1, 12, 51)), datetime(2024, 5, 1, 12, 52))
+        # the seventh period runs until the next 6:00 a.m.
+        self.assertEqual(get_next_transition('daily', now=datetime(2024, 5, 2, 3, 0)), datetime(2024, 5, 2, 6, 0))
+        self.assertEqual(get_next_transition('daily', now=datetime(2024, 5, 1, 5, 59)), datetime(2024, 5, 1, 6, 0))
+
+    def test_dated_transitions_change_the_period(self):
+        functions = dict(CycleBatchTestCase.SCALAR_FUNCTIONS, soul=lambda _source, today: get_soul_cycle(today))
+        today = date(2024, 6, 15)
+        for cycle_type, fn in functions.items():
+            for source in (date(1990, 1, 1), date(2000, 2, 29), date(1961, 8, 30), date(2020, 6, 16)):
+                transition = get_next_transition(cycle_type, source, today)
+                if transition is None:
+                    continue
+                current = fn(source, today=today)[1]['name']
+                self.assertEqual(fn(source, today=transition - timedelta(days=1))[1]['name'], current, (cycle_type, source))
+                self.assertNotEqual(fn(source, today=transition)[1]['name'], current, (cycle_type, source))
+
+    def test_last_human_period_never_ends(self):
+        self.assertIsNone(get_next_transition('human', date(1880, 1, 1), date(2024, 1, 1)))
+
+
+class CycleSegmentsTestCase(TestCase):
+    def test_segments_match_the_scalar_functions_day_by_day(self):
+        functions = dict(CycleBatchTestCase.SCALAR_FUNCTIONS, soul=lambda _source, today: get_soul_cycle(today))
+        start, end = date(2023, 11, 20), date(2026, 2, 10)
+        for cycle_type, fn in functions.items():
+            for source in (date(1990, 1, 1), date(2000, 2, 29), date(1961, 8, 30)):
+                segments = list(iter_cycle_segments(cycle_type, source, start, end))
+                self.assertLessEqual(segments[0].start, start)
+                for previous, segment in zip(segments, segments[1:]):
+                    self.assertEqual(previous.end, segment.start)
+                day = start
+                while day <= end:
+                    segment = next(s for s in segments if s.start <= day and (s.end is None or day < s.end))
+                    periods, current = fn(source, today=day)[:2]
+                    self.assertEqual(periods.index(current) + 1, segment.period, (cycle_type, source, day))
+                    day += timedelta(days=1)
+
+    def test_soul_periods_wrap_over_the_new_year(self):
+        segments = list(iter_cycle_segments('soul', None, date(2024, 12, 31), date(2025, 3, 22)))
+        self.assertEqual(
+            [(s.period, s.start, s.end) for s in segments],
+            [
+                (6, date(2024, 12, 6), date(2025, 1, 26)),
+                (7, date(2025, 1, 26), date(2025, 3, 22)),
+                (1, date(2025, 3, 22), date(2025, 5, 13)),
+            ],
+        )
+        self.assertEqual(list(iter_cycle_segments('soul', None, date(2025, 1, 1), date(2025, 1, 1))), [('soul', 6, date(2024, 12, 6), date(2025, 1, 26))])
+
+    def test_daily_segments_follow_the_timezone(self):
+        segments = list(iter_cycle_segments('daily', None, date(2024, 3, 10), date(2024, 3, 10), tz='America/New_York'))
+        # local midnight falls in period 6 (11:10 p.m. - 2:36 a.m.)
+        self.assertEqual([s.period for s in segments], [6, 7, 1, 2, 3, 4, 5, 6])
+        self.assertEqual(segments[2].start, datetime(2024, 3, 10, 10, 0, tzinfo=dt_timezone.utc))
+        for previous, segment in zip(segments, segments[1:]):
+            self.assertEqual(previous.end, segment.start)
+
+    def test_merged_segments_are_ordered_and_final_periods_are_open(self):
+        segments = get_cycle_segments(date(1880, 1, 1), date(2024, 1, 1), date(2024, 12, 31), cycle_types=('human', 'yearly', 'business'), establishment_date=date(2020, 6, 1))
+        starts = [s.start for s in segments]
+        self.assertEqual(starts, sorted(starts))
+        human = [s for s in segments if s.cycle_type == 'human']
+        self.assertEqual(len(human), 1)
+        self.assertIsNone(human[0].end)
+        self.assertEqual(list(iter_cycle_segments('yearly', None, date(2024, 1, 1), date(2024, 2, 1))), [])
+
+
+class FavorableWindowsTestCase(TestCase):
+    def test_resolve_period_accepts_names_and_numbers(self):
+        self.assertEqual(resolve_period('yearly', 'Action'), 1)
+        self.assertEqual(resolve_period('yearly', 'The Period of Fruition'), 4)
+        self.assertEqual(resolve_period('business', 'fruition'), 4)
+        self.assertEqual(resolve_period('daily', 'active'), 2)
+        self.assertEqual(resolve_period('health', '7'), 7)
+        self.assertIsNone(resolve_period('health', '8'))
+        self.assertIsNone(resolve_period('yearly', 'nap time'))
+        self.assertIsNone(resolve_period('weekly', 1))
+
+    def test_windows_match_a_half_hourly_scan(self):
+        birth, established = date(1990, 3, 15), date(2015, 5, 5)
+        constraints = [('yearly', 1), ('business', 7), ('daily', 2)]
+        start = datetime(2026, 1, 1)
+        found = find_favorable_windows(constraints, birth, established, start=start, horizon_days=400, limit=1000)
+        self.assertTrue(found)
+        moment = start
+        while moment < start + timedelta(days=400):
+            yearly = get_yearly_cycle(birth, today=moment.date())
+            business = get_business_cycle(established, today=moment.date())
+            daily = get_daily_cycle(moment)
+            expected = (
+                yearly[0].index(yearly[1]) == 0
+                and business[0].index(business[1]) == 6
+                and daily[0].index(daily[1]) == 1
+            )
+            self.assertEqual(any(w.start <= moment < w.end for w in found), expected, moment)
+            moment += timedelta(minutes=30)
+
+    def test_limit_horizon_and_open_ended_windows(self):
+        found = find_favorable_windows([('soul', 1), ('daily', 1)], start=date(2026, 1, 1), horizon_days=1826, limit=3, tz='Asia/Tokyo')
+        self.assertEqual(len(found), 3)
+        self.assertEqual(found[0].start, datetime(2026, 3, 22, 6, tzinfo=ZoneInfo('Asia/Tokyo')))
+        self.assertEqual(find_favorable_windows([('yearly', 1), ('yearly', 2)], date(1990, 1, 1), start=date(2026, 1, 1)), [])
+        # the last human period never ends
+        found = find_favorable_windows([('human', 20)], date(1880, 1, 1), start=date(2026, 1, 1))
+        self.assertEqual(len(found), 1)
+        self.assertIsNone(found[0].end)
+        with self.assertRaises(ValueError):
+            find_favorable_windows([('business', 1)], date(1990, 1, 1))
+
+
+class CachedCycleTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        caching.reset_cache_stats()
+
+    def test_hit_after_miss_and_counters(self):
+        now = datetime(2024, 6, 15, 10, 0)
+        first = caching.cached_cycle('yearly', date(1990, 1, 1), now)
+        second = caching.cached_cycle('yearly', date(1990, 1, 1), now)
+        self.assertEqual(first, second)
+        self.assertEqual(second, get_yearly_cycle(date(1990, 1, 1), today=now.date()))
+        caching.cached_cycle('yearly', date(1990, 1, 2), now)
+        stats = caching.cache_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['by_cycle']['yearly'], {'hits': 1, 'misses': 2})
+
+    def test_timeout_is_time_left_until_transition(self):
+        with mock.patch.object(caching.cache, 'set', wraps=caching.cache.set) as cache_set:
+            caching.cached_cycle('daily', now=datetime(2024, 6, 15, 9, 0, 30))
+            caching.cached_cycle('business', date(2020, 1, 1), datetime(2024, 6, 15, 12, 0))
+        daily_key, _, daily_timeout = cache_set.call_args_list[0].args
+        self.assertEqual(daily_timeout, 25 * 60 + 30)
+        business_key, _, business_timeout = cache_set.call_args_list[1].args
+        transition = get_next_transition('business', date(2020, 1, 1), date(2024, 6, 15))
+        self.assertEqual(business_timeout, int((datetime.combine(transition, datetime.min.time()) - datetime(2024, 6, 15, 12, 0)).total_seconds()))
+        self.assertIn('2020-01-01', business_key)
+
+    def test_entries_do_not_outlive_the_year_or_anniversary_their_dates_are_anchored_to(self):
+        # soul: Harmony runs over Jan 1 (and the Harmony dates move on Dec 1) without a transition
+        for before, after in ((date(2024, 12, 20), date(2025, 1, 5)), (date(2024, 11, 30), date(2024, 12, 2))):
+            caching.cached_cycle('soul', now=before)
+            self.assertEqual(caching.cached_cycle('soul', now=after), get_soul_cycle(after))
+        # business: period dates move to the new anniversary, the transition does not change
+        for establishment_date in (date(2015, 1, 1), date(2016, 2, 29), date(2019, 7, 14)):
+            anniversary = date(2025, establishment_date.month, 28 if establishment_date.day == 29 else establishment_date.day)
+            for before, after in ((anniversary - timedelta(days=1), anniversary), (anniversary - timedelta(days=3), anniversary + timedelta(days=2))):
+                caching.cached_cycle('business', establishment_date, before)
+                self.assertEqual(caching.cached_cycle('business', establishment_date, after), get_business_cycle(establishment_date, today=after))
+
+    def test_progress_is_recomputed_on_hit(self):
+        caching.cached_cycle('yearly', date(1990, 1, 1), datetime(2024, 1, 10))
+        _, current, progress = caching.cached_cycle('yearly', date(1990, 1, 1), datetime(2024, 1, 11))
+        self.assertEqual(caching.cache_stats()['hits'], 1)
+        self.assertEqual(progress, get_yearly_cycle(date(1990, 1, 1), today=date(2024, 1, 11))[2])
+
+
+class TimezoneDailyCycleTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_local_six_am_starts_the_day(self):
+        # 06:00 in New York (EDT, UTC-4) is 10:00 UTC
+        periods, current = get_daily_cycle(datetime(2024, 6, 3, 10, 0, tzinfo=dt_timezone.utc), tz='America/New_York')
+        self.assertEqual(current['name'], 'The Morning Period')
+        periods, current = get_daily_cycle(datetime(2024, 6, 3, 9, 59, tzinfo=dt_timezone.utc), tz='America/New_York')
+        self.assertEqual(current['name'], 'The Period of Introspection')
+        # and in Tokyo (UTC+9) 10:00 UTC is 19:00, the Period of Fulfillment
+        self.assertEqual(get_daily_cycle(datetime(2024, 6, 3, 10, 0, tzinfo=dt_timezone.utc), tz='Asia/Tokyo')[1]['name'], 'The Period of Fulfillment')
+
+    def test_boundaries_follow_dst(self):
+        zone = ZoneInfo('Europe/Berlin')
+        # 2024-03-31: clocks go forward at 02:00 local time
+        spring = daily_boundaries('Europe/Berlin', date(2024, 3, 30))
+        self.assertEqual(len(spring), 8)
+        self.assertEqual(list(spring), sorted(spring))
+        self.assertEqual(spring[0].astimezone(zone).time(), time(6, 0))
+        self.assertEqual(spring[7].astimezone(zone), datetime(2024, 3, 31, 6, 0, tzinfo=zone))
+        self.assertEqual(spring[7] - spring[0], timedelta(hours=23))
+        autumn = daily_boundaries('Europe/Berlin', date(2024, 10, 26))
+        self.assertEqual(autumn[7] - autumn[0], timedelta(hours=25))
+        self.assertEqual(autumn[1].astimezone(zone).time(), time(9, 26))
+
+    def test_boundary_tables_are_shared_per_zone_and_date(self):
+        daily_boundaries.cache_clear()
+        for minute in range(0, 600, 7):
+            get_daily_cycle(datetime(2024, 6, 3, 12, 0, tzinfo=dt_timezone.utc) + timedelta(minutes=minute), tz='Europe/Paris')
+        self.assertLessEqual(daily_boundaries.cache_info().currsize, 2)
+
+    def test_next_transition_and_cache_use_the_zone(self):
+        now = datetime(2024, 6, 3, 10, 30, tzinfo=dt_timezone.utc)
+        self.assertEqual(get_next_transition('daily', now=now, tz='America/New_York'), datetime(2024, 6, 3, 13, 26, tzinfo=dt_timezone.utc))
+        self.assertEqual(caching.cached_cycle('daily', now=now, tz='America/New_York')[1]['name'], 'The Morning Period')
+        self.assertEqual(caching.cached_cycle('daily', now=now, tz='Asia/Tokyo')[1]['name'], 'The Period of Fulfillment')
+
+    def test_unknown_zone_falls_back_to_utc(self):
+        now = datetime(2024, 6, 3, 7, 0, tzinfo=dt_timezone.utc)
+        self.assertEqual(get_daily_cycle(now, tz='Not/AZone'), get_daily_cycle(now, tz='UTC'))
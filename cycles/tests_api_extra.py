@@ -1,8 +1,11 @@
 from django.test import TestCase, Client
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from .models import Business
+from .catalog import get_catalog
+from .models import Business, UserProfile
+import datetime
 import json
+import re
 
 
 User = get_user_model()
@@ -41,3 +44,427 @@ class CycleApiExtraTests(TestCase):
         self.assertIn('periods', data)
         self.assertIsInstance(data['periods'], list)
         self.assertIn('current_period', data)
+
+    def test_profile_update_rejects_unknown_timezone(self):
+        url = reverse('profile_update_api')
+        resp = self.client.post(url, {'timezone': 'Mars/Olympus_Mons', 'other_dates': '{}'})
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn('timezone', json.loads(resp.content)['errors'])
+        resp = self.client.post(url, {'timezone': 'Asia/Tokyo', 'other_dates': '{}'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(json.loads(resp.content)['timezone'], 'Asia/Tokyo')
+
+
+class ConditionalCycleApiTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='etag', password='pass')
+        UserProfile.objects.filter(user=self.user).update(date_of_birth=datetime.date(1990, 1, 1), timezone='Europe/Paris')
+        self.client.login(username='etag', password='pass')
+
+    def test_etag_and_max_age_then_304(self):
+        url = reverse('user_cycle_api', args=['yearly'])
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn('ETag', resp.headers)
+        self.assertIn('Last-Modified', resp.headers)
+        self.assertIn('private', resp.headers['Cache-Control'])
+        max_age = int(resp.headers['Cache-Control'].split('max-age=')[1].split(',')[0])
+        self.assertLessEqual(max_age, 24 * 3600)
+
+        again = self.client.get(url, HTTP_IF_NONE_MATCH=resp.headers['ETag'])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b'')
+        self.assertEqual(again.headers['ETag'], resp.headers['ETag'])
+
+    def test_daily_max_age_ends_at_the_next_period(self):
+        resp = self.client.get(reverse('user_cycle_api', args=['daily']))
+        max_age = int(resp.headers['Cache-Control'].split('max-age=')[1].split(',')[0])
+        self.assertLessEqual(max_age, 206 * 60)
+
+    def test_profile_and_template_changes_change_the_etag(self):
+        from . import catalog
+        from .models import CycleTemplate
+        self.addCleanup(catalog.invalidate)
+        url = reverse('user_cycle_api', args=['human'])
+        etag = self.client.get(url).headers['ETag']
+        profile = UserProfile.objects.get(user=self.user)
+        profile.date_of_birth = datetime.date(1980, 5, 5)
+        profile.save()
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        etag = changed.headers['ETag']
+        CycleTemplate.objects.create(cycle_type='human', period_number=7, description='new text')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_last_modified_comes_from_stored_timestamps(self):
+        from django.utils import timezone
+        from django.utils.http import http_date
+        from . import catalog
+        from .conditional import payload_window
+        from .models import CycleTemplate
+        self.addCleanup(catalog.invalidate)
+        long_ago = timezone.make_aware(datetime.datetime(2020, 1, 1))
+        UserProfile.objects.filter(user=self.user).update(updated_at=long_ago)
+        CycleTemplate.objects.update(updated_at=long_ago)
+        catalog.invalidate()
+        url = reverse('user_cycle_api', args=['yearly'])
+        start_of_day = http_date(int(payload_window('yearly')[0].timestamp()))
+        self.assertEqual(self.client.get(url).headers['Last-Modified'], start_of_day)
+        # a reload, as in another worker or after a restart, keeps it
+        catalog.invalidate()
+        self.assertEqual(self.client.get(url).headers['Last-Modified'], start_of_day)
+        template = CycleTemplate.objects.create(cycle_type='yearly', period_number=8, description='new text')
+        self.assertEqual(self.client.get(url).headers['Last-Modified'], http_date(int(template.updated_at.timestamp())))
+
+    def test_business_etag_tracks_business_changes(self):
+        url = reverse('user_cycle_api', args=['business'])
+        etag = self.client.get(url).headers['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        Business.objects.create(user=self.user, name='New Co', establishment_date=datetime.date(2021, 4, 1))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_missing_birth_date_is_not_cached(self):
+        UserProfile.objects.filter(user=self.user).update(date_of_birth=None)
+        resp = self.client.get(reverse('user_cycle_api', args=['yearly']))
+        self.assertEqual(resp.status_code, 400)
+        self.assertNotIn('ETag', resp.headers)
+
+    def test_anonymous_home_is_publicly_cacheable(self):
+        self.client.logout()
+        resp = self.client.get(reverse('home'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn('public', resp.headers['Cache-Control'])
+        self.assertEqual(self.client.get(reverse('home'), HTTP_IF_NONE_MATCH=resp.headers['ETag']).status_code, 304)
+
+
+class BulkCyclesApiTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(username='bulk', password='pass')
+        self.client.login(username='bulk', password='pass')
+        self.url = reverse('bulk_cycles_api')
+
+    def _lines(self, resp):
+        self.assertEqual(resp['Content-Type'], 'application/x-ndjson')
+        return [json.loads(line) for line in b''.join(resp.streaming_content).splitlines()]
+
+    def test_json_body_streams_one_line_per_row_matching_scalar_engine(self):
+        from .utils import get_business_cycle, get_yearly_cycle
+        as_of = datetime.date(2024, 6, 1)
+        body = {
+            'cycle_types': ['yearly', 'business'],
+            'rows': [
+                {'id': 'a', 'birth_date': '1990-03-15', 'establishment_date': '2020-01-01'},
+                {'id': 'b', 'birth_date': '2000-02-29'},
+                'not-a-row',
+            ],
+        }
+        resp = self.client.post(self.url + '?as_of=2024-06-01', json.dumps(body), content_type='application/json')
+        self.assertEqual(resp.status_code, 200)
+        lines = self._lines(resp)
+        self.assertEqual([line['id'] for line in lines], ['a', 'b', 2])
+
+        periods, current, progress = get_yearly_cycle(datetime.date(1990, 3, 15), today=as_of)
+        yearly = lines[0]['cycles']['yearly']
+        self.assertEqual(yearly['name'], current['name'])
+        self.assertEqual(yearly['period'], periods.index(current) + 1)
+        self.assertAlmostEqual(yearly['progress'], progress)
+        _, current, _ = get_business_cycle(datetime.date(2020, 1, 1), today=as_of)
+        self.assertEqual(lines[0]['cycles']['business']['name'], current['name'])
+        self.assertEqual(lines[1]['cycles']['business'], {'error': 'establishment_date_missing'})
+        self.assertEqual(lines[2], {'id': 2, 'error': 'invalid_row'})
+
+    def test_ndjson_body_is_chunked_in_input_order(self):
+        rows = [{'id': i, 'birth_date': f'19{50 + i % 40}-0{1 + i % 9}-1{i % 10}'} for i in range(25)]
+        payload = '\n'.join(json.dumps(r) for r in rows) + '\n'
+        with self.settings(CYCLES_BULK_CHUNK_SIZE=4):
+            resp = self.client.post(self.url + '?types=human,reincarnation', payload, content_type='application/x-ndjson')
+            lines = self._lines(resp)
+        self.assertEqual([line['id'] for line in lines], list(range(25)))
+        self.assertTrue(all(set(line['cycles']) == {'human', 'reincarnation'} for line in lines))
+
+    def test_row_limit_is_reported_in_stream(self):
+        body = {'cycle_types': ['yearly'], 'rows': [{'birth_date': '1990-01-01'}] * 5}
+        with self.settings(CYCLES_BULK_MAX_ROWS=3, CYCLES_BULK_CHUNK_SIZE=2):
+            resp = self.client.post(self.url, json.dumps(body), content_type='application/json')
+            lines = self._lines(resp)
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[-1], {'error': 'too_many_rows', 'max_rows': 3})
+
+    def test_json_bodies_over_the_row_limit_are_refused(self):
+        body = {'cycle_types': ['yearly'], 'rows': [{'birth_date': '1990-01-01'}] * 4}
+        with self.settings(CYCLES_BULK_JSON_MAX_ROWS=4):
+            self.assertEqual(len(self._lines(self.client.post(self.url, json.dumps(body), content_type='application/json'))), 4)
+        with self.settings(CYCLES_BULK_JSON_MAX_ROWS=3):
+            resp = self.client.post(self.url, json.dumps(body), content_type='application/json')
+            self.assertEqual(resp.status_code, 413)
+            self.assertEqual(json.loads(resp.content), {
+                'error': 'too_many_rows', 'max_rows': 3, 'use_content_type': 'application/x-ndjson',
+            })
+            # the same rows as NDJSON are streamed
+            payload = '\n'.join(json.dumps(row) for row in body['rows'])
+            resp = self.client.post(self.url + '?types=yearly', payload, content_type='application/x-ndjson')
+            self.assertEqual(len(self._lines(resp)), 4)
+        with self.settings(DATA_UPLOAD_MAX_MEMORY_SIZE=100):
+            resp = self.client.post(self.url, json.dumps(body), content_type='application/json')
+            self.assertEqual(resp.status_code, 413)
+
+    def test_rejects_bad_requests(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+        resp = self.client.post(self.url, json.dumps({'cycle_types': ['daily'], 'rows': []}), content_type='application/json')
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(json.loads(resp.content)['cycle_types'], ['daily'])
+        resp = self.client.post(self.url, 'nope', content_type='application/json')
+        self.assertEqual(resp.status_code, 400)
+
+
+class CalendarFeedTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='cal', password='pass')
+        UserProfile.objects.filter(user=self.user).update(date_of_birth=datetime.date(1990, 3, 15), calendar_token='tok123')
+        Business.objects.create(user=self.user, name='Acme, Inc.', establishment_date=datetime.date(2020, 1, 1))
+        self.url = reverse('calendar_feed', args=['tok123'])
+
+    def _body(self, resp):
+        return b''.join(resp.streaming_content).decode('utf-8')
+
+    def test_feed_streams_transitions_for_every_cycle(self):
+        from .ical import iter_transitions
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertTrue(resp['Content-Type'].startswith('text/calendar'))
+        body = self._body(resp)
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertTrue(body.endswith('END:VCALENDAR\r\n'))
+        self.assertTrue(all(len(line.encode('utf-8')) <= 75 for line in body.split('\r\n')))
+        today = datetime.date.today()
+        yearly = list(iter_transitions('yearly', datetime.date(1990, 3, 15), today, today + datetime.timedelta(days=365)))
+        self.assertEqual(len(yearly), 7)
+        for day, _, _ in yearly:
+            self.assertIn(f'UID:yearly-{self.user.userprofile.pk}-{day:%Y%m%d}@cycles', body)
+        self.assertIn('SUMMARY:Acme\\, Inc. - Business cycle', body)
+        self.assertEqual(body.count('BEGIN:VEVENT'), body.count('END:VEVENT'))
+        stamps = set(re.findall(r'DTSTAMP:(\d{8}T\d{6})Z', body))
+        self.assertEqual(len(stamps), 1)
+        # the profile was saved after every template
+        updated_at = UserProfile.objects.get(user=self.user).updated_at.astimezone(datetime.timezone.utc)
+        self.assertEqual(stamps.pop(), f'{updated_at:%Y%m%dT%H%M%S}')
+
+    def test_transitions_match_the_cycle_engine(self):
+        from .ical import iter_transitions
+        from .utils import get_business_cycle, get_next_transition, get_soul_cycle, get_yearly_cycle
+        start = datetime.date(2024, 2, 28)
+        end = start + datetime.timedelta(days=800)
+        cases = [
+            ('yearly', datetime.date(1992, 2, 29), get_yearly_cycle),
+            ('business', datetime.date(2019, 7, 14), get_business_cycle),
+            ('soul', None, lambda _, today: get_soul_cycle(today)),
+        ]
+        for cycle_type, source_date, cycle_function in cases:
+            expected, day = [], start
+            while True:
+                day = get_next_transition(cycle_type, source_date, day)
+                if day is None or day > end:
+                    break
+                periods, current = cycle_function(source_date, today=day)[:2]
+                expected.append((day, periods.index(current) + 1, current['name']))
+            self.assertEqual(list(iter_transitions(cycle_type, source_date, start, end)), expected, cycle_type)
+
+    def test_horizon_and_types_options(self):
+        body = self._body(self.client.get(self.url + '?types=soul&days=400'))
+        self.assertIn('Soul cycle', body)
+        self.assertNotIn('Yearly cycle', body)
+        self.assertGreaterEqual(body.count('BEGIN:VEVENT'), 7)
+        self.assertEqual(self.client.get(self.url + '?types=daily').status_code, 400)
+        self.assertEqual(self.client.get(self.url + '?days=0').status_code, 400)
+
+    def test_if_none_match_returns_304_until_dates_change(self):
+        resp = self.client.get(self.url)
+        etag = resp['ETag']
+        self.assertIn('private', resp['Cache-Control'])
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        Business.objects.create(user=self.user, name='Other', establishment_date=datetime.date(2021, 6, 1))
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_body_is_unchanged_while_the_etag_is(self):
+        from django.utils import timezone
+        first = self.client.get(self.url)
+        again = self.client.get(self.url)
+        self.assertEqual(again['ETag'], first['ETag'])
+        self.assertEqual(self._body(again), self._body(first))
+        # a profile edit that moves no date still moves DTSTAMP, and with it the ETag
+        UserProfile.objects.filter(user=self.user).update(updated_at=timezone.now() + datetime.timedelta(minutes=5))
+        changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(self._body(changed), self._body(first))
+
+    def test_unknown_or_reset_token_is_404(self):
+        self.assertEqual(self.client.get(reverse('calendar_feed', args=['nope'])).status_code, 404)
+        self.client.login(username='cal', password='pass')
+        self.client.post(reverse('calendar_token_reset'))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        resp = self.client.get(reverse('edit_profile'))
+        token = UserProfile.objects.get(user=self.user).calendar_token
+        self.assertContains(resp, reverse('calendar_feed', args=[token]))
+
+
+class FavorableWindowsApiTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='windows', password='pass')
+        UserProfile.objects.filter(user=self.user).update(date_of_birth=datetime.date(1990, 3, 15), timezone='Europe/Paris')
+        self.business = Business.objects.create(user=self.user, name='Acme', establishment_date=datetime.date(2015, 5, 5))
+        self.client.login(username='windows', password='pass')
+        self.url = reverse('favorable_windows_api')
+
+    def test_returns_windows_in_the_profile_timezone(self):
+        resp = self.client.get(self.url, {'constraints': 'yearly:action,business:preparation,daily:active', 'limit': '3', 'days': '1825'})
+        self.assertEqual(resp.status_code, 200)
+        data = json.loads(resp.content)
+        self.assertEqual(data['timezone'], 'Europe/Paris')
+        self.assertEqual([c['name'] for c in data['constraints']], ['The Period of Action', 'Preparation', 'The Active Period'])
+        self.assertEqual(len(data['windows']), 3)
+        start = datetime.datetime.fromisoformat(data['windows'][0]['start'])
+        end = datetime.datetime.fromisoformat(data['windows'][0]['end'])
+        self.assertEqual((start.hour, start.minute, end.hour, end.minute), (9, 26, 12, 52))
+
+    def test_rejects_bad_constraints_and_missing_dates(self):
+        resp = self.client.get(self.url, {'constraints': 'yearly:nap,daily:1'})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(json.loads(resp.content)['constraints'], ['yearly:nap'])
+        self.assertEqual(self.client.get(self.url, {'constraints': 'daily:1', 'limit': '0'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'constraints': 'business:1', 'business_id': '999'}).status_code, 404)
+        UserProfile.objects.filter(user=self.user).update(date_of_birth=None)
+        resp = self.client.get(self.url, {'constraints': 'human:1'})
+        self.assertEqual(json.loads(resp.content), {'error': 'birth_date_missing'})
+
+    def test_dashboard_renders_the_widget(self):
+        resp = self.client.get(reverse('dashboard'))
+        self.assertContains(resp, 'id="favorableWindowForm"')
+        self.assertContains(resp, 'The Period of Fruition')
+
+
+class MetricsEndpointTests(TestCase):
+    def setUp(self):
+        from . import metrics
+        metrics.registry.reset()
+        self.user = User.objects.create_user(username='scraped', password='pass', is_staff=True)
+        Business.objects.create(user=self.user, name='Scraped Inc', establishment_date=datetime.date(2019, 6, 1))
+        self.client.login(username='scraped', password='pass')
+
+    def test_exposes_view_and_function_histograms_counters_and_gauges(self):
+        self.client.get(reverse('dashboard'))
+        self.client.get(reverse('user_cycle_api', args=['daily']))
+        resp = self.client.get('/metrics')
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = resp.content.decode()
+        self.assertIn('# TYPE cycles_view_duration_seconds histogram', body)
+        self.assertIn('cycles_view_duration_seconds_count{view="dashboard"} 1', body)
+        self.assertIn('cycles_view_duration_seconds_bucket{view="user_cycle_api",le="+Inf"} 1', body)
+        self.assertRegex(body, r'cycles_view_db_queries_total\{view="dashboard"\} [1-9]')
+        self.assertRegex(body, r'cycles_function_duration_seconds_count\{function="get_daily_cycle"\} [1-9]')
+        self.assertIn('# TYPE cycles_cache_hits_total counter', body)
+        self.assertRegex(body, r'cycles_fragment_cache_(hits|misses)_total\{section="yearly"\} [1-9]')
+        self.assertIn('cycles_profiles 1\n', body)
+        self.assertIn('cycles_profiles_with_birth_date 0\n', body)
+        self.assertIn('cycles_businesses 1\n', body)
+
+    def test_sums_the_totals_of_other_running_processes(self):
+        import os
+        import subprocess
+        import sys
+        import tempfile
+        from . import metrics
+        labels = 'view="dashboard"'
+        other = {
+            'histograms': {'cycles_view_duration_seconds': {labels: [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0.002]}},
+            'counters': {'cycles_view_db_queries_total': {labels: 5}},
+        }
+        with tempfile.TemporaryDirectory() as tmp, self.settings(CYCLES_METRICS_DIR=tmp):
+            exited = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'], capture_output=True)
+            # the parent process of the test runner is running; the child above has exited
+            for pid in (os.getppid(), int(exited.stdout)):
+                with open(os.path.join(tmp, f'metrics-{pid}-1700000000000.json'), 'w') as fh:
+                    json.dump(other, fh)
+            self.client.get(reverse('dashboard'))
+            body = self.client.get('/metrics').content.decode()
+            self.assertEqual(
+                sorted(os.listdir(tmp)),
+                sorted([f'metrics-{os.getppid()}-1700000000000.json', metrics._file_name()]),
+            )
+        self.assertIn('cycles_view_duration_seconds_count{view="dashboard"} 2', body)
+        self.assertIn('cycles_view_duration_seconds_bucket{view="dashboard",le="0.005"} 1', body)
+        self.assertRegex(body, r'cycles_view_db_queries_total\{view="dashboard"\} ([6-9]|\d\d)')
+        merged = metrics.merge([other, other])
+        self.assertEqual(merged['counters']['cycles_view_db_queries_total'][labels], 10)
+
+    def test_only_staff_can_read_it_without_a_token(self):
+        self.client.logout()
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        User.objects.create_user(username='visitor', password='pass')
+        self.client.login(username='visitor', password='pass')
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer ').status_code, 401)
+
+    def test_token_is_required_when_configured(self):
+        self.client.logout()
+        with self.settings(CYCLES_METRICS_TOKEN='s3cret'):
+            self.assertEqual(self.client.get('/metrics').status_code, 401)
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret').status_code, 200)
+
+
+class BusinessPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='agency', password='pass')
+        for i in range(7):
+            Business.objects.create(
+                user=self.user, name=f'Client {i % 3}', establishment_date=datetime.date(2010, 1, 1) + datetime.timedelta(days=53 * i),
+            )
+        self.client.login(username='agency', password='pass')
+        self.url = reverse('user_cycle_api', args=['business'])
+        get_catalog()
+
+    def _walk(self, **params):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        ids, cursor, query_counts = [], None, set()
+        while True:
+            query = dict(params, limit=3, **({'cursor': cursor} if cursor else {}))
+            with CaptureQueriesContext(connection) as queries:
+                data = json.loads(self.client.get(self.url, query).content)
+            query_counts.add(len(queries))
+            ids += [item['business']['id'] for item in data['business_cycles']]
+            cursor = data['next']
+            if cursor is None:
+                # every page costs the same, wherever it is in the list
+                self.assertEqual(len(query_counts), 1)
+                return ids
+
+    def test_cursor_walks_every_order_without_gaps_or_repeats(self):
+        for order in (None, 'name', 'next_transition', 'period'):
+            params = {'order': order} if order else {}
+            expected = list(self.user.business_set.by_cycle(order=order).values_list('pk', flat=True))
+            self.assertEqual(self._walk(**params), expected, order)
+
+    def test_invalid_cursor_and_limit_are_rejected(self):
+        first = json.loads(self.client.get(self.url, {'limit': 2, 'order': 'name'}).content)
+        self.assertEqual(len(first['business_cycles']), 2)
+        for query, error in [
+            ({'cursor': 'not-a-cursor'}, 'invalid_cursor'),
+            ({'cursor': first['next']}, 'invalid_cursor'),  # issued for order=name
+            ({'limit': '0'}, 'invalid_limit'),
+            ({'limit': '1000'}, 'invalid_limit'),
+        ]:
+            resp = self.client.get(self.url, query)
+            self.assertEqual((resp.status_code, json.loads(resp.content)), (400, {'error': error}))
+
+    def test_business_list_links_to_the_next_page(self):
+        resp = self.client.get(reverse('business_list'), {'limit': 5, 'order': 'name'})
+        self.assertEqual(len(resp.context['businesses']), 5)
+        self.assertIn('order=name', resp.context['next_url'])
+        resp = self.client.get(reverse('business_list') + resp.context['next_url'])
+        self.assertEqual(len(resp.context['businesses']), 2)
+        self.assertIsNone(resp.context['next_url'])
+        self.assertEqual(resp.context['first_url'], '?limit=5&order=name')
+        self.assertEqual(self.client.get(reverse('business_list'), {'cursor': 'x'}).status_code, 400)
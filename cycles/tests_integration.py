@@ -1,4 +1,5 @@
-from django.test import TestCase, RequestFactory
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, RequestFactory, override_settings
+from django.http import JsonResponse
 from django.contrib.auth.models import User
 from .views import user_cycle_api
 
@@ -100,3 +101,869 @@ class UserCycleIntegrationTests(TestCase):
         self.assertIn('description', tpl)
         self.assertIn('effects', tpl)
         self.assertIn('advice', tpl)
+
+    def test_dashboard_query_count_does_not_grow_with_templates_or_businesses(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .models import CycleTemplate
+        from . import catalog
+        self.addCleanup(catalog.invalidate)
+        for cycle_type in ('yearly', 'soul', 'health', 'reincarnation', 'business'):
+            for number in range(1, 8):
+                CycleTemplate.objects.create(cycle_type=cycle_type, period_number=number, description=f'{cycle_type} {number}')
+        self.client.login(username='inttest', password='pass')
+        Business.objects.create(user=self.user, name='BizA', establishment_date=datetime.date(2020, 1, 1))
+        self.client.get('/dashboard/')
+        with CaptureQueriesContext(connection) as one_business:
+            self.client.get('/dashboard/')
+        for i in range(5):
+            Business.objects.create(user=self.user, name=f'Biz{i}', establishment_date=datetime.date(2019, 3, i + 1))
+        with CaptureQueriesContext(connection) as many_businesses:
+            resp = self.client.get('/dashboard/')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(one_business), len(many_businesses))
+        self.assertIn('yearly 1', resp.content.decode('utf-8'))
+
+
+class MaterializeUserCyclesTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username='snap', password='pass')
+        self.profile, _ = UserProfile.objects.get_or_create(user=self.user)
+        self.profile.date_of_birth = datetime.date(1990, 1, 1)
+        self.profile.save()
+        other = User.objects.create_user(username='snap2', password='pass')
+        UserProfile.objects.filter(user=other).update(date_of_birth=datetime.date(1985, 7, 20))
+
+    def _materialize(self, as_of, workers=1):
+        from io import StringIO
+        from django.core.management import call_command
+        out = StringIO()
+        call_command('materialize_user_cycles', workers=workers, chunk_size=1, as_of=as_of, stdout=out)
+        return out.getvalue()
+
+    def test_first_run_writes_every_row_and_rerun_writes_none(self):
+        from .models import UserCycle
+        self.assertIn('8 rows written', self._materialize('2024-01-10'))
+        self.assertEqual(UserCycle.objects.count(), 8)
+        yearly = UserCycle.objects.get(user_profile=self.profile, cycle_type='yearly')
+        self.assertEqual(yearly.current_period, 1)
+        self.assertEqual(yearly.valid_until, datetime.date(2024, 2, 22))
+        self.assertIn('0 rows written', self._materialize('2024-01-11'))
+
+    def test_later_run_rewrites_only_changed_periods(self):
+        from .models import UserCycle
+        self._materialize('2024-02-21')
+        # 1990-01-01 enters yearly/health period 2; 1985-07-20 does not change
+        self.assertIn('2 rows written', self._materialize('2024-02-22'))
+        self.assertEqual(UserCycle.objects.get(user_profile=self.profile, cycle_type='health').current_period, 2)
+
+    def test_process_pool_matches_inline(self):
+        from .models import UserCycle
+        self._materialize('2024-05-01', workers=2)
+        self.assertEqual(UserCycle.objects.count(), 8)
+        self.assertIn('0 rows written', self._materialize('2024-05-01'))
+
+    def test_api_reads_fresh_snapshot_and_ignores_stale_one(self):
+        from .models import UserCycle
+        from .utils import get_yearly_cycle
+        self._materialize(datetime.date.today().isoformat())
+        UserCycle.objects.filter(user_profile=self.profile, cycle_type='yearly').update(report_data={'periods': [{'name': 'From snapshot'}], 'current_period_number': 1}, current_period=1)
+        request = self.factory.get('/api/user_cycle/yearly/')
+        request.user = self.user
+        data = json.loads(user_cycle_api(request, 'yearly').content)
+        self.assertEqual(data['current_period']['name'], 'From snapshot')
+
+        # a changed birth date makes the snapshot stale
+        self.profile.date_of_birth = datetime.date(1991, 3, 3)
+        self.profile.save()
+        data = json.loads(user_cycle_api(request, 'yearly').content)
+        self.assertEqual(data['current_period']['name'], get_yearly_cycle(self.profile.date_of_birth)[1]['name'])
+
+
+class UserCyclesCombinedApiTests(TestCase):
+    def setUp(self):
+        from . import catalog
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username='combined', password='pass')
+        UserProfile.objects.filter(user=self.user).update(date_of_birth=datetime.date(1990, 1, 1))
+        Business.objects.create(user=self.user, name='One', establishment_date=datetime.date(2020, 1, 1))
+        catalog.get_catalog()
+
+    def _get(self, query=''):
+        from .views import user_cycles_api
+        request = self.factory.get('/api/user_cycles/' + query)
+        request.user = self.user
+        return user_cycles_api(request)
+
+    def test_returns_every_requested_cycle_and_businesses(self):
+        response = self._get('?types=human,yearly,health,daily,soul,reincarnation&include=businesses')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(set(data['cycles']), {'human', 'yearly', 'health', 'daily', 'soul', 'reincarnation'})
+        for payload in data['cycles'].values():
+            self.assertIn('current_period_number', payload)
+            self.assertIn('template', payload)
+        self.assertEqual(data['business_cycles'][0]['business']['name'], 'One')
+
+        single = json.loads(user_cycle_api(self._request('/api/user_cycle/yearly/'), 'yearly').content)
+        self.assertEqual(data['cycles']['yearly'], single)
+
+    def _request(self, path):
+        request = self.factory.get(path)
+        request.user = self.user
+        return request
+
+    def test_query_count_is_fixed(self):
+        with self.assertNumQueries(3):
+            self._get('?include=businesses')
+        for i in range(10):
+            Business.objects.create(user=self.user, name=f'Biz{i}', establishment_date=datetime.date(2018, 1, i + 1))
+        with self.assertNumQueries(3):
+            data = json.loads(self._get('?include=businesses').content)
+        self.assertEqual(len(data['business_cycles']), 11)
+
+    def test_businesses_are_paged(self):
+        from .pagination import DEFAULT_LIMIT
+        Business.objects.bulk_create([
+            Business(user=self.user, name=f'Biz{i:03d}', establishment_date=datetime.date(2000, 1, 1) + datetime.timedelta(days=i))
+            for i in range(DEFAULT_LIMIT + 20)
+        ])
+        data = json.loads(self._get('?types=yearly&include=businesses').content)
+        self.assertEqual(len(data['business_cycles']), DEFAULT_LIMIT)
+        self.assertTrue(data['business_cycles_next'])
+
+        names, cursor = [], None
+        while True:
+            query = '?types=business&order=name&limit=30' + (f'&cursor={cursor}' if cursor else '')
+            with self.assertNumQueries(2):
+                data = json.loads(self._get(query).content)
+            names += [item['business']['name'] for item in data['business_cycles']]
+            cursor = data['business_cycles_next']
+            if cursor is None:
+                break
+        self.assertEqual(names, sorted(self.user.business_set.values_list('name', flat=True)))
+        self.assertEqual(json.loads(self._get('?include=businesses&limit=0').content), {'error': 'invalid_limit'})
+
+    def test_defaults_unsupported_and_missing_birth_date(self):
+        data = json.loads(self._get().content)
+        self.assertNotIn('business_cycles', data)
+        self.assertEqual(len(data['cycles']), 6)
+        self.assertEqual(self._get('?types=yearly,planetary').status_code, 400)
+        UserProfile.objects.filter(user=self.user).update(date_of_birth=None)
+        data = json.loads(self._get('?types=yearly,daily').content)
+        self.assertEqual(data['cycles']['yearly'], {'error': 'birth_date_missing'})
+        self.assertIn('periods', data['cycles']['daily'])
+
+
+class BusinessPeriodQueryTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username='agency', password='pass')
+        start = datetime.date(2010, 1, 1)
+        Business.objects.bulk_create([
+            Business(
+                user=self.user,
+                name=f'Biz{i:03d}',
+                establishment_date=start + datetime.timedelta(days=i * 7),
+            )
+            for i in range(120)
+        ])
+
+    def test_period_filter_and_position_match_the_scalar_engine(self):
+        from .utils import get_business_cycle, get_next_transition
+        for today in (datetime.date(2024, 1, 1), datetime.date(2024, 2, 29), datetime.date(2025, 12, 31)):
+            expected = {}
+            for business in Business.objects.all():
+                periods, current, _ = get_business_cycle(business.establishment_date, today=today)
+                expected[business.pk] = periods.index(current) + 1
+            for number in range(1, 8):
+                matched = set(Business.objects.in_business_period(number, today).values_list('pk', flat=True))
+                self.assertEqual(matched, {pk for pk, n in expected.items() if n == number}, (today, number))
+            for business in Business.objects.with_cycle_position(today):
+                transition = get_next_transition('business', business.establishment_date, today)
+                self.assertEqual(business.days_until_transition, (transition - today).days)
+
+    def test_save_keeps_the_anchor_in_sync(self):
+        business = Business.objects.create(user=self.user, name='Late', establishment_date=datetime.date(2021, 6, 1))
+        self.assertEqual(business.cycle_anchor, datetime.date(2021, 6, 1).toordinal() % 365)
+        business.establishment_date = datetime.date(2021, 6, 2)
+        business.save(update_fields=['establishment_date'])
+        business.refresh_from_db()
+        self.assertEqual(business.cycle_anchor, datetime.date(2021, 6, 2).toordinal() % 365)
+
+    def test_bulk_writes_keep_the_anchor_in_sync(self):
+        from django.db.models import F
+
+        def assert_in_sync():
+            for business in Business.objects.all():
+                self.assertEqual(business.cycle_anchor, business.establishment_date.toordinal() % 365, business.name)
+
+        assert_in_sync()
+        Business.objects.filter(name__lt='Biz010').update(establishment_date=datetime.date(2022, 3, 4))
+        assert_in_sync()
+        Business.objects.filter(name__gte='Biz100').update(establishment_date=F('establishment_date') + datetime.timedelta(days=3))
+        assert_in_sync()
+        moved = list(Business.objects.filter(name__startswith='Biz05'))
+        for business in moved:
+            business.establishment_date = '2023-12-31'
+        Business.objects.bulk_update(moved, ['establishment_date'])
+        assert_in_sync()
+
+    def test_api_filters_and_sorts_in_the_database(self):
+        request = self.factory.get('/api/user_cycle/business/?period=Fruition&order=next_transition')
+        request.user = self.user
+        data = json.loads(user_cycle_api(request, 'business').content)
+        self.assertTrue(data['business_cycles'])
+        self.assertTrue(all(item['current_period']['name'] == 'Fruition' for item in data['business_cycles']))
+        ends = [item['current_period']['end_date'] for item in data['business_cycles']]
+        self.assertEqual(ends, sorted(ends))
+
+        for query in ('?period=Lunch', '?order=age'):
+            request = self.factory.get('/api/user_cycle/business/' + query)
+            request.user = self.user
+            self.assertEqual(user_cycle_api(request, 'business').status_code, 400)
+
+
+class BirthdayCohortQueryTests(TestCase):
+    BIRTH_DATES = [
+        datetime.date(1992, 2, 29), datetime.date(2000, 2, 29), datetime.date(1990, 2, 28),
+        datetime.date(1985, 3, 1), datetime.date(1970, 1, 1), datetime.date(1999, 12, 31),
+        datetime.date(2024, 2, 29), datetime.date(2030, 2, 28),
+    ] + [datetime.date(1980, 1, 1) + datetime.timedelta(days=37 * i) for i in range(24)]
+
+    def setUp(self):
+        for i, birth_date in enumerate(self.BIRTH_DATES):
+            profile = User.objects.create_user(username=f'born{i}').userprofile
+            profile.date_of_birth = birth_date
+            profile.save()
+
+    def test_cohorts_match_the_scalar_engine_around_leap_days(self):
+        from .utils import CYCLE_DAY_BOUNDS, get_health_cycle, get_yearly_cycle
+        days = []
+        for year in (2023, 2024, 2025):
+            for start_day, _ in CYCLE_DAY_BOUNDS:
+                for anchor in (datetime.date(year, 2, 27), datetime.date(year, 2, 28), datetime.date(year, 3, 1)):
+                    days.append(anchor + datetime.timedelta(days=start_day - 1))
+        days.append(datetime.date(2024, 2, 29))
+        profiles = list(UserProfile.objects.all())
+        for cycle_type, engine in (('yearly', get_yearly_cycle), ('health', get_health_cycle)):
+            for today in days:
+                for number in range(1, 8):
+                    # the engine also projects cycles for people not born yet; the query leaves them out
+                    expected = {
+                        p.pk for p in profiles
+                        if p.date_of_birth <= today and engine(p.date_of_birth, today=today)[0][number - 1]['start_date'] == today
+                    }
+                    matched = set(UserProfile.objects.entering_period(cycle_type, number, today).values_list('pk', flat=True))
+                    self.assertEqual(matched, expected, (cycle_type, today, number))
+        # Feb 29 births start their year on Feb 28 in common years and on Feb 29 in leap years
+        leap_born = {p.pk: p.date_of_birth.year for p in profiles if (p.date_of_birth.month, p.date_of_birth.day) == (2, 29)}
+        common_year = set(UserProfile.objects.entering_period('yearly', 1, datetime.date(2023, 2, 28)).values_list('pk', flat=True))
+        leap_year = set(UserProfile.objects.entering_period('yearly', 'action', datetime.date(2024, 2, 29)).values_list('pk', flat=True))
+        self.assertEqual({pk for pk, year in leap_born.items() if year < 2023}, common_year & set(leap_born))
+        self.assertEqual(set(leap_born), leap_year)
+
+    def test_lookup_is_an_index_range_scan_and_save_keeps_the_key_in_sync(self):
+        queryset = UserProfile.objects.entering_period('health', 3, datetime.date(2024, 6, 1))
+        self.assertIn('profile_birthday_cohort', queryset.explain())
+        profile = UserProfile.objects.get(date_of_birth=datetime.date(1985, 3, 1))
+        self.assertEqual(profile.birth_month_day, 301)
+        profile.date_of_birth = datetime.date(1985, 11, 9)
+        profile.save(update_fields=['date_of_birth'])
+        profile.refresh_from_db()
+        self.assertEqual(profile.birth_month_day, 1109)
+        for cycle_type, period in (('human', 1), ('yearly', 'Lunch'), ('yearly', 8)):
+            with self.assertRaises(ValueError):
+                UserProfile.objects.entering_period(cycle_type, period)
+
+
+class PeriodDigestTests(TestCase):
+    DAY = datetime.date(2026, 6, 1)
+
+    def setUp(self):
+        from . import catalog
+        from .models import CycleTemplate
+        CycleTemplate.objects.create(cycle_type='yearly', period_number=1, description='Start something new.')
+        CycleTemplate.objects.create(cycle_type='business', period_number=2, description='Build on what you started.')
+        catalog.invalidate()
+        self.addCleanup(catalog.invalidate)
+
+        def person(name, birth_date=None, email=True, tz='UTC'):
+            user = User.objects.create_user(username=name, email=f'{name}@example.com' if email else '')
+            profile = user.userprofile
+            profile.date_of_birth = birth_date
+            profile.timezone = tz
+            profile.save()
+            return user
+
+        self.birthday = person('birthday', datetime.date(1990, 6, 1))  # yearly/health 1, reincarnation 4
+        self.second = person('second', datetime.date(1985, 4, 10), tz='Asia/Tokyo')  # day 53: yearly/health 2
+        self.owner = person('owner', datetime.date(1990, 1, 15))
+        Business.objects.create(user=self.owner, name='Acme', establishment_date=self.DAY - datetime.timedelta(days=52))
+        Business.objects.create(user=self.owner, name='Quiet', establishment_date=datetime.date(2020, 1, 3))
+        person('noemail', datetime.date(1990, 6, 1), email=False)
+        person('unchanged', datetime.date(1990, 1, 15))
+        person('unborn', datetime.date(2027, 6, 1))
+
+    def _send(self, *args):
+        from io import StringIO
+        from django.core.management import call_command
+        out = StringIO()
+        call_command('send_period_digests', *args, stdout=out)
+        return out.getvalue()
+
+    def test_daily_run_sends_one_digest_per_affected_user(self):
+        from django.core import mail
+        out = self._send('--all-timezones', '--date', self.DAY.isoformat(), '--chunk-size', '1', '--batch-size', '2')
+        self.assertIn('Sent 3 digests', out)
+        by_user = {message.to[0]: message for message in mail.outbox}
+        self.assertEqual(set(by_user), {'birthday@example.com', 'second@example.com', 'owner@example.com'})
+
+        body = by_user['birthday@example.com'].body
+        self.assertIn('Yearly cycle: The Period of Action\n', body)
+        self.assertIn('Start something new.', body)
+        self.assertIn('Health cycle: Period 1', body)
+        self.assertIn('Reincarnation cycle: Cycle 4 (Ages 36-47)', body)
+        self.assertIn('06:00  ', body)
+        self.assertEqual(by_user['birthday@example.com'].subject, '3 new periods start today (June 1)')
+
+        owner = by_user['owner@example.com']
+        self.assertEqual(owner.subject, 'Stabilization for Acme starts today (June 1)')
+        self.assertIn('Build on what you started.', owner.body)
+        self.assertNotIn('Quiet', owner.body)
+        # the Tokyo timetable is in local time
+        self.assertIn('The Period of Stabilization', by_user['second@example.com'].body)
+
+    def test_messages_go_out_in_batches_over_one_connection(self):
+        from django.core.mail.backends.locmem import EmailBackend
+        from .digests import iter_digests, send_digests
+
+        class CountingBackend(EmailBackend):
+            opened = batches = 0
+
+            def open(self):
+                CountingBackend.opened += 1
+
+            def send_messages(self, messages):
+                CountingBackend.batches += 1
+                return super().send_messages(messages)
+
+        self.assertEqual(send_digests(iter_digests(self.DAY, chunk_size=2), batch_size=2, connection=CountingBackend()), 3)
+        self.assertEqual((CountingBackend.opened, CountingBackend.batches), (1, 2))
+
+    def test_hourly_run_covers_the_zones_at_the_digest_hour(self):
+        from django.core import mail
+        from .digests import zones_at_hour
+        # 21:00 UTC on May 31 is 6:00 a.m. on June 1 in Tokyo
+        at = datetime.datetime(2026, 5, 31, 21, 30, tzinfo=datetime.timezone.utc)
+        self.assertIn('Asia/Tokyo', zones_at_hour(at, 6)[self.DAY])
+        self._send('--at', at.isoformat())
+        self.assertEqual([message.to for message in mail.outbox], [['second@example.com']])
+        self.assertIn('06:00  The Morning Period', mail.outbox[0].body)
+
+        mail.outbox = []
+        self._send('--at', '2026-06-01T06:10:00')
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['birthday@example.com', 'owner@example.com'])
+
+    def test_soul_period_start_reaches_everyone_and_dry_run_sends_nothing(self):
+        from django.core import mail
+        from django.core.management import CommandError
+        out = self._send('--all-timezones', '--date', '2026-05-13', '--dry-run')
+        # a new soul period starts on May 13 for everyone with an email address
+        self.assertIn('Rendered 5 digests', out)
+        self.assertEqual(mail.outbox, [])
+        with self.assertRaises(CommandError):
+            self._send('--date', '2026-05-13')
+
+
+class AsyncViewsTests(TestCase):
+    def setUp(self):
+        from django.test import AsyncRequestFactory
+        from . import catalog
+        catalog.invalidate()
+        self.factory = RequestFactory()
+        self.async_factory = AsyncRequestFactory()
+        self.user = User.objects.create_user(username='async', password='pass')
+        UserProfile.objects.filter(user=self.user).update(date_of_birth=datetime.date(1990, 1, 1), timezone='Asia/Tokyo')
+        Business.objects.create(user=self.user, name='One', establishment_date=datetime.date(2020, 1, 1))
+        Business.objects.create(user=self.user, name='Two', establishment_date=datetime.date(2021, 7, 1))
+
+    def _async_request(self, path, user=None):
+        request = self.async_factory.get(path)
+        request.user = user or self.user
+        return request
+
+    def _sync_request(self, path):
+        request = self.factory.get(path)
+        request.user = self.user
+        return request
+
+    async def test_user_cycle_api_matches_the_sync_view(self):
+        from asgiref.sync import sync_to_async
+        from . import async_views
+        for cycle_type, query in (('yearly', ''), ('daily', ''), ('soul', ''), ('human', ''), ('business', ''), ('business', '?order=name'), ('planetary', '')):
+            path = f'/api/user_cycle/{cycle_type}/{query}'
+            response = await async_views.user_cycle_api(self._async_request(path), cycle_type)
+            expected = await sync_to_async(user_cycle_api)(self._sync_request(path), cycle_type)
+            self.assertEqual(response.status_code, expected.status_code, cycle_type)
+            self.assertEqual(json.loads(response.content), json.loads(expected.content), cycle_type)
+            self.assertEqual(response.get('ETag'), expected.get('ETag'), cycle_type)
+
+    async def test_user_cycle_api_conditional_get_and_login(self):
+        from django.contrib.auth.models import AnonymousUser
+        from . import async_views
+        response = await async_views.user_cycle_api(self._async_request('/api/user_cycle/yearly/'), 'yearly')
+        request = self.async_factory.get('/api/user_cycle/yearly/', headers={'If-None-Match': response['ETag']})
+        request.user = self.user
+        self.assertEqual((await async_views.user_cycle_api(request, 'yearly')).status_code, 304)
+        anonymous = await async_views.user_cycle_api(self._async_request('/api/user_cycle/yearly/', AnonymousUser()), 'yearly')
+        self.assertEqual(anonymous.status_code, 302)
+
+    async def test_dashboard_and_home(self):
+        from django.contrib.auth.models import AnonymousUser
+        from . import async_views
+        request = self._async_request('/dashboard/?period=1')
+        request.session = {}
+        response = await async_views.dashboard(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'id="favorableWindowForm"')
+        home = await async_views.home(self._async_request('/', AnonymousUser()))
+        self.assertEqual(home.status_code, 200)
+        self.assertIn('public', home['Cache-Control'])
+        self.assertEqual((await async_views.home(self._async_request('/'))).status_code, 302)
+
+    async def test_cache_is_never_used_on_the_event_loop(self):
+        import asyncio
+        from unittest import mock
+        from django.contrib.auth.models import AnonymousUser
+        from django.core.cache import cache
+        from . import async_views
+        on_loop = []
+
+        def note(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return mock.DEFAULT
+            on_loop.append(args[:1])
+            return mock.DEFAULT
+
+        with mock.patch.object(cache, 'get', side_effect=note, wraps=cache.get), \
+                mock.patch.object(cache, 'set', side_effect=note, wraps=cache.set):
+            request = self._async_request('/dashboard/')
+            request.session = {}
+            await async_views.dashboard(request)
+            await async_views.home(self._async_request('/', AnonymousUser()))
+            for cycle_type in ('yearly', 'soul', 'business'):
+                await async_views.user_cycle_api(self._async_request(f'/api/user_cycle/{cycle_type}/'), cycle_type)
+            self.assertTrue(cache.get.called)
+        self.assertEqual(on_loop, [])
+
+
+class DashboardFragmentCacheTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from . import fragments
+        cache.clear()
+        fragments.reset_fragment_stats()
+        self.user = User.objects.create_user(username='fragments', password='pass')
+        profile = UserProfile.objects.get(user=self.user)
+        profile.date_of_birth = datetime.date(1990, 5, 17)
+        profile.save()
+        Business.objects.create(user=self.user, name='FragBiz', establishment_date=datetime.date(2015, 3, 1))
+        self.client.login(username='fragments', password='pass')
+
+    def test_second_render_is_served_from_the_fragment_cache(self):
+        from . import fragments
+        first = self.client.get('/dashboard/')
+        self.assertEqual(first['X-Fragment-Cache'], 'hits=0 misses=7')
+        second = self.client.get('/dashboard/')
+        self.assertEqual(second['X-Fragment-Cache'], 'hits=7 misses=0')
+        # forms and CSRF tokens stay outside the cached sections
+        self.assertContains(second, 'csrfmiddlewaretoken')
+        self.assertContains(second, 'FragBiz')
+        self.assertEqual(fragments.fragment_cache_stats()['hit_rate'], 0.5)
+        self.assertEqual(fragments.fragment_cache_stats()['by_section']['yearly'], {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+    def test_only_the_changed_section_is_rerendered(self):
+        from .fragments import dashboard_fragments
+        from .snapshots import load_fresh_snapshots
+        from .views import _dashboard_context
+        from .catalog import get_catalog
+        profile = UserProfile.objects.get(user=self.user)
+        context = _dashboard_context(profile, load_fresh_snapshots(profile), self.user.business_set.all(), get_catalog())
+        before = context['fragments']
+        Business.objects.update(name='Renamed')
+        context = _dashboard_context(profile, load_fresh_snapshots(profile), self.user.business_set.all(), get_catalog())
+        after = context['fragments']
+        self.assertNotEqual(before['business'].key, after['business'].key)
+        for section in ('daily', 'yearly', 'soul', 'health', 'reincarnation', 'human'):
+            self.assertEqual(before[section].key, after[section].key)
+        # a different catalog version invalidates the sections that show descriptions
+        bumped = dashboard_fragments(context, 'other-version')
+        self.assertNotEqual(bumped['yearly'].key, after['yearly'].key)
+        self.assertEqual(bumped['daily'].key, after['daily'].key)
+        self.assertTrue(all(version.timeout >= 1 for version in after.values()))
+
+
+class BenchCommandTests(TestCase):
+    def test_bench_reports_views_and_fails_on_regressions(self):
+        import os
+        import tempfile
+        from django.core.management import call_command, CommandError
+        from io import StringIO
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            results = os.path.join(tmp, 'bench.json')
+            call_command('bench', '--skip-functions', '--businesses', '0,3', '--requests', '2', '--output', results, stderr=out)
+            with open(results) as fh:
+                metrics = json.load(fh)['metrics']
+            self.assertEqual(metrics['views.dashboard.b0.queries'], metrics['views.dashboard.b3.queries'])
+            self.assertIn('views.user_cycle_api.business.b3.p99_ms', metrics)
+            self.assertIn('templates.dashboard.b3.uncached_ms', metrics)
+            # nothing the benchmark created is left behind
+            self.assertFalse(User.objects.filter(username='__cycles_bench__').exists())
+
+            baseline = os.path.join(tmp, 'baseline.json')
+            with open(baseline, 'w') as fh:
+                json.dump({'metrics': dict(metrics, **{'views.dashboard.b0.queries': 1})}, fh)
+            with self.assertRaises(CommandError):
+                call_command('bench', '--skip-functions', '--businesses', '0', '--requests', '1',
+                             '--output', results, '--baseline', baseline, stderr=out)
+        self.assertIn('regressed views.dashboard.b0.queries', out.getvalue())
+
+    def test_compare_uses_the_threshold_for_timings_only(self):
+        from .bench import compare
+        baseline = {'views.dashboard.b0.p50_ms': 10.0, 'views.dashboard.b0.queries': 5, 'functions.get_zone.per_call_us': 1.0}
+        current = {'views.dashboard.b0.p50_ms': 11.5, 'views.dashboard.b0.queries': 6, 'functions.get_zone.per_call_us': 0.5, 'new.metric_ms': 1}
+        regressions, improvements = compare(current, baseline, threshold=0.2)
+        self.assertEqual(regressions, [('views.dashboard.b0.queries', 5, 6)])
+        self.assertEqual(improvements, [('functions.get_zone.per_call_us', 1.0, 0.5)])
+
+
+class ServerTimingTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username='timed', password='pass')
+        self.client.login(username='timed', password='pass')
+
+    def test_header_and_log_report_queries_engine_and_templates(self):
+        with self.assertLogs('cycles.timing', 'INFO') as logs:
+            response = self.client.get('/dashboard/')
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertRegex(timing, r'cycles;dur=[\d.]+, tpl;dur=[\d.]+, total;dur=[\d.]+')
+        self.assertNotIn('tpl;dur=0.0', timing)
+        record = logs.records[-1]
+        self.assertEqual(record.timings['view'], 'dashboard')
+        self.assertEqual(record.timings['status'], 200)
+        self.assertGreater(record.timings['db_queries'], 0)
+        self.assertIn('path=/dashboard/', record.getMessage())
+
+    def test_query_budget_fails_in_strict_mode_and_logs_otherwise(self):
+        from .timing import QueryBudgetExceeded, query_budget
+
+        @query_budget(1)
+        def greedy(request):
+            list(User.objects.all())
+            list(UserProfile.objects.all())
+            return JsonResponse({})
+
+        request = self.factory.get('/')
+        # on for every test, from cycle_project.test_runner
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'ran 2 queries, over its budget of 1'):
+            greedy(request)
+        with self.settings(CYCLES_QUERY_BUDGET_STRICT=False):
+            with self.assertLogs('cycles.timing', 'WARNING') as logs:
+                self.assertEqual(greedy(request).status_code, 200)
+        self.assertEqual(logs.records[0].queries, 2)
+
+    async def test_query_budget_counts_async_views(self):
+        from asgiref.sync import sync_to_async
+        from .timing import QueryBudgetExceeded, query_budget
+
+        @query_budget(0)
+        async def view(request):
+            await User.objects.acount()
+            await sync_to_async(lambda: User.objects.count())()
+            return JsonResponse({})
+
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'ran 2 queries'):
+            await view(self.factory.get('/'))
+
+
+class SampledProfileTests(TestCase):
+    def setUp(self):
+        import tempfile
+        self.profile_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.profile_dir.cleanup)
+        self.user = User.objects.create_user(username='profiled', password='pass')
+        self.client.login(username='profiled', password='pass')
+
+    def test_header_from_staff_only_and_rotation(self):
+        import os
+        with self.settings(CYCLES_PROFILE_DIR=self.profile_dir.name, CYCLES_PROFILE_MAX_FILES=2):
+            response = self.client.get('/dashboard/', HTTP_X_CYCLES_PROFILE='1')
+            self.assertNotIn('X-Cycles-Profile', response)
+            User.objects.filter(pk=self.user.pk).update(is_staff=True)
+            for _ in range(3):
+                response = self.client.get('/api/user_cycle/daily/', HTTP_X_CYCLES_PROFILE='1')
+            name = response['X-Cycles-Profile']
+        files = sorted(os.listdir(self.profile_dir.name))
+        self.assertEqual(len([f for f in files if f.endswith('.prof')]), 2)
+        self.assertIn(name, files)
+        self.assertIn(name.replace('.prof', '.mem.json'), files)
+        self.assertIn('-user_cycle_api-', name)
+
+    def test_sample_rate_and_report(self):
+        from io import StringIO
+        from django.core.management import call_command
+        with self.settings(CYCLES_PROFILE_DIR=self.profile_dir.name, CYCLES_PROFILE_SAMPLE_RATE=1):
+            response = self.client.get('/dashboard/')
+        self.assertIn('-dashboard-', response['X-Cycles-Profile'])
+        out = StringIO()
+        call_command('profile_report', '--dir', self.profile_dir.name, '--view', 'dashboard', '--limit', '5', stdout=out)
+        report = out.getvalue()
+        self.assertIn('1 profiles from', report)
+        self.assertIn('cumulative', report)
+        self.assertIn('Largest allocation sites, averaged over 1 traced requests', report)
+
+
+class SeedTemplatesTests(TestCase):
+    def test_reseed_writes_only_changed_rows_and_invalidates_the_catalog_once(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from . import catalog
+        from .models import CycleTemplate
+        from .seeding import load_seed_data, seed_templates
+        self.addCleanup(catalog.invalidate)
+        rows, versions = load_seed_data()
+        self.assertEqual(set(versions), {'human', 'yearly', 'business', 'health', 'daily', 'soul', 'reincarnation'})
+
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            call_command('seed_templates', stdout=out)
+        self.assertEqual(len(callbacks), 1)
+        self.assertIn(f'{len(rows)} created, 0 updated, 0 unchanged', out.getvalue())
+        self.assertEqual(CycleTemplate.objects.count(), len(rows))
+        description, effects = rows[('human', 6)]
+        tpl = CycleTemplate.objects.get(cycle_type='human', period_number=6)
+        self.assertEqual((tpl.description, tpl.effects), (description, effects))
+
+        # nothing changed: one read, no write, no invalidation
+        before = catalog.get_catalog()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks, self.assertNumQueries(3):
+            result = seed_templates()
+        self.assertEqual((result.created, result.updated, result.unchanged), (0, 0, len(rows)))
+        self.assertEqual(callbacks, [])
+        self.assertIs(catalog.get_catalog(), before)
+
+        CycleTemplate.objects.filter(cycle_type='yearly', period_number=3).update(description='edited by hand')
+        CycleTemplate.objects.create(cycle_type='yearly', period_number=99, description='obsolete')
+        dry = seed_templates(cycle_types=('yearly',), prune=True, dry_run=True)
+        self.assertEqual((dry.updated, dry.removed), (1, 1))
+        self.assertTrue(CycleTemplate.objects.filter(description='edited by hand').exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            result = seed_templates(cycle_types=('yearly',), prune=True)
+        self.assertEqual((result.created, result.updated, result.unchanged, result.removed), (0, 1, 6, 1))
+        self.assertEqual(CycleTemplate.objects.get(cycle_type='yearly', period_number=3).description, rows[('yearly', 3)][0])
+        self.assertFalse(CycleTemplate.objects.filter(period_number=99).exists())
+        self.assertIsNot(catalog.get_catalog(), before)
+
+    def test_invalid_data_is_reported(self):
+        import os
+        import tempfile
+        from django.core.management import call_command, CommandError
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, 'daily.json'), 'w') as fh:
+                json.dump({'version': 1, 'cycle_type': 'daily', 'periods': [{'period_number': 0, 'description': 'x'}]}, fh)
+            with self.assertRaisesMessage(CommandError, 'invalid period'):
+                call_command('seed_templates', '--types', 'daily', '--data-dir', tmp)
+            with self.assertRaisesMessage(CommandError, 'soul.json'):
+                call_command('seed_templates', '--types', 'soul', '--data-dir', tmp)
+
+
+class SqliteWriteTests(TransactionTestCase):
+    def test_connections_get_the_tuned_pragmas(self):
+        from django.db import connection
+        with connection.cursor() as cursor:
+            values = {}
+            for name in ('busy_timeout', 'synchronous', 'temp_store'):
+                cursor.execute(f'PRAGMA {name}')
+                values[name] = cursor.fetchone()[0]
+        # synchronous=NORMAL is 1, temp_store=MEMORY is 2; the in-memory test
+        # database cannot use WAL, which needs a file
+        self.assertEqual(values, {'busy_timeout': 5000, 'synchronous': 1, 'temp_store': 2})
+
+    def test_write_view_begins_immediate_for_unsafe_methods_only(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .writes import write_view
+
+        @write_view
+        def view(request):
+            UserProfile.objects.filter(pk=0).update(timezone='UTC')
+            return JsonResponse({'atomic': connection.in_atomic_block})
+
+        factory = RequestFactory()
+        with CaptureQueriesContext(connection) as queries:
+            response = view(factory.post('/'))
+        self.assertEqual(json.loads(response.content), {'atomic': True})
+        self.assertEqual(queries[0]['sql'], 'BEGIN IMMEDIATE')
+        with CaptureQueriesContext(connection) as queries:
+            response = view(factory.get('/'))
+        self.assertEqual(json.loads(response.content), {'atomic': False})
+        self.assertNotIn('BEGIN', [q['sql'] for q in queries])
+        self.assertFalse(connection.begin_immediate)
+
+    def test_retry_on_locked_backs_off_and_gives_up(self):
+        from django.db import OperationalError, transaction
+        from .writes import retry_on_locked
+        calls = []
+
+        @retry_on_locked(attempts=3, delay=0)
+        def flaky(error):
+            calls.append(error)
+            if len(calls) < 3:
+                raise OperationalError(error)
+            return 'written'
+
+        with self.assertLogs('cycles.writes', 'WARNING') as logs:
+            self.assertEqual(flaky('database is locked'), 'written')
+        self.assertEqual(len(calls), 3)
+        self.assertIn('attempt 2 of 3', logs.output[-1])
+
+        calls.clear()
+        with self.assertRaisesMessage(OperationalError, 'no such table'):
+            flaky('no such table')
+        self.assertEqual(len(calls), 1)
+
+        calls.clear()
+        with transaction.atomic(), self.assertRaises(OperationalError):
+            flaky('database is locked')
+        self.assertEqual(len(calls), 1)
+
+
+@override_settings(CYCLES_READ_REPLICAS=['replica1'])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from .routers import PrimaryReplicaRouter, _wrote
+        cache.clear()
+        # earlier tests wrote outside of a request, which pins this context
+        self.addCleanup(_wrote.reset, _wrote.set(False))
+        self.router = PrimaryReplicaRouter()
+
+    def test_cycle_reads_go_to_the_replica_until_the_context_writes(self):
+        import contextvars
+        from .models import CycleTemplate, UserCycle
+
+        from .routers import record_write
+
+        def execute(sql, params, many, context):
+            return None
+
+        def route():
+            reads = [self.router.db_for_read(model) for model in (CycleTemplate, Business, UserProfile, UserCycle, User)]
+            self.assertEqual(reads, ['replica1'] * 4 + ['default'])
+            self.assertEqual(self.router.db_for_write(User), 'default')
+            record_write(execute, 'UPDATE "auth_user" SET "last_login" = %s', (), False, {})
+            self.assertEqual(self.router.db_for_read(Business), 'replica1')
+            # asking for the write alias is not a write (get_or_create does it for existing rows)
+            self.assertEqual(self.router.db_for_write(Business), 'default')
+            self.assertEqual(self.router.db_for_read(Business), 'replica1')
+            record_write(execute, 'INSERT INTO "cycles_business" ("name") VALUES (%s)', (), False, {})
+            self.assertEqual(self.router.db_for_read(CycleTemplate), 'default')
+
+        contextvars.copy_context().run(route)
+        self.assertFalse(self.router.allow_migrate('replica1', 'cycles'))
+        self.assertTrue(self.router.allow_migrate('default', 'cycles'))
+
+    def test_middleware_pins_users_who_write(self):
+        from .routers import ReplicaPinningMiddleware, record_write, user_is_pinned
+        observed = []
+
+        def view(request):
+            observed.append(self.router.db_for_read(UserProfile))
+            if request.method == 'POST':
+                record_write(lambda *args: None, 'UPDATE "cycles_userprofile" SET "timezone" = %s', (), False, {})
+            return JsonResponse({})
+
+        middleware = ReplicaPinningMiddleware(view)
+        factory = RequestFactory()
+        for method, user_id in [('get', 7), ('post', 7), ('get', 7), ('get', 8)]:
+            request = getattr(factory, method)('/')
+            request.user = User(pk=user_id)
+            middleware(request)
+        self.assertEqual(observed, ['replica1', 'replica1', 'default', 'replica1'])
+        self.assertTrue(user_is_pinned(7))
+        self.assertFalse(user_is_pinned(8))
+        # the request's write does not leak into the next context
+        self.assertEqual(self.router.db_for_read(UserProfile), 'replica1')
+
+
+@override_settings(CYCLES_READ_REPLICAS=['replica1'])
+class ReplicaWriteTrackingTests(TestCase):
+    def setUp(self):
+        from .routers import _wrote
+        self.user = User.objects.create_user(username='tracked')
+        self.addCleanup(_wrote.reset, _wrote.set(False))
+
+    def test_only_statements_that_write_a_replicated_table_count_as_writes(self):
+        # (reads inside a TestCase stay on the primary anyway: it runs in a transaction)
+        from .routers import _wrote
+        UserProfile.objects.get_or_create(user=self.user)
+        User.objects.filter(pk=self.user.pk).update(last_login=None)
+        self.assertFalse(_wrote.get())
+        UserProfile.objects.filter(user=self.user).update(timezone='Asia/Tokyo')
+        self.assertTrue(_wrote.get())
+
+
+class UserProfileSignalTests(TestCase):
+    def test_signup_creates_the_profile(self):
+        # the profile lookup and its insert, in a savepoint
+        with self.assertNumQueries(7):
+            response = self.client.post('/signup/', {
+                'username': 'newbie', 'email': 'newbie@example.com',
+                'password1': 'Str0ng-pass-123', 'password2': 'Str0ng-pass-123',
+            })
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(UserProfile.objects.filter(user__username='newbie').exists())
+
+    def test_a_profile_created_first_is_kept(self):
+        from .signals import ensure_user_profile
+        user = User.objects.create_user(username='prepared')
+        profile = UserProfile.objects.get(user=user)
+        # as if another receiver or a fixture had created the profile before this one ran
+        ensure_user_profile(User, user, created=True, using='default')
+        self.assertEqual(list(UserProfile.objects.filter(user=user)), [profile])
+
+    def test_login_does_not_touch_the_profile(self):
+        from django.test.utils import CaptureQueriesContext
+        from django.db import connection
+        User.objects.create_user(username='returning', password='pass')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/accounts/login/', {'username': 'returning', 'password': 'pass'})
+        self.assertEqual(response.status_code, 302)
+        # user lookup, session insert and update, last_login update; no profile query
+        self.assertEqual(len(queries), 9)
+        self.assertFalse([q['sql'] for q in queries if 'cycles_userprofile' in q['sql']])
+
+    def test_user_save_writes_a_cached_profile_only_when_it_changed(self):
+        user = User.objects.create_user(username='editor')
+        profile = User.objects.get(pk=user.pk).userprofile
+        user = profile.user
+        with self.assertNumQueries(1):
+            user.save()
+        profile.timezone = 'Europe/Paris'
+        profile.other_dates['wedding'] = '2020-06-01'
+        self.assertEqual(profile.changed_fields(), ['other_dates', 'timezone'])
+        with self.assertNumQueries(2):
+            user.save()
+        self.assertEqual(profile.changed_fields(), [])
+        UserProfile.objects.filter(pk=profile.pk).update(timezone='Asia/Tokyo')
+        profile.refresh_from_db()
+        self.assertEqual((profile.timezone, profile.other_dates), ('Asia/Tokyo', {'wedding': '2020-06-01'}))
+        with self.assertNumQueries(1):
+            user.save()
@@ -0,0 +1,236 @@
+"""Per-request timings: database queries, cycle engine and template rendering.
+
+``ServerTimingMiddleware`` starts a ``RequestTimings`` for each request and
+keeps it in a context variable, so it follows the request into
+``sync_to_async`` threads. Three hooks feed it while the request runs:
+
+* ``record_query``, an execute wrapper installed on every database
+  connection (see ``signals.py``), counts queries and their time;
+* ``engine_timer`` wraps the ``get_*`` functions in ``cycles.utils`` (and
+  also feeds their ``/metrics`` histograms);
+* ``TimedDjangoTemplates`` is the template backend and times each render.
+
+Outside a request the query and template hooks are a single context
+variable lookup. The totals are sent back in a ``Server-Timing`` header,
+logged to the ``cycles.timing`` logger and added to the view histograms in
+``cycles.metrics``. ``query_budget`` caps the queries a view may run.
+"""
+import contextvars
+import logging
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates, Template
+
+from . import metrics
+
+
+logger = logging.getLogger('cycles.timing')
+
+_current = contextvars.ContextVar('cycles_request_timings', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more queries than its ``query_budget`` allows (raised in strict mode)."""
+
+
+class RequestTimings:
+    __slots__ = ('started', 'queries', 'db', 'cycles', 'templates', '_engine_depth')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.cycles = 0.0
+        self.templates = 0.0
+        self._engine_depth = 0
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        """Return the ``Server-Timing`` header value; durations are in milliseconds."""
+        return ', '.join([
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+            f'cycles;dur={self.cycles * 1000:.1f}',
+            f'tpl;dur={self.templates * 1000:.1f}',
+            f'total;dur={self.total() * 1000:.1f}',
+        ])
+
+
+def current_timings():
+    """Return the ``RequestTimings`` of the request being handled, or None."""
+    return _current.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper adding each query to the current request's timings."""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db += time.perf_counter() - started
+        timings.queries += 1
+
+
+def install_query_recorder(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def engine_timer(func):
+    """Time ``func`` for the ``/metrics`` histograms and the current request's engine time.
+
+    Only the outermost timed call counts towards the request, so engine
+    functions calling each other are not counted twice.
+    """
+    name = func.__name__
+
+    @wraps(func)
+    def inner(*args, **kwargs):
+        timings = _current.get()
+        outermost = timings is not None and not timings._engine_depth
+        if outermost:
+            timings._engine_depth += 1
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            if outermost:
+                timings.cycles += elapsed
+                timings._engine_depth -= 1
+            metrics.observe_function(name, elapsed)
+    return inner
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.templates += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, timing every top-level render for ``Server-Timing``."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
+
+
+class ServerTimingMiddleware:
+    """Time each request and report it in a ``Server-Timing`` header and the ``cycles.timing`` log."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings)
+
+    def _finish(self, request, response, timings):
+        if getattr(settings, 'CYCLES_SERVER_TIMING_HEADER', True):
+            response['Server-Timing'] = timings.server_timing()
+        match = getattr(request, 'resolver_match', None)
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(timings.total() * 1000, 1),
+            'db_queries': timings.queries,
+            'db_ms': round(timings.db * 1000, 1),
+            'cycles_ms': round(timings.cycles * 1000, 1),
+            'template_ms': round(timings.templates * 1000, 1),
+        }
+        metrics.observe_request(fields['view'] or 'unresolved', timings.total(), timings.queries)
+        logger.info(' '.join(f'{key}={value}' for key, value in fields.items()), extra={'timings': fields})
+        return response
+
+
+def _check_budget(view_name, used, budget):
+    if used <= budget:
+        return
+    message = f'{view_name} ran {used} queries, over its budget of {budget}'
+    if getattr(settings, 'CYCLES_QUERY_BUDGET_STRICT', False):
+        raise QueryBudgetExceeded(message)
+    logger.warning(message, extra={'view': view_name, 'queries': used, 'query_budget': budget})
+
+
+def query_budget(max_queries):
+    """Cap the database queries ``view`` may run per request.
+
+    Going over logs a warning on ``cycles.timing``, or raises
+    ``QueryBudgetExceeded`` when ``CYCLES_QUERY_BUDGET_STRICT`` is set (the
+    test runner sets it for ``manage.py test``). Works on sync and async views, with or
+    without ``ServerTimingMiddleware``.
+    """
+    def decorator(view):
+        view_name = f'{view.__module__}.{view.__qualname__}'
+
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_inner(request, *args, **kwargs):
+                timings = _current.get()
+                token = _current.set(RequestTimings()) if timings is None else None
+                before = _current.get().queries
+                try:
+                    response = await view(request, *args, **kwargs)
+                    used = _current.get().queries - before
+                finally:
+                    if token is not None:
+                        _current.reset(token)
+                _check_budget(view_name, used, max_queries)
+                return response
+            return async_inner
+
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            timings = _current.get()
+            token = _current.set(RequestTimings()) if timings is None else None
+            before = _current.get().queries
+            try:
+                response = view(request, *args, **kwargs)
+                used = _current.get().queries - before
+            finally:
+                if token is not None:
+                    _current.reset(token)
+            _check_budget(view_name, used, max_queries)
+            return response
+        return inner
+    return decorator
@@ -1,20 +1,32 @@
 
+from django.conf import settings
 from django.urls import path
 from . import views
 
+if getattr(settings, 'CYCLES_ASYNC_VIEWS', False):
+    from . import async_views as entry_views
+else:
+    entry_views = views
+
 urlpatterns = [
-    path('', views.home, name='home'),
+    path('', entry_views.home, name='home'),
     path('about/', views.about, name='about'),
-    path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/', entry_views.dashboard, name='dashboard'),
     path('profile/edit/', views.edit_profile, name='edit_profile'),
     path('profile/update/', views.profile_update_api, name='profile_update_api'),
+    path('profile/calendar/reset/', views.calendar_token_reset, name='calendar_token_reset'),
+    path('calendar/<str:token>.ics', views.calendar_feed, name='calendar_feed'),
     path('businesses/', views.business_list, name='business_list'),
     path('businesses/add/', views.business_create, name='business_create'),
     path('businesses/<int:pk>/edit/', views.business_edit, name='business_edit'),
     path('businesses/<int:pk>/delete/', views.business_delete, name='business_delete'),
     path('businesses/<int:pk>/delete/json/', views.business_delete_api, name='business_delete_api'),
-    path('api/user_cycle/<str:cycle_type>/', views.user_cycle_api, name='user_cycle_api'),
-    path('api/user_cycle/health/', views.user_cycle_api, {'cycle_type': 'health'}, name='health_cycle_api'),
-    path('api/user_cycle/reincarnation/', views.user_cycle_api, {'cycle_type': 'reincarnation'}, name='reincarnation_cycle_api'),
+    path('api/bulk_cycles/', views.bulk_cycles_api, name='bulk_cycles_api'),
+    path('api/favorable_windows/', views.favorable_windows_api, name='favorable_windows_api'),
+    path('api/user_cycles/', views.user_cycles_api, name='user_cycles_api'),
+    path('api/user_cycle/<str:cycle_type>/', entry_views.user_cycle_api, name='user_cycle_api'),
+    path('api/user_cycle/health/', entry_views.user_cycle_api, {'cycle_type': 'health'}, name='health_cycle_api'),
+    path('api/user_cycle/reincarnation/', entry_views.user_cycle_api, {'cycle_type': 'reincarnation'}, name='reincarnation_cycle_api'),
+    path('metrics', views.metrics_endpoint, name='metrics'),
     path('signup/', views.SignUpView.as_view(), name='signup'),
 ]
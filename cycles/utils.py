@@ -1,4 +1,23 @@
-from datetime import datetime, timedelta, date
+import calendar
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import datetime, timedelta, date, time, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from .timing import engine_timer
+
+
+# Day-based cycles (yearly, health, business) split 365 days into seven 52-day
+# periods; the last period absorbs the remaining day (and the leap day).
+CYCLE_DAY_BOUNDS = [(1, 52), (53, 104), (105, 156), (157, 208), (209, 260), (261, 312), (313, 365)]
+DAYS_IN_CYCLE = 365
+
+HUMAN_PERIOD_YEARS = 7
+REINCARNATION_PERIOD_YEARS = 12
+LIFETIME_YEARS = 144
+
+DAILY_PERIOD_MINUTES = 206  # 3 hours 26 minutes
 
 
 def _ensure_date(d):
@@ -17,21 +36,107 @@ def _ensure_date(d):
     return None
 
 
-def get_daily_cycle(now=None):
+def _replace_year(d, year):
+    """Return ``d`` moved to ``year``; Feb 29 falls back to Feb 28 on non-leap years."""
+    try:
+        return d.replace(year=year)
+    except ValueError:
+        return d.replace(year=year, day=28)
+
+
+def _period_index_for_day(day_into_cycle):
+    """Return the 0-based period index for a 1-based day of a 52-day-period cycle."""
+    for index, (start_day, end_day) in enumerate(CYCLE_DAY_BOUNDS):
+        if start_day <= day_into_cycle <= end_day:
+            return index
+    return len(CYCLE_DAY_BOUNDS) - 1 if day_into_cycle > DAYS_IN_CYCLE else None
+
+
+def _age_on(birth_date, today):
+    """Return completed years between ``birth_date`` and ``today`` (never negative)."""
+    age_years = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+    return max(age_years, 0)
+
+
+def _ensure_today(today):
+    return _ensure_date(today) or datetime.today().date()
+
+
+@lru_cache(maxsize=256)
+def get_zone(tz_name):
+    """Return the ZoneInfo for ``tz_name``, falling back to UTC for unknown names."""
+    try:
+        return ZoneInfo(tz_name or 'UTC')
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo('UTC')
+
+
+@lru_cache(maxsize=4096)
+def daily_boundaries(tz_name, local_date):
+    """Return the UTC instants at which the seven daily periods of ``local_date`` start in ``tz_name``.
+
+    The eighth entry is the end of the last period (6:00 a.m. the next local
+    day). Boundaries are wall-clock times, so they follow DST changes; the table
+    is computed once per (timezone, local date) and shared by every user in
+    that zone.
+    """
+    zone = get_zone(tz_name)
+    start_of_day = datetime.combine(local_date, time(6))
+    wall_times = [start_of_day + timedelta(minutes=DAILY_PERIOD_MINUTES * i) for i in range(7)]
+    wall_times.append(start_of_day + timedelta(days=1))
+    return tuple(w.replace(tzinfo=zone).astimezone(timezone.utc) for w in wall_times)
+
+
+def _daily_position_in_zone(now, tz_name):
+    """Return (boundary table, current period index) for an instant in ``tz_name``."""
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    local_now = now.astimezone(get_zone(tz_name))
+    local_date = local_now.date()
+    boundaries = daily_boundaries(tz_name, local_date)
+    if now < boundaries[0]:
+        boundaries = daily_boundaries(tz_name, local_date - timedelta(days=1))
+    index = min(max(bisect_right(boundaries, now) - 1, 0), 6)
+    return boundaries, index
+
+
+@engine_timer
+def get_daily_cycle(now=None, tz=None):
     """Return daily periods and the current period based on a 7-part day starting at 6:00 AM.
 
-    Each period is ~3h26m (206 minutes).
+    Each period is ~3h26m (206 minutes). With ``tz`` (an IANA name) the day
+    starts at 6:00 AM local time in that zone and ``now`` is an aware instant
+    (naive values are read as UTC); without it the server clock is used.
     """
+    if tz is not None:
+        periods = _daily_periods()
+        _, index = _daily_position_in_zone(now or datetime.now(timezone.utc), tz)
+        return periods, periods[index]
+
     now = now or datetime.now()
     if isinstance(now, date) and not isinstance(now, datetime):
         now = datetime.combine(now, datetime.min.time())
     start_of_day = now.replace(hour=6, minute=0, second=0, microsecond=0)
-    start_of_day = now.replace(hour=6, minute=0, second=0, microsecond=0)
-    
+
     if now < start_of_day:
         start_of_day -= timedelta(days=1)
 
-    periods = [
+    periods = _daily_periods()
+
+    minutes_since_start = (now - start_of_day).total_seconds() / 60
+    period_length = DAILY_PERIOD_MINUTES
+
+    current_period_index = int(minutes_since_start // period_length)
+    if current_period_index < 0:
+        current_period_index = 0
+    if current_period_index >= len(periods):
+        current_period_index = len(periods) - 1
+
+    return periods, periods[current_period_index]
+
+
+def _daily_periods():
+    return [
         {"name": "The Morning Period", "start": "6:00 a.m.", "end": "9:26 a.m.", "principle": "New beginnings, planning, and mental work.", "suggestion": "Start new tasks, intellectual work, planning"},
         {"name": "The Active Period", "start": "9:26 a.m.", "end": "12:52 p.m.", "principle": "Action and execution.", "suggestion": "Meetings, negotiations, physical activities"},
         {"name": "The Period of Rest", "start": "12:52 p.m.", "end": "4:18 p.m.", "principle": "Consolidation and rejuvenation.", "suggestion": "Take a break, review work, gather energy"},
@@ -40,39 +145,40 @@ def get_daily_cycle(now=None):
         {"name": "The Period of Dreams", "start": "11:10 p.m.", "end": "2:36 a.m.", "principle": "Deep rest and subconscious activity.", "suggestion": "Sleep and deep rest"},
         {"name": "The Period of Introspection", "start": "2:36 a.m.", "end": "6:00 a.m.", "principle": "Profound spiritual and creative thought.", "suggestion": "Meditation, deep thinking (if awake)"}
     ]
-    
-    minutes_since_start = (now - start_of_day).total_seconds() / 60
-    period_length = 206  # 3 hours 26 minutes
 
-    current_period_index = int(minutes_since_start // period_length)
-    if current_period_index < 0:
-        current_period_index = 0
-    if current_period_index >= len(periods):
-        current_period_index = len(periods) - 1
+def _birthday_cycle_start(birth_date, today):
+    """Return the most recent birthday on or before ``today``."""
+    current_year_birthday = _replace_year(birth_date, today.year)
+    if today < current_year_birthday:
+        return _replace_year(birth_date, today.year - 1)
+    return current_year_birthday
 
-    return periods, periods[current_period_index]
 
-def get_yearly_cycle(birth_date):
-    today = datetime.today().date()
+def _business_cycle_start(establishment_date, today):
+    """Return the date the business periods are laid out from: this year's anniversary, or last year's if it is still ahead."""
+    cycle_start_date = establishment_date
+    if cycle_start_date.year < today.year:
+        cycle_start_date = _replace_year(cycle_start_date, today.year)
+    if cycle_start_date > today:
+        cycle_start_date = _replace_year(cycle_start_date, cycle_start_date.year - 1)
+    return cycle_start_date
+
+
+@engine_timer
+def get_yearly_cycle(birth_date, today=None):
+    today = _ensure_today(today)
     birth_date = _ensure_date(birth_date)
 
     if not birth_date:
         return [], None, 0
 
-    try:
-        current_year_birthday = birth_date.replace(year=today.year)
-    except Exception:
-        # handle Feb 29 birthdays on non-leap years
-        current_year_birthday = date(today.year, birth_date.month, birth_date.day)
-
-    if today < current_year_birthday:
-        cycle_start_date = birth_date.replace(year=today.year - 1)
-    else:
-        cycle_start_date = current_year_birthday
+    cycle_start_date = _birthday_cycle_start(birth_date, today)
 
-    days_into_cycle = (today - cycle_start_date).days
-    total_days_in_cycle = 365
-    progress = (days_into_cycle / total_days_in_cycle) * 100
+    days_since_birthday = (today - cycle_start_date).days
+    # the birthday itself is day 1, matching the start_date of the first period
+    days_into_cycle = days_since_birthday + 1
+    total_days_in_cycle = DAYS_IN_CYCLE
+    progress = (days_since_birthday / total_days_in_cycle) * 100
 
     periods = [
         {"name": "The Period of Action", "start_day": 1, "end_day": 52, "principle": "Initiate new projects and undertakings.", "suggestion": "Start new projects, set goals, take initiative"},
@@ -88,30 +194,24 @@ def get_yearly_cycle(birth_date):
         period['start_date'] = cycle_start_date + timedelta(days=period['start_day'] - 1)
         period['end_date'] = cycle_start_date + timedelta(days=period['end_day'] - 1)
 
-    current_period = None
-    for period in periods:
-        if period["start_day"] <= days_into_cycle <= period["end_day"]:
-            current_period = period
-            break
+    current_index = _period_index_for_day(days_into_cycle)
+    current_period = periods[current_index] if current_index is not None else None
 
     return periods, current_period, progress
 
-def get_business_cycle(establishment_date):
-    today = datetime.today().date()
+@engine_timer
+def get_business_cycle(establishment_date, today=None):
+    today = _ensure_today(today)
     establishment_date = _ensure_date(establishment_date)
 
     if not establishment_date:
         return [], None, 0
 
-    cycle_start_date = establishment_date
-    while cycle_start_date.year < today.year:
-        cycle_start_date = cycle_start_date.replace(year=cycle_start_date.year + 1)
-    if cycle_start_date > today:
-        cycle_start_date = cycle_start_date.replace(year=cycle_start_date.year -1)
+    cycle_start_date = _business_cycle_start(establishment_date, today)
 
     days_since_establishment = (today - establishment_date).days
-    days_into_cycle = (days_since_establishment % 365) + 1
-    total_days_in_cycle = 365
+    days_into_cycle = (days_since_establishment % DAYS_IN_CYCLE) + 1
+    total_days_in_cycle = DAYS_IN_CYCLE
     progress = (days_into_cycle / total_days_in_cycle) * 100
 
     periods = [
@@ -128,16 +228,16 @@ def get_business_cycle(establishment_date):
         period['start_date'] = cycle_start_date + timedelta(days=period['start_day'] - 1)
         period['end_date'] = cycle_start_date + timedelta(days=period['end_day'] - 1)
 
-    current_period = None
-    for period in periods:
-        if period["start_day"] <= days_into_cycle <= period["end_day"]:
-            current_period = period
-            break
+    current_index = _period_index_for_day(days_into_cycle)
+    current_period = periods[current_index] if current_index is not None else None
 
     return periods, current_period, progress
 
-def get_soul_cycle():
-    today = datetime.today()
+@engine_timer
+def get_soul_cycle(today=None):
+    today = today or datetime.today()
+    if not isinstance(today, datetime):
+        today = datetime.combine(today, datetime.min.time())
     
     periods = [
         {"name": "The Period of Self-Realization", "start_date": (3, 22), "end_date": (5, 12), "principle": "Personal growth, creativity, and the development of new ideas.", "suggestion": "Develop new ideas, focus on personal development"},
@@ -181,24 +281,23 @@ def get_soul_cycle():
     return periods, current_period, progress
 
 
-def get_human_life_cycle(birth_date):
+@engine_timer
+def get_human_life_cycle(birth_date, today=None):
     """Compute the human life 7-period cycle (approx 144 years divided by 7-year periods).
 
     Returns periods list and the current period index and progress within that period.
     """
     birth_date = _ensure_date(birth_date)
-    today = datetime.today().date()
+    today = _ensure_today(today)
 
     if not birth_date:
         return [], None, 0
 
-    total_years = 144
-    period_years = 7
+    total_years = LIFETIME_YEARS
+    period_years = HUMAN_PERIOD_YEARS
     total_periods = total_years // period_years
 
-    age_years = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
-    if age_years < 0:
-        age_years = 0
+    age_years = _age_on(birth_date, today)
 
     current_period_index = min(age_years // period_years, total_periods - 1)
     years_into_period = age_years % period_years
@@ -208,8 +307,8 @@ def get_human_life_cycle(birth_date):
     for i in range(total_periods):
         start_age = i * period_years
         end_age = start_age + period_years - 1
-        start_date = birth_date.replace(year=birth_date.year + start_age)
-        end_date = birth_date.replace(year=birth_date.year + end_age)
+        start_date = _replace_year(birth_date, birth_date.year + start_age)
+        end_date = _replace_year(birth_date, birth_date.year + end_age)
         periods.append({
             'name': f'Period {i+1}',
             'start_age': start_age,
@@ -223,27 +322,21 @@ def get_human_life_cycle(birth_date):
     current_period = periods[current_period_index]
     return periods, current_period, progress
 
-def get_health_cycle(birth_date):
-    today = datetime.today().date()
+@engine_timer
+def get_health_cycle(birth_date, today=None):
+    today = _ensure_today(today)
     birth_date = _ensure_date(birth_date)
 
     if not birth_date:
         return [], None, 0
 
-    try:
-        current_year_birthday = birth_date.replace(year=today.year)
-    except Exception:
-        # handle Feb 29 birthdays on non-leap years
-        current_year_birthday = date(today.year, birth_date.month, birth_date.day)
+    cycle_start_date = _birthday_cycle_start(birth_date, today)
 
-    if today < current_year_birthday:
-        cycle_start_date = birth_date.replace(year=today.year - 1)
-    else:
-        cycle_start_date = current_year_birthday
-
-    days_into_cycle = (today - cycle_start_date).days
-    total_days_in_cycle = 365
-    progress = (days_into_cycle / total_days_in_cycle) * 100
+    days_since_birthday = (today - cycle_start_date).days
+    # the birthday itself is day 1, matching the start_date of the first period
+    days_into_cycle = days_since_birthday + 1
+    total_days_in_cycle = DAYS_IN_CYCLE
+    progress = (days_since_birthday / total_days_in_cycle) * 100
 
     periods = [
         {"name": "Period 1", "start_day": 1, "end_day": 52, "principle": "Vitality and constitutional health at its best.", "suggestion": "During this period the vitality and constitutional health should be at its best and, if it is below normal, it will be more quickly and easily increased and strengthened by normal living and the avoidance of the violation of any natural laws. Plenty of outdoor walking, good air, drinking plenty of water and eating proper foods, avoiding foods that are overheating, especially the starches and raw or rare meats—this will yield results. The eyes should be guarded against overuse or use in bright electric lights or sunlight, and if any operation is planned, or system of health building is to be adopted, this is the period in which to start these things."},
@@ -259,28 +352,24 @@ def get_health_cycle(birth_date):
         period['start_date'] = cycle_start_date + timedelta(days=period['start_day'] - 1)
         period['end_date'] = cycle_start_date + timedelta(days=period['end_day'] - 1)
 
-    current_period = None
-    for period in periods:
-        if period["start_day"] <= days_into_cycle <= period["end_day"]:
-            current_period = period
-            break
+    current_index = _period_index_for_day(days_into_cycle)
+    current_period = periods[current_index] if current_index is not None else None
 
     return periods, current_period, progress
 
-def get_reincarnation_cycle(birth_date):
-    today = datetime.today().date()
+@engine_timer
+def get_reincarnation_cycle(birth_date, today=None):
+    today = _ensure_today(today)
     birth_date = _ensure_date(birth_date)
 
     if not birth_date:
         return [], None, 0
 
-    total_years = 144
-    years_in_cycle = 12 
+    total_years = LIFETIME_YEARS
+    years_in_cycle = REINCARNATION_PERIOD_YEARS
     cycles_in_lifetime = total_years // years_in_cycle
 
-    age_years = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
-    if age_years < 0:
-        age_years = 0
+    age_years = _age_on(birth_date, today)
 
     current_cycle_index = min(age_years // years_in_cycle, cycles_in_lifetime - 1)
     years_into_cycle = age_years % years_in_cycle
@@ -302,8 +391,299 @@ def get_reincarnation_cycle(birth_date):
     ]
 
     for period in periods:
-        period['start_date'] = birth_date.replace(year=birth_date.year + period['start_age'])
-        period['end_date'] = birth_date.replace(year=birth_date.year + period['end_age'])
+        period['start_date'] = _replace_year(birth_date, birth_date.year + period['start_age'])
+        period['end_date'] = _replace_year(birth_date, birth_date.year + period['end_age'])
 
     current_period = periods[current_cycle_index]
     return periods, current_period, progress
+
+
+def business_cycle_anchor(establishment_date):
+    """Return the business cycle anchor of ``establishment_date``: its ordinal modulo 365.
+
+    The business cycle restarts every 365 days from the establishment date
+    (not on each anniversary), so businesses with the same anchor are always
+    in the same period and day of their cycle.
+    """
+    return establishment_date.toordinal() % DAYS_IN_CYCLE
+
+
+def business_anchor_ranges(period_index, today=None):
+    """Return the inclusive anchor ranges of the businesses in period ``period_index`` on ``today``.
+
+    One ``(low, high)`` pair, or two when the range wraps past anchor 364.
+    """
+    today_ordinal = _ensure_today(today).toordinal()
+    start_day, end_day = CYCLE_DAY_BOUNDS[period_index]
+    low = (today_ordinal - (end_day - 1)) % DAYS_IN_CYCLE
+    high = (today_ordinal - (start_day - 1)) % DAYS_IN_CYCLE
+    if low <= high:
+        return [(low, high)]
+    return [(low, DAYS_IN_CYCLE - 1), (0, high)]
+
+
+def birth_month_day(birth_date):
+    """Return the month and day of ``birth_date`` as one sortable number, MMDD (Feb 29 is 229)."""
+    return birth_date.month * 100 + birth_date.day
+
+
+def birthday_cohort(period_index, today=None):
+    """Return ``(cycle_start, low, high)`` for the yearly/health period ``period_index`` starting on ``today``.
+
+    Those cycles restart on each birthday, so the people entering the period
+    on ``today`` had their last birthday on ``cycle_start``: born on or
+    before it, with a ``birth_month_day`` between ``low`` and ``high``. That
+    is one day, except on Feb 28 of a common year, which is also the
+    birthday of people born on Feb 29 (see ``_replace_year``).
+    """
+    start_day = CYCLE_DAY_BOUNDS[period_index][0]
+    cycle_start = _ensure_today(today) - timedelta(days=start_day - 1)
+    low = high = birth_month_day(cycle_start)
+    if low == 228 and not calendar.isleap(cycle_start.year):
+        high = 229
+    return cycle_start, low, high
+
+
+@engine_timer
+def get_cycle_progress(cycle_type, source_date, today=None):
+    """Return the progress the matching ``get_*`` function reports, without building its periods.
+
+    ``source_date`` is the birth date (establishment date for ``business``) and
+    is ignored for ``soul``.
+    """
+    today = _ensure_today(today)
+    source_date = _ensure_date(source_date)
+    if cycle_type == 'soul':
+        return _soul_progress(today)
+    if not source_date:
+        return 0
+    if cycle_type in ('yearly', 'health'):
+        return ((today - _birthday_cycle_start(source_date, today)).days / DAYS_IN_CYCLE) * 100
+    if cycle_type == 'business':
+        return ((((today - source_date).days % DAYS_IN_CYCLE) + 1) / DAYS_IN_CYCLE) * 100
+    if cycle_type == 'human':
+        return ((_age_on(source_date, today) % HUMAN_PERIOD_YEARS) / HUMAN_PERIOD_YEARS) * 100
+    if cycle_type == 'reincarnation':
+        return ((_age_on(source_date, today) % REINCARNATION_PERIOD_YEARS) / REINCARNATION_PERIOD_YEARS) * 100
+    raise ValueError(f'unsupported cycle_type: {cycle_type!r}')
+
+
+def _soul_progress(today):
+    start_of_soul_cycle = date(today.year, 3, 22)
+    if today < start_of_soul_cycle:
+        start_of_soul_cycle = date(today.year - 1, 3, 22)
+    return ((today - start_of_soul_cycle).days / 365.25) * 100
+
+
+def _daily_position(now):
+    """Return (the 6:00 a.m. start of the cycle day containing ``now``, current period index)."""
+    start_of_day = now.replace(hour=6, minute=0, second=0, microsecond=0)
+    if now < start_of_day:
+        start_of_day -= timedelta(days=1)
+    index = min(int((now - start_of_day).total_seconds() // 60 // DAILY_PERIOD_MINUTES), 6)
+    return start_of_day, index
+
+
+@engine_timer
+def get_next_transition(cycle_type, source_date=None, now=None, tz=None):
+    """Return when the current period of ``cycle_type`` ends.
+
+    Daily transitions are datetimes (aware UTC instants when ``tz`` is given);
+    all other cycles change at the start of the returned date. Returns None
+    when the current period is the last one. ``source_date`` is the birth date
+    (establishment date for ``business``).
+    """
+    if cycle_type == 'daily' and tz is not None:
+        boundaries, index = _daily_position_in_zone(now or datetime.now(timezone.utc), tz)
+        return boundaries[index + 1]
+    if cycle_type == 'daily':
+        now = now or datetime.now()
+        if not isinstance(now, datetime):
+            now = datetime.combine(now, datetime.min.time())
+        start_of_day, index = _daily_position(now)
+        if index == 6:
+            # the seventh period is cut short by the next 6:00 a.m. start
+            return start_of_day + timedelta(days=1)
+        return start_of_day + timedelta(minutes=DAILY_PERIOD_MINUTES * (index + 1))
+
+    today = _ensure_today(now)
+    if cycle_type == 'soul':
+        return get_soul_cycle(today)[1]['end_date'] + timedelta(days=1)
+
+    source_date = _ensure_date(source_date)
+    if not source_date:
+        return None
+    if cycle_type in ('yearly', 'health'):
+        cycle_start_date = _birthday_cycle_start(source_date, today)
+        index = _period_index_for_day((today - cycle_start_date).days + 1)
+        if index == len(CYCLE_DAY_BOUNDS) - 1:
+            return _replace_year(source_date, cycle_start_date.year + 1)
+        return cycle_start_date + timedelta(days=CYCLE_DAY_BOUNDS[index][1])
+    if cycle_type == 'business':
+        days_into_cycle = ((today - source_date).days % DAYS_IN_CYCLE) + 1
+        index = _period_index_for_day(days_into_cycle)
+        return today + timedelta(days=CYCLE_DAY_BOUNDS[index][1] - days_into_cycle + 1)
+    if cycle_type in ('human', 'reincarnation'):
+        period_years = HUMAN_PERIOD_YEARS if cycle_type == 'human' else REINCARNATION_PERIOD_YEARS
+        index = _age_on(source_date, today) // period_years
+        if index >= LIFETIME_YEARS // period_years - 1:
+            return None
+        return _replace_year(source_date, source_date.year + (index + 1) * period_years)
+    raise ValueError(f'unsupported cycle_type: {cycle_type!r}')
+
+
+CYCLE_TYPES = ('daily', 'soul', 'yearly', 'health', 'business', 'human', 'reincarnation')
+
+CycleSegment = namedtuple('CycleSegment', ['cycle_type', 'period', 'start', 'end'])
+CycleSegment.__doc__ = """One period of a cycle returned by :func:`get_cycle_segments`.
+
+``period`` is the 1-based period number. ``start`` is when the period begins
+and ``end`` when the next one begins (exclusive), or None for the last
+human/reincarnation period. Daily segments hold datetimes; all others dates.
+"""
+
+# Soul periods start on fixed calendar days; sorted by (month, day) so that
+# bisecting a date finds its period, with Harmony (Dec 6 - Jan 25) wrapping
+# over the new year.
+_SOUL_STARTS = sorted([((3, 22), 0), ((5, 13), 1), ((7, 4), 2), ((8, 25), 3), ((10, 16), 4), ((12, 6), 5), ((1, 26), 6)])
+_SOUL_START_KEYS = [month_day for month_day, _ in _SOUL_STARTS]
+
+
+def _soul_segment(day):
+    position = bisect_right(_SOUL_START_KEYS, (day.month, day.day)) - 1
+    start_year = day.year
+    if position < 0:
+        # Jan 1 - Jan 25 still belong to the Harmony period that began in December
+        position = len(_SOUL_STARTS) - 1
+        start_year -= 1
+    (month, start_day), index = _SOUL_STARTS[position]
+    next_position = position + 1
+    end_year = start_year if next_position < len(_SOUL_STARTS) else start_year + 1
+    (end_month, end_day), _ = _SOUL_STARTS[next_position % len(_SOUL_STARTS)]
+    return index, date(start_year, month, start_day), date(end_year, end_month, end_day)
+
+
+def _dated_segment(cycle_type, source_date, day):
+    """Return (index, start, end) of the period of a date-based cycle containing ``day``."""
+    if cycle_type == 'soul':
+        return _soul_segment(day)
+    if cycle_type in ('yearly', 'health'):
+        cycle_start_date = _birthday_cycle_start(source_date, day)
+        index = _period_index_for_day((day - cycle_start_date).days + 1)
+        start = cycle_start_date + timedelta(days=CYCLE_DAY_BOUNDS[index][0] - 1)
+        if index == len(CYCLE_DAY_BOUNDS) - 1:
+            return index, start, _replace_year(source_date, cycle_start_date.year + 1)
+        return index, start, cycle_start_date + timedelta(days=CYCLE_DAY_BOUNDS[index][1])
+    if cycle_type == 'business':
+        days_into_cycle = ((day - source_date).days % DAYS_IN_CYCLE) + 1
+        index = _period_index_for_day(days_into_cycle)
+        start_day, end_day = CYCLE_DAY_BOUNDS[index]
+        return index, day - timedelta(days=days_into_cycle - start_day), day + timedelta(days=end_day - days_into_cycle + 1)
+    if cycle_type in ('human', 'reincarnation'):
+        period_years = HUMAN_PERIOD_YEARS if cycle_type == 'human' else REINCARNATION_PERIOD_YEARS
+        last_index = LIFETIME_YEARS // period_years - 1
+        index = min(_age_on(source_date, day) // period_years, last_index)
+        start = _replace_year(source_date, source_date.year + index * period_years)
+        end = None if index == last_index else _replace_year(source_date, source_date.year + (index + 1) * period_years)
+        return index, start, end
+    raise ValueError(f'unsupported cycle_type: {cycle_type!r}')
+
+
+def _daily_segment(moment, tz):
+    if tz is not None:
+        boundaries, index = _daily_position_in_zone(moment, tz)
+        return index, boundaries[index], boundaries[index + 1]
+    start_of_day, index = _daily_position(moment)
+    start = start_of_day + timedelta(minutes=DAILY_PERIOD_MINUTES * index)
+    end = start_of_day + timedelta(days=1) if index == 6 else start + timedelta(minutes=DAILY_PERIOD_MINUTES)
+    return index, start, end
+
+
+def _window_moment(value, tz, end=False):
+    """Turn a window bound into the datetime the daily cycle is evaluated at."""
+    if not isinstance(value, datetime):
+        value = datetime.combine(value + timedelta(days=1) if end else value, time())
+        if tz is not None:
+            value = value.replace(tzinfo=get_zone(tz))
+    elif tz is not None and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def iter_cycle_segments(cycle_type, source_date, start, end, tz=None):
+    """Yield the segments of ``cycle_type`` overlapping the window ``[start, end]`` in order.
+
+    Each step jumps straight to the next boundary, so the cost is proportional
+    to the number of periods in the window, not its length. Date bounds are
+    inclusive days; for the daily cycle they cover whole days (local days in
+    ``tz`` when given) and datetime bounds are used as-is with ``end``
+    exclusive. The first segment may start before ``start``.
+    """
+    if cycle_type == 'daily':
+        moment = _window_moment(start, tz)
+        window_end = _window_moment(end, tz, end=True)
+        while moment < window_end:
+            index, seg_start, seg_end = _daily_segment(moment, tz)
+            yield CycleSegment('daily', index + 1, seg_start, seg_end)
+            moment = seg_end
+        return
+
+    if cycle_type not in CYCLE_TYPES:
+        raise ValueError(f'unsupported cycle_type: {cycle_type!r}')
+    source_date = _ensure_date(source_date)
+    if cycle_type != 'soul' and not source_date:
+        return
+    day = _ensure_date(start)
+    last_day = _ensure_date(end)
+    while day is not None and day <= last_day:
+        index, seg_start, seg_end = _dated_segment(cycle_type, source_date, day)
+        yield CycleSegment(cycle_type, index + 1, seg_start, seg_end)
+        day = seg_end
+
+
+def _segment_sort_key(segment, tz):
+    start = segment.start
+    if not isinstance(start, datetime):
+        return datetime.combine(start, time())
+    if start.tzinfo is not None:
+        return start.astimezone(get_zone(tz)).replace(tzinfo=None)
+    return start
+
+
+@engine_timer
+def get_cycle_segments(source_date, start, end, cycle_types=CYCLE_TYPES, establishment_date=None, tz=None):
+    """Return every period change between ``start`` and ``end`` as ordered ``CycleSegment`` rows.
+
+    ``source_date`` is the birth date used by the personal cycles and
+    ``establishment_date`` the one used by ``business`` (defaults to
+    ``source_date``). Segments of all requested cycle types are merged by start
+    time; see :func:`iter_cycle_segments` for the window semantics.
+    """
+    if isinstance(cycle_types, str):
+        cycle_types = (cycle_types,)
+    segments = []
+    for cycle_type in cycle_types:
+        cycle_source = (establishment_date or source_date) if cycle_type == 'business' else source_date
+        segments.extend(iter_cycle_segments(cycle_type, cycle_source, start, end, tz=tz))
+    segments.sort(key=lambda s: (_segment_sort_key(s, tz), CYCLE_TYPES.index(s.cycle_type)))
+    return segments
+
+
+@lru_cache(maxsize=None)
+def get_period_names(cycle_type):
+    """Return the period names of ``cycle_type`` in order; they do not depend on any date."""
+    reference = date(2000, 1, 1)
+    if cycle_type == 'daily':
+        return tuple(p['name'] for p in _daily_periods())
+    if cycle_type == 'soul':
+        return tuple(p['name'] for p in get_soul_cycle(reference)[0])
+    functions = {
+        'yearly': get_yearly_cycle,
+        'health': get_health_cycle,
+        'business': get_business_cycle,
+        'human': get_human_life_cycle,
+        'reincarnation': get_reincarnation_cycle,
+    }
+    if cycle_type not in functions:
+        raise ValueError(f'unsupported cycle_type: {cycle_type!r}')
+    return tuple(p['name'] for p in functions[cycle_type](reference, today=reference)[0])
@@ -1,29 +1,34 @@
 
+import json
+from datetime import date
+
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import JsonResponse
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.db.models import Count, Q
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import UserCreationForm
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.views import generic
 from django.contrib import messages
+from django.utils.crypto import constant_time_compare
 from .models import UserProfile, Business
-from .models import CycleTemplate
-from .utils import get_daily_cycle, get_yearly_cycle, get_business_cycle, get_soul_cycle, get_human_life_cycle, get_health_cycle, get_reincarnation_cycle
+from .catalog import get_catalog
+from .caching import cached_cycle
+from .fragments import dashboard_fragments, request_fragment_header
+from .conditional import calendar_validators, conditional_cycle_view, home_validators, user_cycle_validators
+from .pagination import BusinessPager
+from .profiling import sampled_profile
+from .snapshots import load_fresh_snapshots
+from .timing import query_budget
+from .writes import write_view
+from . import bulk, ical, metrics, windows
+from .utils import CYCLE_TYPES, get_period_names, get_zone
 
 def _get_template_for_cycle(cycle_type, period_number):
     """Helper function to get the template for a given cycle type and period number."""
-    try:
-        tpl = CycleTemplate.objects.get(cycle_type=cycle_type, period_number=period_number)
-        return {
-            'description': tpl.description,
-            'effects': tpl.effects or {},
-            'start_age': (tpl.effects or {}).get('start_age'),
-            'end_age': (tpl.effects or {}).get('end_age'),
-            'advice': (tpl.effects or {}).get('advice') or (tpl.effects or {}).get('summary'),
-            'full_description': tpl.description
-        }
-    except CycleTemplate.DoesNotExist:
-        return None
+    return get_catalog().get(cycle_type, period_number)
 
 class SignUpView(generic.CreateView):
     from .forms import UserRegisterForm
@@ -35,6 +40,7 @@ from .forms import UserProfileForm, BusinessForm
 
 
 @login_required
+@write_view
 def edit_profile(request):
     """Allow a logged-in user to edit their UserProfile on a separate page."""
     try:
@@ -51,17 +57,73 @@ def edit_profile(request):
     else:
         form = UserProfileForm(instance=user_profile)
 
-    return render(request, 'cycles/profile_edit.html', {'form': form})
+    calendar_url = request.build_absolute_uri(
+        reverse('calendar_feed', args=[ical.ensure_calendar_token(user_profile)])
+    )
+    return render(request, 'cycles/profile_edit.html', {'form': form, 'calendar_url': calendar_url})
+
+
+@login_required
+@write_view
+def calendar_token_reset(request):
+    """Issue a new calendar feed token via POST, revoking the old subscription URL."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'method_not_allowed'}, status=405)
+    user_profile, _ = UserProfile.objects.get_or_create(user=request.user)
+    ical.reset_calendar_token(user_profile)
+    messages.success(request, 'Calendar link reset. Subscribe again with the new link.')
+    return redirect('edit_profile')
+
+
+@conditional_cycle_view(calendar_validators)
+def calendar_feed(request, token):
+    """Stream the token holder's upcoming period transitions as an iCalendar feed.
+
+    ``?days=`` sets the horizon (default 365) and ``?types=`` limits the cycles.
+    """
+    user_profile = UserProfile.objects.select_related('user').filter(calendar_token=token).first()
+    if user_profile is None:
+        raise Http404
+    options = ical.parse_feed_options(request.GET)
+    if options is None:
+        return JsonResponse({'error': 'invalid_feed_options'}, status=400)
+    horizon_days, cycle_types = options
+    businesses = user_profile.user.business_set.order_by('pk').iterator()
+    response = StreamingHttpResponse(
+        ical.stream_feed(user_profile, businesses, date.today(), horizon_days, cycle_types, get_catalog()),
+        content_type='text/calendar; charset=utf-8',
+    )
+    response['Content-Disposition'] = 'inline; filename="cycles.ics"'
+    return response
 
 
 @login_required
+@query_budget(4)
 def business_list(request):
-    """Show a manageable list of the user's businesses with links to create/edit."""
-    businesses = Business.objects.filter(user=request.user)
-    return render(request, 'cycles/business_list.html', {'businesses': businesses})
+    """Show a page of the user's businesses with links to create/edit.
+
+    ``?limit=`` sets the page size and ``?cursor=`` continues after a page;
+    ``period`` and ``order`` work as in the business API.
+    """
+    try:
+        pager = BusinessPager.from_request(request.user.business_set.all(), request.GET)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    page = pager.page(pager.queryset)
+    params = request.GET.copy()
+    params.pop('cursor', None)
+    first_url = f'?{params.urlencode()}' if request.GET.get('cursor') else None
+    next_url = None
+    if page.next_cursor:
+        params['cursor'] = page.next_cursor
+        next_url = f'?{params.urlencode()}'
+    return render(request, 'cycles/business_list.html', {
+        'businesses': page.items, 'next_url': next_url, 'first_url': first_url,
+    })
 
 
 @login_required
+@write_view
 def business_create(request):
     if request.method == 'POST':
         form = BusinessForm(request.POST)
@@ -77,6 +139,7 @@ def business_create(request):
 
 
 @login_required
+@write_view
 def business_edit(request, pk):
     biz = get_object_or_404(Business, pk=pk, user=request.user)
     if request.method == 'POST':
@@ -91,6 +154,7 @@ def business_edit(request, pk):
 
 
 @login_required
+@write_view
 def profile_update_api(request):
     """Accept POST from AJAX to update the user's profile and return JSON."""
     if request.method != 'POST':
@@ -116,6 +180,7 @@ def profile_update_api(request):
 
 
 @login_required
+@write_view
 def business_delete(request, pk):
     """Delete a user's business via POST (form submit) and redirect back to list."""
     if request.method != 'POST':
@@ -127,6 +192,7 @@ def business_delete(request, pk):
 
 
 @login_required
+@write_view
 def business_delete_api(request, pk):
     """AJAX-friendly delete endpoint returning JSON; preserves same permissions as the standard delete."""
     if request.method != 'POST':
@@ -136,6 +202,9 @@ def business_delete_api(request, pk):
     return JsonResponse({'success': True})
 
 @login_required
+@sampled_profile
+@query_budget(8)
+@write_view
 def dashboard(request):
     try:
         user_profile = request.user.userprofile
@@ -160,58 +229,49 @@ def dashboard(request):
         user_profile_form = UserProfileForm(instance=user_profile)
         business_form = BusinessForm()
 
-    daily_periods, current_daily_period = get_daily_cycle()
-    yearly_periods, current_yearly_period, yearly_progress = get_yearly_cycle(user_profile.date_of_birth)
-    soul_periods, current_soul_period, soul_progress = get_soul_cycle()
+    # Prefer the nightly UserCycle snapshots; fall back to computing live.
+    snapshots = load_fresh_snapshots(user_profile)
+    try:
+        businesses = _business_queryset(request)
+    except ValueError:
+        businesses = request.user.business_set.by_cycle()
+    context = _dashboard_context(user_profile, snapshots, businesses, get_catalog())
+    context.update(user_profile_form=user_profile_form, business_form=business_form)
+    return _render_dashboard(request, context)
+
+
+def _render_dashboard(request, context):
+    """Render the dashboard, reporting its fragment cache hits in ``X-Fragment-Cache``."""
+    response = render(request, 'cycles/dashboard.html', context)
+    fragment_header = request_fragment_header(request)
+    if fragment_header:
+        response['X-Fragment-Cache'] = fragment_header
+    return response
+
+
+def _dashboard_context(user_profile, snapshots, businesses, catalog):
+    """Build the dashboard context from already-fetched data; runs no queries of its own
+    (``businesses`` may be a lazy queryset, evaluated once)."""
+    daily_periods, current_daily_period = cached_cycle('daily', tz=user_profile.timezone)
+    yearly_periods, current_yearly_period, yearly_progress = snapshots.get('yearly') or cached_cycle('yearly', user_profile.date_of_birth)
+    soul_periods, current_soul_period, soul_progress = cached_cycle('soul')
     soul_progress_offset = 283 - (283 * soul_progress / 100)
 
-    human_periods, current_human_period, human_progress = get_human_life_cycle(user_profile.date_of_birth)
-    health_periods, current_health_period, health_progress = get_health_cycle(user_profile.date_of_birth)
-    reincarnation_periods, current_reincarnation_period, reincarnation_progress = get_reincarnation_cycle(user_profile.date_of_birth)
+    human_periods, current_human_period, human_progress = snapshots.get('human') or cached_cycle('human', user_profile.date_of_birth)
+    health_periods, current_health_period, health_progress = snapshots.get('health') or cached_cycle('health', user_profile.date_of_birth)
+    reincarnation_periods, current_reincarnation_period, reincarnation_progress = snapshots.get('reincarnation') or cached_cycle('reincarnation', user_profile.date_of_birth)
 
     # Get full descriptions for all periods
-    for period in yearly_periods:
-        try:
-            template = CycleTemplate.objects.get(cycle_type='yearly', period_number=yearly_periods.index(period) + 1)
-            period['full_description'] = template.description
-        except (CycleTemplate.DoesNotExist, ValueError, AttributeError):
-            period['full_description'] = ''
-
-    for period in soul_periods:
-        try:
-            template = CycleTemplate.objects.get(cycle_type='soul', period_number=soul_periods.index(period) + 1)
-            period['full_description'] = template.description
-        except (CycleTemplate.DoesNotExist, ValueError, AttributeError):
-            period['full_description'] = ''
+    for cycle_type, periods in (('yearly', yearly_periods), ('soul', soul_periods), ('health', health_periods), ('reincarnation', reincarnation_periods)):
+        for number, period in enumerate(periods, start=1):
+            period['full_description'] = catalog.description(cycle_type, number)
 
-    for period in health_periods:
-        try:
-            template = CycleTemplate.objects.get(cycle_type='health', period_number=health_periods.index(period) + 1)
-            period['full_description'] = template.description
-        except (CycleTemplate.DoesNotExist, ValueError, AttributeError):
-            period['full_description'] = ''
-
-    for period in reincarnation_periods:
-        try:
-            template = CycleTemplate.objects.get(cycle_type='reincarnation', period_number=reincarnation_periods.index(period) + 1)
-            period['full_description'] = template.description
-        except (CycleTemplate.DoesNotExist, ValueError, AttributeError):
-            period['full_description'] = ''
-
-    businesses = Business.objects.filter(user=request.user)
     business_cycles = []
     for business in businesses:
-        periods, current_period, progress = get_business_cycle(business.establishment_date)
-        # try to attach a flattened template for the current business period
-        try:
-            tpl = CycleTemplate.objects.filter(cycle_type='business', period_number=(periods.index(current_period) + 1) if current_period in periods else None).first() if current_period else None
-            if tpl:
-                eff = tpl.effects or {}
-                tpl_obj = {'description': tpl.description, 'effects': eff, 'start_age': eff.get('start_age'), 'end_age': eff.get('end_age'), 'advice': eff.get('advice') or eff.get('summary')}
-            else:
-                tpl_obj = None
-        except Exception:
-            tpl_obj = None
+        periods, current_period, progress = cached_cycle('business', business.establishment_date)
+        # attach the flattened template for the current business period
+        current_number = periods.index(current_period) + 1 if current_period in periods else None
+        tpl_obj = catalog.get('business', current_number)
 
         business_cycles.append({
             'business': {'id': business.id, 'name': business.name},
@@ -219,12 +279,10 @@ def dashboard(request):
             'current_period': current_period,
             'progress': progress,
             'template': tpl_obj,
-            'full_description': tpl.description if tpl else ''
+            'full_description': tpl_obj['description'] if tpl_obj else ''
         })
 
     context = {
-        'user_profile_form': user_profile_form,
-        'business_form': business_form,
         'user_profile': user_profile,
         'daily_periods': daily_periods,
         'current_daily_period': current_daily_period,
@@ -235,9 +293,9 @@ def dashboard(request):
         'current_soul_period': current_soul_period,
         'soul_progress': soul_progress,
         'soul_progress_offset': soul_progress_offset,
-    'human_periods': human_periods,
-    'current_human_period': current_human_period,
-    'human_progress': human_progress,
+        'human_periods': human_periods,
+        'current_human_period': current_human_period,
+        'human_progress': human_progress,
         'businesses': businesses,
         'business_cycles': business_cycles,
         'health_periods': health_periods,
@@ -246,14 +304,19 @@ def dashboard(request):
         'reincarnation_periods': reincarnation_periods,
         'current_reincarnation_period': current_reincarnation_period,
         'reincarnation_progress': reincarnation_progress,
+        'favorable_window_cycles': [
+            {'cycle_type': cycle_type, 'periods': get_period_names(cycle_type)} for cycle_type in CYCLE_TYPES
+        ],
     }
-    return render(request, 'cycles/dashboard.html', context)
+    context['fragments'] = dashboard_fragments(context, catalog.version)
+    return context
 
+@conditional_cycle_view(home_validators)
 def home(request):
     if request.user.is_authenticated:
         return redirect('dashboard')
     
-    daily_periods, current_daily_period = get_daily_cycle()
+    daily_periods, current_daily_period = cached_cycle('daily')
     context = {
         'daily_periods': daily_periods,
         'current_daily_period': current_daily_period,
@@ -270,7 +333,60 @@ def about(request):
 
 
 
+BIRTH_DATE_CYCLES = ('human', 'yearly', 'health', 'reincarnation')
+USER_CYCLE_TYPES = ('daily', 'yearly', 'soul', 'human', 'health', 'reincarnation')
+
+
+def _cycle_payload(cycle_type, user_profile, snapshots=None):
+    """Build the API payload for one personal cycle type; None when the birth date is missing."""
+    progress = None
+    if cycle_type in BIRTH_DATE_CYCLES:
+        if not user_profile or not user_profile.date_of_birth:
+            return None
+        if snapshots is None:
+            snapshots = load_fresh_snapshots(user_profile)
+        periods, current_period, progress = snapshots.get(cycle_type) or cached_cycle(cycle_type, user_profile.date_of_birth)
+    elif cycle_type == 'daily':
+        periods, current_period = cached_cycle('daily', tz=user_profile.timezone if user_profile else None)
+    else:
+        periods, current_period, progress = cached_cycle('soul')
+    current_number = periods.index(current_period) + 1 if current_period in periods else None
+    return {
+        'periods': periods,
+        'current_period': current_period,
+        'current_period_number': current_number,
+        'progress': progress,
+        'template': _get_template_for_cycle(cycle_type, current_number),
+    }
+
+
+def _business_queryset(request):
+    """The user's businesses filtered by ``?period=`` and sorted by ``?order=`` in the database.
+
+    ``period`` is a business period name or number; ``order`` is ``name``,
+    ``period`` or ``next_transition`` (default: creation order). Raises
+    ValueError for unknown values.
+    """
+    return request.user.business_set.by_cycle(request.GET.get('period'), request.GET.get('order'))
+
+
+def _business_cycle_item(business):
+    """Build the API payload for one business."""
+    periods, current_period, progress = cached_cycle('business', business.establishment_date)
+    current_number = periods.index(current_period) + 1 if current_period in periods else None
+    return {
+        'business': {'id': business.id, 'name': business.name},
+        'periods': periods,
+        'current_period': current_period,
+        'progress': progress,
+        'template': _get_template_for_cycle('business', current_number),
+    }
+
+
 @login_required
+@sampled_profile
+@query_budget(6)
+@conditional_cycle_view(user_cycle_validators)
 def user_cycle_api(request, cycle_type):
     """Generic endpoint returning cycle periods, current_period, progress and template for a cycle_type."""
     from .models import UserProfile as _UserProfile
@@ -279,82 +395,244 @@ def user_cycle_api(request, cycle_type):
         return JsonResponse({'error': 'not_authenticated'}, status=302)
     user_profile = _UserProfile.objects.filter(user=request.user).first()
 
-    periods, current_period, progress = None, None, None
-    current_number = None
-
-    if cycle_type in ('human', 'yearly', 'health', 'reincarnation'):
-        if not user_profile or not user_profile.date_of_birth:
+    if cycle_type in USER_CYCLE_TYPES:
+        payload = _cycle_payload(cycle_type, user_profile)
+        if payload is None:
             return JsonResponse({'error': 'birth_date_missing'}, status=400)
-        if cycle_type == 'human':
-            periods, current_period, progress = get_human_life_cycle(user_profile.date_of_birth)
-        elif cycle_type == 'yearly':
-            periods, current_period, progress = get_yearly_cycle(user_profile.date_of_birth)
-        elif cycle_type == 'health':
-            periods, current_period, progress = get_health_cycle(user_profile.date_of_birth)
-        elif cycle_type == 'reincarnation':
-            periods, current_period, progress = get_reincarnation_cycle(user_profile.date_of_birth)
-        try:
-            current_number = periods.index(current_period) + 1 if current_period in periods else None
-        except (ValueError, AttributeError):
-            current_number = None
-
-    elif cycle_type == 'daily':
-        periods, current_period = get_daily_cycle()
-        try:
-            current_number = periods.index(current_period) + 1
-        except (ValueError, AttributeError):
-            current_number = None
-
-    elif cycle_type == 'soul':
-        periods, current_period, progress = get_soul_cycle()
-        try:
-            current_number = periods.index(current_period) + 1 if current_period in periods else None
-        except (ValueError, AttributeError):
-            current_number = None
+        return JsonResponse(payload)
 
     elif cycle_type == 'business':
         business_id = request.GET.get('business_id')
         try:
-            businesses_qs = request.user.business_set.all()
-        except Exception:
-            businesses_qs = []
+            businesses_qs = _business_queryset(request)
+        except ValueError as exc:
+            return JsonResponse({'error': str(exc)}, status=400)
 
         if business_id:
             try:
                 b = businesses_qs.get(pk=int(business_id))
-                periods, current_period, progress = get_business_cycle(b.establishment_date)
-                current_number = periods.index(current_period) + 1 if current_period in periods else None
-                template = _get_template_for_cycle(cycle_type, current_number)
-                item = {
-                    'business': {'id': b.id, 'name': b.name},
-                    'periods': periods,
-                    'current_period': current_period,
-                    'progress': progress,
-                    'template': template,
-                }
-                legacy = {'business': b.name, 'periods': periods, 'current_period': current_period, 'progress': progress, 'template': template}
-                return JsonResponse({'business_cycles': [item], 'business': legacy})
-            except Exception:
+            except (ValueError, Business.DoesNotExist):
                 return JsonResponse({'error': 'business_not_found'}, status=404)
+            item = _business_cycle_item(b)
+            legacy = {'business': b.name, 'periods': item['periods'], 'current_period': item['current_period'], 'progress': item['progress'], 'template': item['template']}
+            return JsonResponse({'business_cycles': [item], 'business': legacy})
         else:
-            result = []
-            for b in businesses_qs:
-                periods, current_period, progress = get_business_cycle(b.establishment_date)
-                current_number = periods.index(current_period) + 1 if current_period in periods else None
-                template = _get_template_for_cycle(cycle_type, current_number)
-                result.append({
-                    'business': {'id': b.id, 'name': b.name},
-                    'periods': periods,
-                    'current_period': current_period,
-                    'progress': progress,
-                    'template': template,
-                })
-            return JsonResponse({'business_cycles': result})
+            try:
+                pager = BusinessPager.from_request(request.user.business_set.all(), request.GET)
+            except ValueError as exc:
+                return JsonResponse({'error': str(exc)}, status=400)
+            page = pager.page(pager.queryset)
+            return JsonResponse({'business_cycles': [_business_cycle_item(b) for b in page.items], 'next': page.next_cursor})
 
     else:
         return JsonResponse({'error': 'unsupported_cycle_type'}, status=400)
 
-    template = _get_template_for_cycle(cycle_type, current_number)
 
-    return JsonResponse({'periods': periods, 'current_period': current_period, 'current_period_number': current_number, 'progress': progress, 'template': template})
+@login_required
+@query_budget(6)
+def user_cycles_api(request):
+    """Return several of the user's cycles in one response.
+
+    ``?types=human,yearly,...`` picks the cycle types (default: every personal
+    cycle) and ``include=businesses`` adds ``business_cycles``: one page of
+    the businesses, filtered and sorted by ``period``/``order`` and paged by
+    ``limit``/``cursor`` like the ``business`` cycle API, with the cursor of
+    the next page in ``business_cycles_next``. The number of queries does not
+    depend on how many types or businesses are returned.
+    """
+    raw_types = request.GET.get('types')
+    requested = [t.strip() for t in raw_types.split(',') if t.strip()] if raw_types else list(USER_CYCLE_TYPES)
+    include = {i.strip() for i in request.GET.get('include', '').split(',') if i.strip()}
+    include_businesses = 'businesses' in include or 'business' in requested
+    requested = list(dict.fromkeys(t for t in requested if t != 'business'))
+    unsupported = [t for t in requested if t not in USER_CYCLE_TYPES]
+    if unsupported:
+        return JsonResponse({'error': 'unsupported_cycle_type', 'cycle_types': unsupported}, status=400)
+
+    if include_businesses:
+        try:
+            pager = BusinessPager.from_request(request.user.business_set.all(), request.GET)
+        except ValueError as exc:
+            return JsonResponse({'error': str(exc)}, status=400)
+
+    user_profile = UserProfile.objects.filter(user=request.user).first()
+    snapshots = {}
+    if user_profile and any(t in BIRTH_DATE_CYCLES for t in requested):
+        snapshots = load_fresh_snapshots(user_profile)
+
+    cycles = {}
+    for cycle_type in requested:
+        payload = _cycle_payload(cycle_type, user_profile, snapshots)
+        cycles[cycle_type] = payload if payload is not None else {'error': 'birth_date_missing'}
+    data = {'cycles': cycles}
+    if include_businesses:
+        page = pager.page(pager.queryset)
+        data['business_cycles'] = [_business_cycle_item(b) for b in page.items]
+        data['business_cycles_next'] = page.next_cursor
+    return JsonResponse(data)
 
+
+@login_required
+def bulk_cycles_api(request):
+    """Compute cycles for many dates at once and stream one NDJSON line per row.
+
+    The body is either a JSON object ``{"cycle_types": [...], "rows": [...]}``
+    or, with ``Content-Type: application/x-ndjson``, one row object per line
+    with the cycle types in ``?types=``. Each row holds an optional ``id`` and
+    a ``birth_date`` and/or ``establishment_date``; ``?as_of=`` computes the
+    cycles for another date than today.
+
+    Only NDJSON bodies are read as a stream. A JSON body is parsed whole, so
+    it is limited to ``CYCLES_BULK_JSON_MAX_ROWS`` rows (and Django's
+    ``DATA_UPLOAD_MAX_MEMORY_SIZE``); larger ones get a 413 that points to
+    ``application/x-ndjson``.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'method_not_allowed'}, status=405)
+
+    as_of = request.GET.get('as_of')
+    if as_of:
+        try:
+            as_of = date.fromisoformat(as_of)
+        except ValueError:
+            return JsonResponse({'error': 'invalid_as_of'}, status=400)
+
+    if request.content_type == 'application/x-ndjson':
+        cycle_types = [t.strip() for t in request.GET.get('types', '').split(',') if t.strip()]
+        # read the body lazily so large uploads are never held in memory at once
+        rows = bulk.iter_ndjson_rows(request)
+    else:
+        max_rows = bulk.json_max_rows()
+        too_large = {'error': 'too_many_rows', 'max_rows': max_rows, 'use_content_type': 'application/x-ndjson'}
+        try:
+            body = json.loads(request.body or b'{}')
+        except RequestDataTooBig:
+            return JsonResponse(too_large, status=413)
+        except ValueError:
+            return JsonResponse({'error': 'invalid_json'}, status=400)
+        if not isinstance(body, dict) or not isinstance(body.get('rows'), list):
+            return JsonResponse({'error': 'rows_required'}, status=400)
+        if len(body['rows']) > max_rows:
+            return JsonResponse(too_large, status=413)
+        cycle_types = body.get('cycle_types') or []
+        if not isinstance(cycle_types, list):
+            return JsonResponse({'error': 'unsupported_cycle_type', 'cycle_types': [cycle_types]}, status=400)
+        rows = (bulk.normalize_row(i, row) for i, row in enumerate(body['rows']))
+
+    if not cycle_types:
+        return JsonResponse({'error': 'cycle_types_required'}, status=400)
+    unsupported = bulk.validate_cycle_types(cycle_types)
+    if unsupported:
+        return JsonResponse({'error': 'unsupported_cycle_type', 'cycle_types': unsupported}, status=400)
+
+    cycle_types = list(dict.fromkeys(cycle_types))
+    return StreamingHttpResponse(
+        bulk.stream_results(rows, cycle_types, as_of),
+        content_type='application/x-ndjson',
+    )
+
+
+def _int_param(request, name, default, minimum, maximum):
+    """Return the integer query parameter ``name`` within bounds, or None when it is invalid."""
+    value = request.GET.get(name)
+    if value is None:
+        return default
+    if not value.isdigit() or not minimum <= int(value) <= maximum:
+        return None
+    return int(value)
+
+
+@login_required
+def favorable_windows_api(request):
+    """Return the next windows in which every requested cycle is in the requested period.
+
+    ``?constraints=yearly:action,business:fruition,daily:active`` lists
+    ``cycle_type:period`` pairs (period names or 1-based numbers);
+    ``business_id`` picks the business (default: the first one), ``limit``
+    the number of windows and ``days`` the search horizon. Times are in the
+    profile's timezone.
+    """
+    constraints = []
+    invalid = []
+    for item in request.GET.get('constraints', '').split(','):
+        if not item.strip():
+            continue
+        cycle_type, _, period = item.partition(':')
+        number = windows.resolve_period(cycle_type.strip(), period)
+        if number is None:
+            invalid.append(item.strip())
+        else:
+            constraints.append((cycle_type.strip(), number))
+    if invalid or not constraints:
+        return JsonResponse({'error': 'invalid_constraints', 'constraints': invalid}, status=400)
+
+    limit = _int_param(request, 'limit', 5, 1, 50)
+    horizon_days = _int_param(request, 'days', 365, 1, windows.MAX_HORIZON_DAYS)
+    if limit is None or horizon_days is None:
+        return JsonResponse({'error': 'invalid_parameters'}, status=400)
+
+    user_profile = UserProfile.objects.filter(user=request.user).first()
+    establishment_date = None
+    if any(cycle_type == 'business' for cycle_type, _ in constraints):
+        businesses = request.user.business_set.order_by('pk')
+        business_id = request.GET.get('business_id')
+        if business_id:
+            businesses = businesses.filter(pk=int(business_id)) if business_id.isdigit() else businesses.none()
+        business = businesses.first()
+        if business is None:
+            return JsonResponse({'error': 'business_not_found'}, status=404)
+        establishment_date = business.establishment_date
+
+    tz = get_zone(user_profile.timezone if user_profile else None).key
+    try:
+        found = windows.find_favorable_windows(
+            constraints,
+            birth_date=user_profile.date_of_birth if user_profile else None,
+            establishment_date=establishment_date,
+            horizon_days=horizon_days,
+            limit=limit,
+            tz=tz,
+        )
+    except ValueError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+
+    zone = get_zone(tz)
+    return JsonResponse({
+        'constraints': [
+            {'cycle_type': cycle_type, 'period': number, 'name': get_period_names(cycle_type)[number - 1]}
+            for cycle_type, number in constraints
+        ],
+        'timezone': tz,
+        'windows': [
+            {
+                'start': w.start.astimezone(zone).isoformat(),
+                'end': w.end.astimezone(zone).isoformat() if w.end is not None else None,
+            }
+            for w in found
+        ],
+    })
+
+
+def metrics_endpoint(request):
+    """Prometheus scrape endpoint (see ``cycles/metrics.py``).
+
+    Open to staff users, and to scrapers that send ``CYCLES_METRICS_TOKEN``
+    as a bearer token when it is set; everyone else gets a 401.
+    """
+    token = getattr(settings, 'CYCLES_METRICS_TOKEN', None)
+    scraper = bool(token) and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    if not scraper and not request.user.is_staff:
+        return HttpResponse('Unauthorized\n', status=401, content_type='text/plain')
+    profiles = UserProfile.objects.aggregate(
+        total=Count('id'), with_birth_date=Count('id', filter=Q(date_of_birth__isnull=False)),
+    )
+    gauges = [
+        ('cycles_profiles', 'User profiles.', profiles['total']),
+        ('cycles_profiles_with_birth_date', 'User profiles with a birth date.', profiles['with_birth_date']),
+        ('cycles_businesses', 'Businesses.', Business.objects.count()),
+    ]
+    metrics.flush()
+    return HttpResponse(
+        metrics.render(metrics.collect(), gauges),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
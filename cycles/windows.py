@@ -0,0 +1,148 @@
+"""Search for "favorable windows" in which several cycles are in chosen periods.
+
+A constraint is a ``(cycle_type, period)`` pair. Instead of scanning day by
+day (or minute by minute for the daily cycle), the search leapfrogs over
+period boundaries: every constrained cycle reports its next matching period at
+or after a cursor, and either those periods overlap (a window) or the cursor
+jumps to the latest of their starts. Each step is O(1), so even a five-year
+horizon including the 206-minute daily cycle takes milliseconds.
+"""
+from collections import namedtuple
+from datetime import datetime, time, timedelta, timezone
+
+from .utils import (
+    CYCLE_TYPES,
+    _daily_segment,
+    _dated_segment,
+    _ensure_date,
+    get_period_names,
+    get_zone,
+)
+
+
+FavorableWindow = namedtuple('FavorableWindow', ['start', 'end'])
+
+MAX_HORIZON_DAYS = 3650
+
+
+def _short_name(name):
+    name = name.strip().lower()
+    for prefix in ('the period of ', 'the ', 'period of '):
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+    if name.endswith(' period'):
+        name = name[:-len(' period')]
+    return name
+
+
+def resolve_period(cycle_type, period):
+    """Return the 1-based period number for ``period`` (a number or a name), or None.
+
+    Names match case-insensitively, in full ("The Period of Action") or
+    without the "The Period of"/"Period" wording ("action", "active").
+    """
+    if cycle_type not in CYCLE_TYPES:
+        return None
+    names = get_period_names(cycle_type)
+    if isinstance(period, int) or (isinstance(period, str) and period.strip().isdigit()):
+        number = int(period)
+        return number if 1 <= number <= len(names) else None
+    if not isinstance(period, str):
+        return None
+    wanted = period.strip().lower()
+    for number, name in enumerate(names, start=1):
+        if name.lower() == wanted:
+            return number
+    wanted = _short_name(wanted)
+    for number, name in enumerate(names, start=1):
+        if _short_name(name) == wanted:
+            return number
+    return None
+
+
+def _moment(day, tz):
+    moment = datetime.combine(day, time())
+    return moment.replace(tzinfo=get_zone(tz)) if tz is not None else moment
+
+
+def _local_date(moment, tz):
+    return moment.astimezone(get_zone(tz)).date() if tz is not None else moment.date()
+
+
+def _matching_period(cycle_type, source_date, period, moment, tz):
+    """Return ``(start, end)`` of the first ``period`` of the cycle ending after ``moment``.
+
+    ``end`` is None for an open final period; returns None when the period
+    never comes again.
+    """
+    while True:
+        if cycle_type == 'daily':
+            index, start, end = _daily_segment(moment, tz)
+        else:
+            index, start, end = _dated_segment(cycle_type, source_date, _local_date(moment, tz))
+            start = _moment(start, tz)
+            end = _moment(end, tz) if end is not None else None
+        if index + 1 == period:
+            return start, end
+        if end is None:
+            return None
+        moment = end
+
+
+def find_favorable_windows(constraints, birth_date=None, establishment_date=None, start=None,
+                           horizon_days=365, limit=5, tz=None):
+    """Return up to ``limit`` windows in which every ``(cycle_type, period)`` constraint holds.
+
+    ``period`` is a 1-based number. ``birth_date`` drives the personal cycles
+    and ``establishment_date`` the business one. With ``tz`` the search runs in
+    that timezone and returns aware datetimes. Windows start no earlier than
+    ``start`` (default: now) and no later than the end of the horizon; ``end``
+    is None when every constraint is in a period that never ends.
+    """
+    birth_date = _ensure_date(birth_date)
+    establishment_date = _ensure_date(establishment_date)
+    sources = {}
+    for cycle_type, _ in constraints:
+        if cycle_type == 'business':
+            if not establishment_date:
+                raise ValueError('establishment_date_missing')
+            sources[cycle_type] = establishment_date
+        elif cycle_type not in ('daily', 'soul'):
+            if not birth_date:
+                raise ValueError('birth_date_missing')
+            sources[cycle_type] = birth_date
+
+    if tz is not None:
+        tz = get_zone(tz).key
+        cursor = start or datetime.now(timezone.utc)
+        if not isinstance(cursor, datetime):
+            cursor = _moment(cursor, tz)
+        elif cursor.tzinfo is None:
+            cursor = cursor.replace(tzinfo=timezone.utc)
+    else:
+        cursor = start or datetime.now()
+        if not isinstance(cursor, datetime):
+            cursor = _moment(cursor, tz)
+    horizon_end = cursor + timedelta(days=horizon_days)
+
+    windows = []
+    while len(windows) < limit and cursor < horizon_end:
+        periods = []
+        for cycle_type, period in constraints:
+            match = _matching_period(cycle_type, sources.get(cycle_type), period, cursor, tz)
+            if match is None:
+                return windows
+            periods.append(match)
+        window_start = max([cursor] + [s for s, _ in periods])
+        ends = [e for _, e in periods if e is not None]
+        window_end = min(ends) if ends else None
+        if window_start >= horizon_end:
+            break
+        if window_end is None or window_start < window_end:
+            windows.append(FavorableWindow(window_start, window_end))
+            if window_end is None:
+                break
+            cursor = window_end
+        else:
+            cursor = window_start
+    return windows
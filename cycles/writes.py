@@ -0,0 +1,102 @@
+"""Write transactions that hold up under concurrent SQLite access.
+
+With WAL (see ``cycle_project/sqlite_backend``) readers never block, but
+SQLite still allows one writer at a time. A deferred transaction that
+reads first and writes later can hit "database is locked" half way
+through, after ``busy_timeout`` has already run out. Here:
+
+* ``immediate_atomic`` starts the transaction with ``BEGIN IMMEDIATE``, so
+  the write lock is taken (or waited for) before the view does anything;
+* ``retry_on_locked`` runs a function again, with exponential backoff and
+  jitter, while it fails with a lock error;
+* ``write_view`` combines the two for the unsafe methods of a view.
+
+A lock error can only surface while the transaction starts, so a retry
+never repeats part of a view. Inside an outer ``atomic`` block nothing is
+retried: the outer transaction owns the lock and the error belongs to it.
+"""
+import logging
+import random
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+
+
+logger = logging.getLogger('cycles.writes')
+
+LOCKED_MESSAGES = ('database is locked', 'database table is locked', 'database schema is locked')
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+def is_locked_error(exc):
+    return isinstance(exc, OperationalError) and any(message in str(exc) for message in LOCKED_MESSAGES)
+
+
+@contextmanager
+def immediate_atomic(using=None):
+    """``transaction.atomic`` that takes the SQLite write lock when it starts.
+
+    Nested in another atomic block, or on a backend without
+    ``begin_immediate``, this is a plain ``atomic``.
+    """
+    connection = transaction.get_connection(using)
+    if connection.in_atomic_block or not hasattr(connection, 'begin_immediate'):
+        with transaction.atomic(using=using):
+            yield
+        return
+    connection.begin_immediate = True
+    try:
+        with transaction.atomic(using=using):
+            connection.begin_immediate = False
+            yield
+    finally:
+        connection.begin_immediate = False
+
+
+def retry_on_locked(func=None, *, using=None, attempts=None, delay=None):
+    """Retry ``func`` while it fails with "database is locked".
+
+    Tries ``attempts`` times (``CYCLES_WRITE_RETRIES``), sleeping ``delay``
+    seconds (``CYCLES_WRITE_RETRY_DELAY``) doubled after each failure, each
+    sleep jittered by +/-50% so retrying writers do not collide again.
+    """
+    def decorator(func):
+        @wraps(func)
+        def inner(*args, **kwargs):
+            if transaction.get_connection(using).in_atomic_block:
+                return func(*args, **kwargs)
+            tries = attempts or getattr(settings, 'CYCLES_WRITE_RETRIES', 5)
+            backoff = getattr(settings, 'CYCLES_WRITE_RETRY_DELAY', 0.05) if delay is None else delay
+            for attempt in range(1, tries + 1):
+                try:
+                    return func(*args, **kwargs)
+                except OperationalError as exc:
+                    if attempt == tries or not is_locked_error(exc):
+                        raise
+                    pause = backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+                    logger.warning(
+                        '%s: %s, retrying in %.0fms (attempt %d of %d)',
+                        func.__qualname__, exc, pause * 1000, attempt, tries,
+                    )
+                    time.sleep(pause)
+        return inner
+
+    return decorator(func) if func is not None else decorator
+
+
+def write_view(view):
+    """Run the unsafe-method requests of ``view`` in a retried ``immediate_atomic`` block."""
+    @retry_on_locked
+    def run_immediate(request, *args, **kwargs):
+        with immediate_atomic():
+            return view(request, *args, **kwargs)
+
+    @wraps(view)
+    def inner(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return view(request, *args, **kwargs)
+        return run_immediate(request, *args, **kwargs)
+    return inner